@@ -1,19 +1,24 @@
-import tkinter as tk
 import sys
+
+# --- 导入耗时分析: 必须在其他模块导入之前开启，才能统计到完整的冷启动耗时 ---
+from system.lazy_import import is_import_profile_requested, enable_import_profile
+if is_import_profile_requested(sys.argv):
+    if "--import-profile" in sys.argv:
+        sys.argv.remove("--import-profile")
+    enable_import_profile()
+
+import tkinter as tk
 import os 
 from pathlib import Path
 import subprocess
 from tkinter import messagebox  
 import platform 
 
-# --- 核心组件导入 (现在从 app_logic 导入启动函数) ---
+# --- 核心组件导入 ---
+# 这里只导入 *_only 子进程模式也需要的轻量模块；
+# 桌面专用组件 (LogicHandler, UIManager, IconManager 等) 在 DesktopApp 中按需导入
 try:
-    # 从 system.app_logic 导入 LogicHandler 和新移动的启动函数
-    from system.app_logic import LogicHandler, start_sub_process_app
-    
-    # 其他系统组件
-    from system.desktop_ui_components import UIManager
-    from system.icon_manager import IconManager
+    from system.app_logic import start_sub_process_app
     
     # 尝试导入主窗口大小配置，如果失败则使用默认值
     try:
@@ -21,17 +26,6 @@ try:
     except ImportError:
         MAIN_WIDTH = 1000
         MAIN_HEIGHT = 700
-
-    # --- 独立应用启动函数导入 (用于 LogicHandler 的 app_launchers) ---
-    # 这些函数负责在主进程中调用 subprocess.Popen，启动子进程
-    from software.browser import open_browser
-    from software.file_editor import open_file_editor
-    from software.camera import open_camera_system 
-    from software.terminal import open_terminal_system
-    from software.file_manager_init import open_file_manager
-    from software.deepseek import open_deepseek
-    from software.game import open_pong_game
-    from software.rss_init import open_rss_reader 
     
 except ImportError:
     # 允许在子进程模式下，如果只需要特定模块时，其他模块导入失败
@@ -41,89 +35,38 @@ except ImportError:
 # 获取项目的根目录 (在 PyInstaller 环境下会指向可执行文件所在目录)
 PROJECT_ROOT = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).resolve().parent
 
-# --- 命令行参数处理 (使用从 app_logic 导入的函数) ---
+# --- 命令行参数处理 (模式 -> 应用的映射由 system.app_registry 统一维护) ---
+def dispatch_mode(mode):
+    """
+    根据命令行模式启动对应的独立应用。
+    主进程的命令行分支和预热 (zygote) 进程 fork 出的子进程都会调用此函数，
+    调用前 sys.argv 已被设置为 [程序, mode, 额外参数...]。
+    """
+    # 预热进程: 预导入共享模块，并为后续启动请求 fork 子进程
+    if mode == "zygote_server":
+        from system.app_zygote import serve_forever
+        if len(sys.argv) > 2:
+            serve_forever(sys.argv[2], dispatch_mode)
+        sys.exit()
+
+    from system.app_registry import get_app_by_mode
+    spec = get_app_by_mode(mode)
+    if spec is None:
+        print(f"未知的启动模式: {mode}")
+        sys.exit(1)
+
+    # 统一使用 start_sub_process_app 启动，sys.argv[2:] 作为入口的额外参数
+    # (例如文件管理器的 project_root、浏览器的起始 URL、编辑器要打开的文件)
+    start_sub_process_app(spec['module'], entry_name=spec['entry'], args=sys.argv[2:], entry_kind=spec.get('entry_kind'))
+
+
 if len(sys.argv) > 1:
-    
-    mode = sys.argv[1]
-    
-    # 1. 路径设置: 确保子进程环境正确设置 PROJECT_ROOT
+    # 路径设置: 确保子进程环境正确设置 PROJECT_ROOT
     if str(PROJECT_ROOT) not in sys.path:
         sys.path.insert(0, str(PROJECT_ROOT))
-        
-    # --- 统一使用 start_sub_process_app 启动 ---
-    
-    # RSS Reader (使用类 RSSReaderApp)
-    if mode == "rss_only":
-        start_sub_process_app('software.rss_app', entry_name='RSSReaderApp')
-    
-    # 相机子进程启动 (使用类 App)
-    elif mode == 'camera_mac_only':
-        from software.camera_pi.camera_mac import CameraApp
-        app = CameraApp()
-        app.run()
-    elif mode == 'camera_win_only':
-        from software.camera_pi.camera_win import CameraApp
-        app = CameraApp()
-        app.run()
-    elif mode == 'camera_rpi_only':
-        from software.camera_pi.camera_rpi import CameraAppRpiTorchScript
-        app = CameraAppRpiTorchScript()
-        app.run()
-    
-    # DeepSeek AI 启动 (使用函数 create_deepseek_ui)
-    elif mode == 'deepseek_only':
-        start_sub_process_app('software.deepseek_app', entry_name='create_deepseek_ui')
-        
-    # 游戏 (Pong) 启动 (使用函数 create_pong_game)
-    elif mode == 'game_only':
-        start_sub_process_app('software.games.pong.main_menu', entry_name='run_game_menu')
-    
-    # --- 保持原有逻辑（browser, file_manager, file_editor）---
-    # 这些应用需要从命令行接收额外的文件路径参数 (sys.argv[2]), 
-    # 故保持直接处理逻辑，而不是使用统一的 start_sub_process_app
-    
-    # 浏览器启动 (使用函数 create_browser_window)
-    elif mode == "browser_only":
-        try:
-            from software.browser_app import create_browser_window
-            startup_url = sys.argv[2] if len(sys.argv) > 2 else None
-            create_browser_window(startup_url) 
-        except Exception as e:
-            messagebox.showerror("启动失败", f"浏览器启动失败：{e}")
-        sys.exit()
 
-    
-    # 文件管理器启动 (使用类 FileManagerApp)
-    elif mode == "file_manager_only":
-        try:
-            from software.file_manager.main import FileManagerApp 
-            if len(sys.argv) > 2:
-                # 模拟 start_sub_process_app 内部的类启动逻辑
-                fm_root = tk.Tk()
-                project_root_path = Path(sys.argv[2])
-                FileManagerApp(fm_root, project_root=project_root_path)
-                fm_root.mainloop()
-            else:
-                messagebox.showerror("启动失败", "文件管理器启动失败：缺少 project_root 参数。")
-        except Exception as e:
-             messagebox.showerror("启动失败", f"文件管理器启动失败：{e}")
-        sys.exit()
-    
-    # 文件编辑器启动 (使用类 FileEditorApp)
-    elif mode == "file_editor_only":
-        try:
-            from software.file_editor_app import FileEditorApp
-            if len(sys.argv) > 2:
-                # 模拟 start_sub_process_app 内部的类启动逻辑
-                editor_root = tk.Tk()
-                project_root_path = Path(sys.argv[2])
-                FileEditorApp(editor_root, project_root=project_root_path)
-                editor_root.mainloop()
-            else:
-                messagebox.showerror("启动失败", "文件编辑器启动失败：缺少 project_root 参数。")
-        except Exception as e:
-             messagebox.showerror("启动失败", f"文件编辑器启动失败：{e}")
-        sys.exit()
+    dispatch_mode(sys.argv[1])
+
 
 class DesktopApp:
     """
@@ -137,22 +80,16 @@ class DesktopApp:
         self.master.title("Raspberry Pi Desktop")
         # 设置默认大小
         self.master.geometry(f"{MAIN_WIDTH}x{MAIN_HEIGHT}")
-        
-        # 将所有启动函数打包成一个字典，方便传递给 LogicHandler
-        app_launchers = {
-            'file_manager': open_file_manager,
-            'browser': open_browser,
-            'editor': open_file_editor,
-            'camera': open_camera_system,
-            'terminal': open_terminal_system,
-            'deepseek': open_deepseek,
-            'games': open_pong_game,
-            'rss_reader': open_rss_reader, 
-        }
+
+        # 桌面专用组件，只在创建桌面时才导入
+        from system.app_logic import LogicHandler
+        from system.app_zygote import ZygoteClient
+        from system.desktop_ui_components import UIManager
+        from system.icon_manager import IconManager
         
         # 1. 初始化 LogicHandler
-        # LogicHandler 现在只负责调度启动，具体启动机制（subprocess.Popen）被封装在 app_launchers 中
-        self.logic = LogicHandler(self, None, None, app_launchers)
+        # LogicHandler 负责调度启动，启动哪个模块、以何种方式启动由 system.app_registry 描述
+        self.logic = LogicHandler(self, None, None)
         
         # 2. 初始化 UIManager
         self.ui = UIManager(self.master, self)
@@ -163,6 +100,11 @@ class DesktopApp:
         # 4. 更新 LogicHandler 中缺失的引用
         self.logic.icon_manager = self.icon_manager
         self.logic.ui = self.ui
+
+        # 5. 启动预热 (zygote) 进程，后续应用启动优先从它 fork，失败时回退到 Popen
+        self.zygote = ZygoteClient(PROJECT_ROOT)
+        self.zygote.start()
+        self.logic.zygote = self.zygote
         
         # 将 Icons 字典暴露给实例（如果需要）
         self.icons = self.icon_manager.icons
@@ -173,7 +115,8 @@ class DesktopApp:
     def on_close(self):
         """在程序退出时调用，确保数据被保存。"""
         print("正在退出应用程序...")
-        self.icon_manager.save_layout()
+        self.icon_manager.flush_layout()
+        self.zygote.stop()
         self.master.destroy()
         
     # --- 逻辑委托方法 (Delegation Methods) ---
@@ -199,6 +142,9 @@ class DesktopApp:
     def show_developer_about(self):
         self.logic.show_developer_about()
 
+    def show_running_apps(self):
+        self.logic.show_running_apps()
+
     # 拖拽/平移功能委托
     def start_pan(self, event):
         self.logic.start_pan(event)
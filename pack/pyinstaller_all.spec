@@ -40,6 +40,20 @@ runtime_imports = [
     'software.rss_app',
     'software.rss_app.RSSReaderApp',
     'software.deepseek_app.DeepSeekChatApp',
+
+    # 由 system/app_registry.py 和 system/lazy_import.py 按字符串懒加载的模块
+    'software.browser_app',
+    'software.camera',
+    'software.terminal',
+    'software.file_manager.main',
+    'software.file_editor_app',
+    'system.app_zygote',
+    'system.desktop_ui_components',
+    'system.icon_manager',
+    'system.button.about',
+    'system.button.running_apps',
+    'system.wireless.wifi',
+    'system.wireless.bluetooth',
 ]
 
 # 收集 cv2 和 ultralytics 运行时所需的数据/二进制文件
@@ -0,0 +1,156 @@
+import os
+import time
+import codecs
+from collections import OrderedDict, namedtuple
+
+# chardet 最多读取的字节数: 大多数文件在读完前几 KB 后就能确定编码
+MAX_DETECT_BYTES = 1024 * 1024
+DETECT_CHUNK_BYTES = 4096
+# 检测结果缓存的文件数量
+ENCODING_CACHE_SIZE = 256
+# chardet 没有结果时使用的编码
+DEFAULT_ENCODING = 'utf-8'
+
+# encoding 为解码 BOM 之后的内容所用的编码 (UTF-16/32 带字节序，可以从文件中间开始解码)；
+# method 为检测方式: 'bom'、'utf-8'、'chardet'、'default' 或 'cache'
+DetectionResult = namedtuple('DetectionResult', ['encoding', 'bom_length', 'method', 'elapsed_ms'])
+
+METHOD_LABELS = {
+    'bom': "BOM", 'utf-8': "UTF-8 快速检测", 'chardet': "chardet",
+    'default': "默认", 'cache': "缓存",
+}
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+# (路径, 修改时间, 大小) -> (编码, BOM 长度, 检测方式)
+_cache = OrderedDict()
+
+
+def _sniff_bom(data):
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding, len(bom)
+    return None, 0
+
+
+def _is_utf8(data, truncated):
+    """严格按 UTF-8 解码；truncated 为 True 时允许末尾有被截断的多字节字符。"""
+    try:
+        data.decode('utf-8')
+        return True
+    except UnicodeDecodeError as e:
+        return truncated and e.reason == 'unexpected end of data' and e.start >= len(data) - 3
+
+
+def _chardet_encoding(data):
+    """把数据分块送入 chardet 的 UniversalDetector，确定编码后立即停止。"""
+    from chardet.universaldetector import UniversalDetector
+    detector = UniversalDetector()
+    for offset in range(0, min(len(data), MAX_DETECT_BYTES), DETECT_CHUNK_BYTES):
+        detector.feed(data[offset:offset + DETECT_CHUNK_BYTES])
+        if detector.done:
+            break
+    detector.close()
+    encoding = detector.result.get('encoding')
+    if encoding and encoding.lower().replace('_', '-') in ('utf-16', 'utf-32'):
+        # 没有 BOM 的 UTF-16/32，按小端处理
+        encoding += '-le'
+    return encoding
+
+
+def detect_encoding(data, truncated=False):
+    """
+    检测字节数据的编码，返回 (编码, BOM 长度, 检测方式)。
+
+    依次尝试: BOM、严格的 UTF-8 解码、chardet (最多读取 MAX_DETECT_BYTES 字节)。
+    参数:
+        data (bytes): 文件内容，或文件开头的一段样本。
+        truncated (bool): data 是否只是样本 (末尾可能截断了一个字符)。
+    """
+    encoding, bom_length = _sniff_bom(data)
+    if encoding is not None:
+        return encoding, bom_length, 'bom'
+    if _is_utf8(data, truncated):
+        return 'utf-8', 0, 'utf-8'
+    encoding = _chardet_encoding(data)
+    if encoding is None:
+        return DEFAULT_ENCODING, 0, 'default'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        # chardet 偶尔返回 Python 不认识的编码名称
+        return DEFAULT_ENCODING, 0, 'default'
+    return encoding, 0, 'chardet'
+
+
+def _cache_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _remember(key, value):
+    if key is None:
+        return
+    _cache[key] = value
+    while len(_cache) > ENCODING_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def detect_file_encoding(path, data, truncated=False):
+    """
+    检测文件的编码，结果按 (路径, 修改时间, 大小) 缓存；文件未变化时再次打开不需要重新检测。
+
+    返回:
+        DetectionResult: 其中 elapsed_ms 为本次检测 (或查缓存) 的耗时。
+    """
+    started = time.perf_counter()
+    key = _cache_key(path)
+    cached = _cache.get(key) if key is not None else None
+    if cached is not None:
+        _cache.move_to_end(key)
+        encoding, bom_length, _ = cached
+        method = 'cache'
+    else:
+        encoding, bom_length, method = detect_encoding(data, truncated)
+        _remember(key, (encoding, bom_length, method))
+    return DetectionResult(encoding, bom_length, method, (time.perf_counter() - started) * 1000)
+
+
+def decode_file(path, raw):
+    """
+    检测编码并解码整个文件。
+
+    返回:
+        (str, DetectionResult): 去掉 BOM 的文本和检测结果。
+    UTF-8 快速检测成功时，检测中严格解码得到的文本直接作为结果，不会再解码一遍。
+    """
+    started = time.perf_counter()
+    key = _cache_key(path)
+    if key not in _cache:
+        encoding, _ = _sniff_bom(raw)
+        if encoding is None:
+            try:
+                text = raw.decode('utf-8')
+            except UnicodeDecodeError:
+                pass
+            else:
+                _remember(key, ('utf-8', 0, 'utf-8'))
+                return text, DetectionResult('utf-8', 0, 'utf-8', (time.perf_counter() - started) * 1000)
+    result = detect_file_encoding(path, raw)
+    return raw[result.bom_length:].decode(result.encoding, errors='replace'), result
+
+
+def describe(result):
+    """状态栏中显示的编码说明。"""
+    bom = " (BOM)" if result.bom_length else ""
+    return (f"编码: {result.encoding.upper()}{bom}，"
+            f"检测耗时 {result.elapsed_ms:.1f} ms ({METHOD_LABELS[result.method]})")
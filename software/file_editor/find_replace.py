@@ -0,0 +1,403 @@
+import re
+import time
+import queue
+import bisect
+import threading
+import tkinter as tk
+
+# 输入查找内容后等待多久开始搜索 (毫秒)
+SEARCH_DELAY_MS = 150
+SEARCH_POLL_MS = 15
+# 最多记录的匹配数量
+MAX_MATCHES = 100000
+MATCH_TAG = "find_match"
+CURRENT_TAG = "find_current"
+
+
+def _line_starts(text):
+    return [0] + [m.end() for m in re.finditer('\n', text)]
+
+
+def _to_index(line_starts, offset):
+    """把字符偏移转换为 (行, 列)，行号从 1 开始，与 Tk 的索引一致。"""
+    line = bisect.bisect_right(line_starts, offset)
+    return line, offset - line_starts[line - 1]
+
+
+def find_matches(pattern, text, limit=MAX_MATCHES):
+    """
+    在 text 中查找 pattern 的所有匹配 (跳过空匹配)，在工作线程中运行。
+
+    返回:
+        (matches, truncated): matches 为按位置排序的 [(起始行, 起始列, 结束行, 结束列)]。
+    """
+    line_starts = _line_starts(text)
+    matches = []
+    for match in pattern.finditer(text):
+        if match.end() == match.start():
+            continue
+        if len(matches) >= limit:
+            return matches, True
+        matches.append(_to_index(line_starts, match.start()) + _to_index(line_starts, match.end()))
+    return matches, False
+
+
+def plan_replacements(pattern, text, replacement, is_regex):
+    """返回 [(起始行, 起始列, 结束行, 结束列, 替换文本)]；正则模式下支持 \\1、\\g<name> 等引用。"""
+    line_starts = _line_starts(text)
+    edits = []
+    for match in pattern.finditer(text):
+        if match.end() == match.start():
+            continue
+        new_text = match.expand(replacement) if is_regex else replacement
+        edits.append(_to_index(line_starts, match.start()) + _to_index(line_starts, match.end()) + (new_text,))
+    return edits
+
+
+class FindReplacePanel:
+    """
+    编辑器底部的查找/替换栏。
+
+    搜索在工作线程中对缓冲区快照运行正则，生成按位置排序的匹配索引；
+    只为可见区域内的匹配添加高亮标签，滚动时用二分查找更新。
+    缓冲区被修改后自动重新搜索；"全部替换"作为一次撤销操作。
+    """
+
+    def __init__(self, parent, text_widget, proxy, is_read_only=lambda: False):
+        self.text = text_widget
+        self.proxy = proxy
+        self.is_read_only = is_read_only
+        self.visible = False
+
+        self.find_var = tk.StringVar()
+        self.replace_var = tk.StringVar()
+        self.regex_var = tk.BooleanVar(value=False)
+        self.case_var = tk.BooleanVar(value=False)
+        self.status_var = tk.StringVar()
+
+        self.matches = []
+        self._starts = []
+        self._current = None
+        self._pattern = None
+        self._generation = 0
+        # 缓冲区修改计数 (替换全部据此判断规划期间缓冲区是否被修改)
+        self._edit_count = 0
+        self._searching = False
+        self._stale = True
+        self._pending_action = None
+        self._search_after_id = None
+        self._highlight_after_id = None
+        self._results = queue.Queue()
+
+        self.frame = tk.Frame(parent, bd=1, relief=tk.GROOVE)
+        tk.Label(self.frame, text="查找:").grid(row=0, column=0, sticky="w")
+        self.find_entry = tk.Entry(self.frame, textvariable=self.find_var)
+        self.find_entry.grid(row=0, column=1, sticky="ew")
+        tk.Button(self.frame, text="上一个", command=self.find_previous).grid(row=0, column=2)
+        tk.Button(self.frame, text="下一个", command=self.find_next).grid(row=0, column=3)
+        tk.Button(self.frame, text="×", command=self.hide, relief=tk.FLAT).grid(row=0, column=4)
+
+        tk.Label(self.frame, text="替换:").grid(row=1, column=0, sticky="w")
+        self.replace_entry = tk.Entry(self.frame, textvariable=self.replace_var)
+        self.replace_entry.grid(row=1, column=1, sticky="ew")
+        self.replace_button = tk.Button(self.frame, text="替换", command=self.replace_current)
+        self.replace_button.grid(row=1, column=2)
+        self.replace_all_button = tk.Button(self.frame, text="全部替换", command=self.replace_all)
+        self.replace_all_button.grid(row=1, column=3, columnspan=2)
+
+        options = tk.Frame(self.frame)
+        options.grid(row=2, column=0, columnspan=5, sticky="ew")
+        tk.Checkbutton(options, text="正则", variable=self.regex_var, command=self._on_query_changed).pack(side=tk.LEFT)
+        tk.Checkbutton(options, text="区分大小写", variable=self.case_var, command=self._on_query_changed).pack(side=tk.LEFT)
+        tk.Label(options, textvariable=self.status_var, fg="gray").pack(side=tk.LEFT, padx=5)
+        self.frame.grid_columnconfigure(1, weight=1)
+
+        self.find_var.trace_add('write', lambda *args: self._on_query_changed())
+        self.find_entry.bind('<Return>', lambda event: self.find_next())
+        self.find_entry.bind('<Shift-Return>', lambda event: self.find_previous())
+        for widget in (self.find_entry, self.replace_entry):
+            widget.bind('<Escape>', lambda event: self.hide())
+
+        self.text.tag_configure(MATCH_TAG, background="#fff59d")
+        self.text.tag_configure(CURRENT_TAG, background="#ffb74d")
+        self.text.tag_raise('sel')
+        proxy.edit_listeners.append(self._on_edit)
+        proxy.view_listeners.append(self._schedule_highlight)
+
+    # --- 显示/隐藏 ---
+
+    def show(self, **pack_options):
+        if not self.visible:
+            self.frame.pack(side=tk.BOTTOM, fill=tk.X, **pack_options)
+            self.visible = True
+        state = tk.DISABLED if self.is_read_only() else tk.NORMAL
+        for widget in (self.replace_entry, self.replace_button, self.replace_all_button):
+            widget.config(state=state)
+        # 有选中的单行文本时用它作为查找内容
+        selection = self.text.tag_ranges('sel')
+        if selection:
+            selected = self.text.get(selection[0], selection[1])
+            if selected and '\n' not in selected:
+                self.find_var.set(selected)
+        self.find_entry.focus_set()
+        self.find_entry.select_range(0, tk.END)
+        self._on_query_changed()
+
+    def hide(self):
+        if not self.visible:
+            return
+        self.frame.pack_forget()
+        self.visible = False
+        self._generation += 1
+        self.matches, self._starts, self._current = [], [], None
+        self.text.tag_remove(MATCH_TAG, '1.0', 'end')
+        self.text.tag_remove(CURRENT_TAG, '1.0', 'end')
+        self.text.focus_set()
+
+    # --- 搜索 ---
+
+    def _compile(self):
+        query = self.find_var.get()
+        if not query:
+            return None
+        flags = 0 if self.case_var.get() else re.IGNORECASE
+        if self.regex_var.get():
+            return re.compile(query, flags | re.MULTILINE)
+        return re.compile(re.escape(query), flags)
+
+    def _on_query_changed(self):
+        self._current = None
+        self._stale = True
+        self._schedule_search()
+
+    def _on_edit(self, first_line):
+        self._edit_count += 1
+        if self.visible and self.find_var.get():
+            # 匹配位置已经过时，稍后重新搜索
+            self._stale = True
+            self._schedule_search()
+
+    def _schedule_search(self):
+        if self._search_after_id is not None:
+            self.text.after_cancel(self._search_after_id)
+        self._search_after_id = self.text.after(SEARCH_DELAY_MS, self._start_search)
+
+    def _start_search(self):
+        self._search_after_id = None
+        if not self.visible:
+            return
+        try:
+            self._pattern = self._compile()
+        except re.error as e:
+            self._pattern = None
+            self._show_results([], False, 0)
+            self.status_var.set(f"正则表达式错误: {e}")
+            return
+        if self._pattern is None:
+            self._show_results([], False, 0)
+            self.status_var.set("")
+            return
+        self._generation += 1
+        generation, pattern = self._generation, self._pattern
+        text = self.text.get('1.0', 'end-1c')
+        self._stale = False
+        self._searching = True
+        self.status_var.set("正在搜索...")
+
+        def run():
+            started = time.perf_counter()
+            matches, truncated = find_matches(pattern, text)
+            self._results.put((generation, matches, truncated, (time.perf_counter() - started) * 1000))
+
+        threading.Thread(target=run, daemon=True).start()
+        self.text.after(SEARCH_POLL_MS, self._poll_search)
+
+    def _poll_search(self):
+        try:
+            generation, matches, truncated, elapsed_ms = self._results.get_nowait()
+        except queue.Empty:
+            self.text.after(SEARCH_POLL_MS, self._poll_search)
+            return
+        if generation != self._generation:
+            # 过时的结果 (搜索期间修改了查找内容或缓冲区)
+            return
+        self._searching = False
+        self._show_results(matches, truncated, elapsed_ms)
+        action, self._pending_action = self._pending_action, None
+        if action is not None:
+            action()
+
+    def _show_results(self, matches, truncated, elapsed_ms):
+        self.matches = matches
+        self._starts = [(m[0], m[1]) for m in matches]
+        self._current = None
+        self.text.tag_remove(CURRENT_TAG, '1.0', 'end')
+        count = f"超过 {len(matches)}" if truncated else f"{len(matches)}"
+        scope = " (仅当前页)" if self.is_read_only() else ""
+        self.status_var.set(f"{count} 个匹配{scope}，耗时 {elapsed_ms:.0f} ms")
+        self._highlight_visible()
+
+    def _ready(self, action):
+        """匹配索引是最新的时立即执行 action，否则在搜索完成后执行。"""
+        if self._stale or self._searching or self._search_after_id is not None:
+            self._pending_action = action
+            if self._search_after_id is not None or self._stale:
+                if self._search_after_id is not None:
+                    self.text.after_cancel(self._search_after_id)
+                self._start_search()
+            return False
+        action()
+        return True
+
+    # --- 高亮 ---
+
+    def _schedule_highlight(self):
+        if self.visible and self._highlight_after_id is None:
+            self._highlight_after_id = self.text.after_idle(self._highlight_visible)
+
+    def _highlight_visible(self):
+        """只为可见区域中的匹配添加高亮标签。"""
+        self._highlight_after_id = None
+        self.text.tag_remove(MATCH_TAG, '1.0', 'end')
+        if not self.matches:
+            return
+        first, last = self.proxy.visible_lines()
+        low = bisect.bisect_left(self._starts, (first, 0))
+        high = bisect.bisect_left(self._starts, (last + 1, 0))
+        # 从上一行开始的跨行匹配也可能可见
+        low = max(low - 1, 0)
+        for start_line, start_col, end_line, end_col in self.matches[low:high]:
+            self.text.tag_add(MATCH_TAG, f"{start_line}.{start_col}", f"{end_line}.{end_col}")
+
+    # --- 定位 ---
+
+    def _cursor(self):
+        line, col = str(self.text.index('insert')).split('.')
+        return int(line), int(col)
+
+    def _select(self, index):
+        self._current = index
+        start_line, start_col, end_line, end_col = self.matches[index]
+        start, end = f"{start_line}.{start_col}", f"{end_line}.{end_col}"
+        self.text.tag_remove(CURRENT_TAG, '1.0', 'end')
+        self.text.tag_add(CURRENT_TAG, start, end)
+        self.text.mark_set('insert', end)
+        self.text.see(start)
+        self.status_var.set(f"第 {index + 1} / {len(self.matches)} 个匹配")
+
+    def find_next(self):
+        def action():
+            if not self.matches:
+                return
+            if self._current is not None:
+                index = (self._current + 1) % len(self.matches)
+            else:
+                index = bisect.bisect_left(self._starts, self._cursor()) % len(self.matches)
+            self._select(index)
+        self._ready(action)
+
+    def find_previous(self):
+        def action():
+            if not self.matches:
+                return
+            if self._current is not None:
+                index = (self._current - 1) % len(self.matches)
+            else:
+                index = (bisect.bisect_left(self._starts, self._cursor()) - 1) % len(self.matches)
+            self._select(index)
+        self._ready(action)
+
+    # --- 替换 ---
+
+    def replace_current(self):
+        """替换当前匹配并跳到下一个。"""
+        if self.is_read_only():
+            return
+
+        def action():
+            if self._current is None:
+                self.find_next()
+                return
+            start_line, start_col, end_line, end_col = self.matches[self._current]
+            start, end = f"{start_line}.{start_col}", f"{end_line}.{end_col}"
+            matched = self.text.get(start, end)
+            match = self._pattern.fullmatch(matched)
+            if match is None:
+                self._stale = True
+                self._ready(self.find_next)
+                return
+            new_text = match.expand(self.replace_var.get()) if self.regex_var.get() else self.replace_var.get()
+            self.text.edit_separator()
+            self.text.delete(start, end)
+            self.text.insert(start, new_text)
+            self.text.edit_separator()
+            self.text.mark_set('insert', f"{start}+{len(new_text)}c")
+            # 修改会触发重新搜索，完成后选中下一个匹配
+            self._current = None
+            self._pending_action = self.find_next
+        self._ready(action)
+
+    def replace_all(self):
+        """在工作线程中计算所有替换，然后从后往前应用，整个操作只占一个撤销步骤。"""
+        if self.is_read_only():
+            return
+        try:
+            pattern = self._compile()
+        except re.error as e:
+            self.status_var.set(f"正则表达式错误: {e}")
+            return
+        if pattern is None:
+            return
+        # 让正在进行的搜索作废: 它的结果会被 _poll_search 丢弃，匹配索引需要重新搜索
+        self._generation += 1
+        self._searching = False
+        self._stale = True
+        generation, edit_count = self._generation, self._edit_count
+        text = self.text.get('1.0', 'end-1c')
+        replacement, is_regex = self.replace_var.get(), self.regex_var.get()
+        self.status_var.set("正在替换...")
+        results = queue.Queue()
+        started = time.perf_counter()
+
+        def run():
+            try:
+                results.put(plan_replacements(pattern, text, replacement, is_regex))
+            except (re.error, IndexError) as e:
+                # 例如替换文本中引用了不存在的分组
+                results.put(e)
+
+        def poll():
+            try:
+                edits = results.get_nowait()
+            except queue.Empty:
+                self.text.after(SEARCH_POLL_MS, poll)
+                return
+            if isinstance(edits, Exception):
+                self.status_var.set(f"替换失败: {edits}")
+                return
+            # 搜索要等防抖之后才更新 _generation，缓冲区的修改要单独检查
+            if generation != self._generation or edit_count != self._edit_count:
+                self.status_var.set("缓冲区在替换期间被修改，请重试")
+                return
+            self._apply_edits(edits)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._on_query_changed()
+            self._pending_action = lambda: self.status_var.set(f"已替换 {len(edits)} 处，耗时 {elapsed_ms:.0f} ms")
+
+        threading.Thread(target=run, daemon=True).start()
+        self.text.after(SEARCH_POLL_MS, poll)
+
+    def _apply_edits(self, edits):
+        if not edits:
+            return
+        autoseparators = self.text.cget('autoseparators')
+        self.text.config(autoseparators=False)
+        self.text.edit_separator()
+        try:
+            # 从后往前替换，前面的位置不受影响；直接调用原命令，最后统一通知一次
+            for start_line, start_col, end_line, end_col, new_text in reversed(edits):
+                self.proxy.call('replace', f"{start_line}.{start_col}", f"{end_line}.{end_col}", new_text)
+        finally:
+            self.text.edit_separator()
+            self.text.config(autoseparators=autoseparators)
+        self.proxy.notify_edit(edits[0][0])
@@ -0,0 +1,262 @@
+import os
+import re
+import queue
+import threading
+
+# 编辑或滚动后等待多久开始高亮 (毫秒)，连续输入时合并成一次
+HIGHLIGHT_DELAY_MS = 30
+# 检查后台词法分析结果的间隔 (毫秒)
+HIGHLIGHT_POLL_MS = 10
+
+TAG_COLORS = {
+    'keyword': "#0033b3", 'string': "#067d17", 'comment': "#8c8c8c", 'number': "#1750eb",
+    'decorator': "#9e880d", 'function': "#00627a", 'key': "#871094", 'attribute': "#174ad4",
+    'heading': "#0033b3", 'code': "#067d17", 'emphasis': "#871094", 'link': "#1750eb",
+}
+TAG_PREFIX = "hl_"
+
+
+class RegexLexer:
+    """
+    按行工作的正则词法分析器。
+
+    rules: [(标记, 正则)]，按顺序匹配；
+    spans: [(标记, 开始正则, 结束正则)]，可以跨行的结构 (如三引号字符串、XML 注释)。
+    每行的分析结果只取决于该行文本和行首状态 (None 或未结束的 span 序号)。
+    """
+
+    def __init__(self, rules, spans=()):
+        self.spans = [(tag, re.compile(end)) for tag, _, end in spans]
+        self.tags = [tag for tag, _ in rules]
+        parts = [f"(?P<s{i}>{start})" for i, (_, start, _) in enumerate(spans)]
+        parts += [f"(?P<r{i}>{pattern})" for i, (_, pattern) in enumerate(rules)]
+        self.master = re.compile("|".join(parts))
+
+    def tokenize_line(self, line, state):
+        """返回 ([(标记, 开始列, 结束列)], 下一行的行首状态)。"""
+        tokens = []
+        pos = 0
+        if state is not None:
+            tag, end_re = self.spans[state]
+            end = end_re.search(line)
+            if end is None:
+                return [(tag, 0, len(line))] if line else [], state
+            tokens.append((tag, 0, end.end()))
+            pos = end.end()
+        while pos < len(line):
+            match = self.master.search(line, pos)
+            if match is None:
+                break
+            kind, index = match.lastgroup[0], int(match.lastgroup[1:])
+            if kind == 's':
+                tag, end_re = self.spans[index]
+                end = end_re.search(line, match.end())
+                if end is None:
+                    tokens.append((tag, match.start(), len(line)))
+                    return tokens, index
+                tokens.append((tag, match.start(), end.end()))
+                pos = end.end()
+                continue
+            if match.end() > match.start():
+                tokens.append((self.tags[index], match.start(), match.end()))
+            pos = max(match.end(), pos + 1)
+        return tokens, None
+
+
+_STRING_PREFIX = r"(?:[rRbBuUfF]{1,2})?"
+PYTHON_LEXER = RegexLexer(
+    rules=[
+        ('comment', r"#.*"),
+        ('string', _STRING_PREFIX + r'"(?:[^"\\]|\\.)*"?'),
+        ('string', _STRING_PREFIX + r"'(?:[^'\\]|\\.)*'?"),
+        ('decorator', r"^\s*@[\w.]+"),
+        ('function', r"(?<=\bdef )\w+|(?<=\bclass )\w+"),
+        ('keyword', r"\b(?:False|None|True|and|as|assert|async|await|break|class|continue|def|del|elif|else|"
+                    r"except|finally|for|from|global|if|import|in|is|lambda|nonlocal|not|or|pass|raise|"
+                    r"return|try|while|with|yield|self)\b"),
+        ('number', r"\b0[xXoObB][\da-fA-F_]+\b|\b\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?j?\b"),
+    ],
+    spans=[
+        ('string', _STRING_PREFIX + r'"""', r'"""'),
+        ('string', _STRING_PREFIX + r"'''", r"'''"),
+    ])
+
+JSON_LEXER = RegexLexer(rules=[
+    ('key', r'"(?:[^"\\]|\\.)*"(?=\s*:)'),
+    ('string', r'"(?:[^"\\]|\\.)*"?'),
+    ('keyword', r"\b(?:true|false|null)\b"),
+    ('number', r"-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b"),
+])
+
+MARKDOWN_LEXER = RegexLexer(
+    rules=[
+        ('heading', r"^#{1,6}\s.*"),
+        ('comment', r"^\s*>.*"),
+        ('keyword', r"^\s*(?:[-*+]|\d+\.)\s"),
+        ('code', r"`[^`]+`"),
+        ('emphasis', r"\*\*[^*]+\*\*|__[^_]+__|\*[^*\s][^*]*\*|_[^_\s][^_]*_"),
+        ('link', r"!?\[[^\]]*\]\([^)]*\)"),
+    ],
+    spans=[('code', r"^\s*```", r"^\s*```")])
+
+XML_LEXER = RegexLexer(
+    rules=[
+        ('keyword', r"</?[\w:.-]+|/?>|<\?[\w:.-]+|\?>"),
+        ('attribute', r"[\w:.-]+(?=\s*=)"),
+        ('string', r'"[^"]*"|\'[^\']*\''),
+        ('number', r"&#?\w+;"),
+    ],
+    spans=[
+        ('comment', r"<!--", r"-->"),
+        ('code', r"<!\[CDATA\[", r"\]\]>"),
+    ])
+
+LEXERS_BY_EXTENSION = {
+    '.py': PYTHON_LEXER, '.pyw': PYTHON_LEXER,
+    '.json': JSON_LEXER,
+    '.md': MARKDOWN_LEXER, '.markdown': MARKDOWN_LEXER,
+    '.xml': XML_LEXER, '.html': XML_LEXER, '.htm': XML_LEXER, '.svg': XML_LEXER,
+}
+
+
+def lexer_for_path(path):
+    """按扩展名返回词法分析器；不支持的文件类型返回 None。"""
+    return LEXERS_BY_EXTENSION.get(os.path.splitext(str(path))[1].lower())
+
+
+class SyntaxHighlighter:
+    """
+    Text 控件的增量语法高亮。
+
+    - 通过 TextCommandProxy 得知编辑 (insert/delete/replace) 和滚动，
+      只记录受影响的第一行，不重新分析整个缓冲区；
+    - 保存每行的行首状态，编辑第 N 行只会让第 N 行之后的状态失效；
+    - 只分析可见区域中还没有高亮 (或被编辑过) 的行，词法分析在后台线程中进行，
+      UI 线程只负责截取文本和添加标签。
+    """
+
+    def __init__(self, text_widget, proxy):
+        self.text = text_widget
+        self.proxy = proxy
+        self.lexer = None
+        # _states[i] 为第 i + 1 行的行首状态，只有这些行的状态是可信的
+        self._states = [None]
+        self._painted = set()
+        self._generation = 0
+        self._after_id = None
+        self._poll_id = None
+        self._busy = False
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = None
+
+        for tag, color in TAG_COLORS.items():
+            self.text.tag_configure(TAG_PREFIX + tag, foreground=color)
+        proxy.edit_listeners.append(self._on_edit)
+        proxy.view_listeners.append(self._on_view_changed)
+        # 窗口变大时会露出新的行
+        self.text.bind('<Configure>', lambda event: self._schedule(), add='+')
+
+    def set_lexer(self, lexer):
+        """切换语言 (None 表示不高亮)，清除现有的高亮。"""
+        self.lexer = lexer
+        self._reset()
+        self._clear_tags('1.0', 'end')
+        if lexer is not None:
+            self._schedule()
+
+    def _reset(self):
+        self._states = [None]
+        self._painted = set()
+        self._generation += 1
+
+    def _clear_tags(self, start, end):
+        for tag in TAG_COLORS:
+            self.text.tag_remove(TAG_PREFIX + tag, start, end)
+
+    def _on_edit(self, first_line):
+        if self.lexer is not None:
+            self._mark_dirty(first_line)
+
+    def _on_view_changed(self):
+        if self.lexer is not None:
+            self._schedule()
+
+    def _mark_dirty(self, first_line):
+        """第 first_line 行被修改: 之后各行的行首状态和已有的高亮都可能失效。"""
+        self._generation += 1
+        del self._states[first_line:]
+        self._painted = {line for line in self._painted if line < first_line}
+        self._schedule()
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.text.after(HIGHLIGHT_DELAY_MS, self._start_job)
+
+    def _start_job(self):
+        self._after_id = None
+        if self.lexer is None or self._busy:
+            return
+        first, last = self.proxy.visible_lines()
+        if len(self._states) >= first and all(line in self._painted for line in range(first, last + 1)):
+            return
+        # 从最后一个可信的行首状态开始分析，直到可见区域的最后一行
+        start = min(len(self._states), first)
+        lines = self.text.get(f"{start}.0", f"{last}.end").split('\n')
+        job = (self._generation, self.lexer, start, self._states[start - 1], lines, first)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run_worker, daemon=True)
+            self._worker.start()
+        self._busy = True
+        self._jobs.put(job)
+        self._poll_id = self.text.after(HIGHLIGHT_POLL_MS, self._poll_results)
+
+    def _run_worker(self):
+        while True:
+            generation, lexer, start, state, lines, first = self._jobs.get()
+            new_states, tokens = [], {}
+            try:
+                for offset, line in enumerate(lines):
+                    line_tokens, state = lexer.tokenize_line(line, state)
+                    if start + offset >= first:
+                        tokens[start + offset] = line_tokens
+                    new_states.append(state)
+            except Exception as e:
+                print(f"语法高亮失败: {e}")
+                self._results.put(None)
+                continue
+            self._results.put((generation, lexer, start, new_states, tokens))
+
+    def _poll_results(self):
+        try:
+            result = self._results.get_nowait()
+        except queue.Empty:
+            self._poll_id = self.text.after(HIGHLIGHT_POLL_MS, self._poll_results)
+            return
+        self._poll_id = None
+        self._busy = False
+        if result is None:
+            self.set_lexer(None)
+            return
+        generation, lexer, start, new_states, tokens = result
+        if generation == self._generation and lexer is self.lexer:
+            self._apply(start, new_states, tokens)
+        # 分析期间可能发生了编辑或滚动
+        self._schedule()
+
+    def _apply(self, start, new_states, tokens):
+        del self._states[start:]
+        self._states.extend(new_states)
+        lines = sorted(line for line in tokens if line not in self._painted)
+        # 按连续的行段清除旧标签，已经高亮且没有变化的行保持不动
+        run_start = None
+        for i, line in enumerate(lines):
+            if run_start is None:
+                run_start = line
+            if i + 1 == len(lines) or lines[i + 1] != line + 1:
+                self._clear_tags(f"{run_start}.0", f"{line}.end")
+                run_start = None
+        for line in lines:
+            for tag, start_col, end_col in tokens[line]:
+                self.text.tag_add(TAG_PREFIX + tag, f"{line}.{start_col}", f"{line}.{end_col}")
+            self._painted.add(line)
@@ -0,0 +1,150 @@
+"""
+编辑器单实例。
+
+第一个启动的编辑器进程在 Unix socket 上监听；之后从文件管理器或桌面打开文档时，
+先把文件路径发给已在运行的编辑器，由它在新标签页中打开，不再为每个文档启动一个新的解释器。
+不支持 Unix socket 的平台 (或编辑器没有运行) 时，调用方回退到启动新进程。
+
+协议: 客户端发送一行 JSON {"open": [绝对路径, ...]}，服务器回复一行 {"ok": true}。
+路径列表为空表示把编辑器切换到前台并新建一个空白标签页；{"ping": true} 只检查实例是否存在。
+"""
+import os
+import sys
+import json
+import queue
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+EDITOR_SOCKET_NAME = "editor.sock"
+# 连接/等待应答的超时时间 (秒)；本地 socket 正常情况下几毫秒内就有应答
+INSTANCE_CONNECT_TIMEOUT = 1.0
+
+
+def is_single_instance_supported():
+    return sys.platform != 'win32' and hasattr(socket, 'AF_UNIX')
+
+
+def get_socket_path():
+    """获取编辑器的 socket 路径，优先使用用户运行时目录 (与预热进程相同)。"""
+    try:
+        from system.platformdirs_pack import dirs
+        runtime_dir = Path(dirs.user_runtime_dir)
+        runtime_dir.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        runtime_dir = Path(tempfile.gettempdir())
+    return str(runtime_dir / f"{os.getuid()}_{EDITOR_SOCKET_NAME}")
+
+
+def forward_open(paths=(), socket_path=None):
+    """
+    请求已在运行的编辑器打开 paths。
+
+    返回:
+        bool: True 表示已交给运行中的编辑器；False 表示没有可用的编辑器实例，调用方应启动新进程。
+    """
+    if not is_single_instance_supported():
+        return False
+    request = {"open": [os.path.abspath(str(path)) for path in paths if path]}
+    return _send_request(socket_path or get_socket_path(), request)
+
+
+def _send_request(socket_path, request):
+    if not os.path.exists(socket_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(INSTANCE_CONNECT_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+            reply = json.loads(sock.makefile('r', encoding='utf-8').readline())
+    except (OSError, ValueError) as e:
+        print(f"编辑器实例不可用: {e}")
+        return False
+    return bool(reply.get('ok'))
+
+
+class InstanceServer:
+    """
+    【运行在编辑器进程中】在后台线程中接受打开请求。
+
+    收到的路径列表放入 requests 队列，由 Tk 主线程用 after() 轮询处理。
+    """
+
+    def __init__(self, socket_path=None):
+        self.socket_path = socket_path or (get_socket_path() if is_single_instance_supported() else None)
+        self.requests = queue.Queue()
+        self._server = None
+
+    def start(self):
+        """
+        开始监听。返回 False 表示当前平台不支持，或已经有另一个编辑器实例在监听
+        (两个编辑器几乎同时启动时)，此时本进程作为普通的独立窗口运行。
+        """
+        if not self.socket_path:
+            return False
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            try:
+                server.bind(self.socket_path)
+            except OSError:
+                # socket 文件已存在: 能连上说明另一个实例在运行，否则是上次崩溃留下的
+                if _send_request(self.socket_path, {"ping": True}):
+                    server.close()
+                    return False
+                os.unlink(self.socket_path)
+                server.bind(self.socket_path)
+            server.listen(8)
+        except OSError as e:
+            print(f"编辑器无法监听 {self.socket_path}: {e}")
+            server.close()
+            return False
+        self._server = server
+        threading.Thread(target=self._serve, args=(server,), daemon=True).start()
+        return True
+
+    def _serve(self, server):
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                # stop() 关闭了 socket
+                return
+            with conn:
+                self._handle(conn)
+
+    def _handle(self, conn):
+        try:
+            conn.settimeout(INSTANCE_CONNECT_TIMEOUT)
+            request = json.loads(conn.makefile('r', encoding='utf-8').readline())
+            if request.get('ping'):
+                self._reply(conn, {"ok": True})
+                return
+            paths = [str(path) for path in request.get('open', [])]
+        except (OSError, ValueError, AttributeError) as e:
+            self._reply(conn, {"ok": False, "error": f"无效请求: {e}"})
+            return
+        self.requests.put(paths)
+        self._reply(conn, {"ok": True})
+
+    @staticmethod
+    def _reply(conn, reply):
+        try:
+            conn.sendall((json.dumps(reply) + "\n").encode('utf-8'))
+        except OSError:
+            pass
+
+    def stop(self):
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+        try:
+            server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        server.close()
@@ -0,0 +1,172 @@
+import mmap
+import tkinter as tk
+from .encoding import detect_file_encoding
+
+# 检测编码时最多读取的字节数
+ENCODING_SAMPLE_BYTES = 64 * 1024
+# 文本框中一次显示的字节数 (窗口)，滚动到窗口边缘时换页
+PAGE_BYTES = 512 * 1024
+# 超过这个长度的行 (例如压缩成一行的 JSON) 在任意字符边界处断开显示
+MAX_LINE_BYTES = PAGE_BYTES
+
+class LargeFileDocument:
+    """
+    以内存映射方式打开的大文件，按字节偏移读取以换行符对齐的窗口。
+    文件内容不会整体读入内存，只有正在显示的窗口会被解码。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self.size = len(self.mm)
+        # 只用开头的一段样本检测编码
+        self.detection = detect_file_encoding(path, self.mm[:ENCODING_SAMPLE_BYTES], truncated=True)
+        self.encoding = self.detection.encoding
+        self.data_start = self.detection.bom_length
+        # 换行符的编码 (UTF-16/32 中是多个字节)，以及对齐时需要遵守的码元长度
+        self.newline = '\n'.encode(self.encoding)
+        self.unit = len(self.newline)
+
+    def line_start_after(self, offset):
+        """返回 offset 处 (含) 之后第一行的起始偏移；后面没有换行符时返回文件大小。"""
+        offset = max(offset, self.data_start)
+        if offset == self.data_start:
+            return offset
+        if offset >= self.size:
+            return self.size
+        # 从 offset 之前一个码元开始找: offset 本身就是行首时也能找到
+        position = offset - self.unit
+        limit = offset + MAX_LINE_BYTES
+        while True:
+            index = self.mm.find(self.newline, position, limit)
+            if index < 0:
+                return self.size if limit >= self.size else self._char_boundary(offset)
+            if (index - self.data_start) % self.unit == 0:
+                return index + self.unit
+            position = index + 1
+
+    def line_start_before(self, offset):
+        """返回包含 offset 的行的起始偏移。"""
+        offset = min(max(offset, self.data_start), self.size)
+        lower = max(self.data_start, offset - MAX_LINE_BYTES)
+        position = offset
+        while position > lower:
+            index = self.mm.rfind(self.newline, lower, position)
+            if index < 0:
+                break
+            if (index - self.data_start) % self.unit == 0:
+                return index + self.unit
+            position = index + self.unit - 1
+        return self.data_start if lower == self.data_start else self._char_boundary(offset, forward=False)
+
+    def _char_boundary(self, offset, forward=True):
+        """把超长行中的断开位置调整到字符边界 (向后或向前)。"""
+        remainder = (offset - self.data_start) % self.unit
+        if remainder:
+            offset += self.unit - remainder if forward else -remainder
+        if self.encoding.replace('_', '-').lower() in ('utf-8', 'utf8'):
+            # 跳过 UTF-8 的后续字节 (10xxxxxx)
+            step = 1 if forward else -1
+            for _ in range(3):
+                if not self.data_start < offset < self.size or self.mm[offset] & 0xC0 != 0x80:
+                    break
+                offset += step
+        return offset
+
+    def read_window(self, start, max_bytes=PAGE_BYTES):
+        """返回 (文本, 结束偏移)：从 start 开始约 max_bytes 字节、在行尾截断的内容。"""
+        end = self.line_start_after(start + max_bytes) if start + max_bytes < self.size else self.size
+        if end <= start:
+            end = self.size
+        return self.mm[start:end].decode(self.encoding, errors='replace'), end
+
+    def count_lines(self, start, end):
+        return self.mm[start:end].count(self.newline)
+
+    def close(self):
+        self.mm.close()
+        self._file.close()
+
+
+class LargeFileView:
+    """
+    在 Text 控件中分页显示 LargeFileDocument (只读)。
+
+    Text 中只放当前窗口的内容；滚动条接管为整个文件的位置。
+    用户滚动到窗口的顶部或底部时，以当前第一行为中心重新加载窗口，视觉上连续滚动。
+    """
+
+    def __init__(self, text_widget, scrollbar, document):
+        self.text = text_widget
+        self.scrollbar = scrollbar
+        self.document = document
+        self.window_start = document.data_start
+        self.window_end = document.data_start
+        self._shift_after_id = None
+        self.text.config(yscrollcommand=self._on_text_scrolled)
+        self.scrollbar.config(command=self._on_scrollbar)
+        self._load_window(self.window_start)
+
+    def _load_window(self, start, top_offset=None):
+        """加载从 start 开始的窗口，并让 top_offset 所在的行显示在顶部。"""
+        text, end = self.document.read_window(start)
+        self.window_start, self.window_end = start, end
+        self.text.config(state=tk.NORMAL)
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', text)
+        self.text.config(state=tk.DISABLED)
+        self.text.edit_reset()
+        self.text.edit_modified(False)
+        if top_offset is not None and top_offset > start:
+            line = self.document.count_lines(start, top_offset) + 1
+            self.text.yview(f"{line}.0")
+        else:
+            self.text.yview('1.0')
+
+    def _top_offset(self):
+        """返回文本框中第一个可见行在文件中的字节偏移。"""
+        top_line = int(self.text.index('@0,0').split('.')[0])
+        before = self.text.get('1.0', f"{top_line}.0")
+        return self.window_start + len(before.encode(self.document.encoding, errors='replace'))
+
+    def _to_file_fraction(self, fraction):
+        size = self.document.size or 1
+        return (self.window_start + fraction * (self.window_end - self.window_start)) / size
+
+    def _on_text_scrolled(self, first, last):
+        first, last = float(first), float(last)
+        self.scrollbar.set(self._to_file_fraction(first), self._to_file_fraction(last))
+        at_top = first <= 0.0 and self.window_start > self.document.data_start
+        at_bottom = last >= 1.0 and self.window_end < self.document.size
+        if (at_top or at_bottom) and self._shift_after_id is None:
+            # 不在 yscrollcommand 回调中直接替换内容，避免重入
+            self._shift_after_id = self.text.after_idle(self._shift_window)
+
+    def _shift_window(self):
+        self._shift_after_id = None
+        self.goto_offset(self._top_offset())
+
+    def _on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            self.goto_offset(int(float(args[1]) * self.document.size))
+        else:
+            self.text.yview(*args)
+
+    def goto_offset(self, offset):
+        """跳转到文件中的字节偏移。新窗口以该行为中心，向前、向后都还能继续滚动半页。"""
+        top = self.document.line_start_before(offset)
+        self._load_window(self.document.line_start_before(top - PAGE_BYTES // 2), top)
+
+    def close(self):
+        """还原 Text 控件和滚动条的设置。"""
+        if self._shift_after_id is not None:
+            self.text.after_cancel(self._shift_after_id)
+            self._shift_after_id = None
+        self.text.config(state=tk.NORMAL, yscrollcommand=self.scrollbar.set)
+        self.scrollbar.config(command=self.text.yview)
+        self.document.close()
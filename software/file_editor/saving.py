@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+# 超过这个字符数的缓冲区在后台线程中保存
+BACKGROUND_SAVE_CHARS = 256 * 1024
+# 自动保存日志的间隔 (毫秒)
+AUTOSAVE_INTERVAL_MS = 30 * 1000
+JOURNAL_DIRNAME = "editor_journal"
+# 还没有保存过的新文件在日志中的键
+UNTITLED_KEY = "untitled"
+
+
+def save_text_file(path, text, encoding, bom=False):
+    """
+    原子地保存文本: 写入临时文件、fsync、再替换目标文件，断电时不会留下被截断的文件。
+    目标是符号链接时写入链接指向的文件。
+
+    返回:
+        float: 耗时 (毫秒)。
+    """
+    from system.platformdirs_pack import atomic_write_text
+    started = time.perf_counter()
+    if bom:
+        text = '\ufeff' + text
+    atomic_write_text(os.path.realpath(path), text, encoding=encoding, errors='replace')
+    return (time.perf_counter() - started) * 1000
+
+
+class BackgroundSave(threading.Thread):
+    """在后台线程中执行 save_text_file；完成后 error 为 None 或异常，elapsed_ms 为耗时。"""
+
+    def __init__(self, path, text, encoding, bom=False):
+        super().__init__(daemon=True)
+        self.path = path
+        self._args = (path, text, encoding, bom)
+        self.error = None
+        self.elapsed_ms = 0.0
+
+    def run(self):
+        try:
+            self.elapsed_ms = save_text_file(*self._args)
+        except Exception as e:
+            self.error = e
+
+
+class AutosaveJournal:
+    """
+    未保存修改的自动保存日志，位于用户数据目录的 editor_journal 下。
+
+    每个缓冲区一个 JSON 文件 (文件名为路径的 SHA-1)，内容为路径、编码、时间和全文。
+    文件保存成功或用户放弃修改时删除对应的日志；程序崩溃或断电后，下次打开同一文件时提示恢复。
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._write_lock = threading.Lock()
+        # 键 -> discard() 的次数；写入线程启动后日志被删除时，不再写入过时的内容
+        self._discards = {}
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            from system.platformdirs_pack import get_config_path
+            self._directory = get_config_path(JOURNAL_DIRNAME)
+        Path(self._directory).mkdir(parents=True, exist_ok=True)
+        return Path(self._directory)
+
+    @staticmethod
+    def _key(path):
+        return os.path.realpath(path) if path else UNTITLED_KEY
+
+    def _entry_path(self, path):
+        name = hashlib.sha1(self._key(path).encode('utf-8')).hexdigest()
+        return self.directory / f"{name}.json"
+
+    def write(self, path, text, encoding, bom=False):
+        """在后台线程中写入 path 对应缓冲区的日志。"""
+        try:
+            file_mtime = os.path.getmtime(path) if path else None
+        except OSError:
+            file_mtime = None
+        entry = {
+            'path': path, 'encoding': encoding, 'bom': bom, 'saved_at': time.time(),
+            'file_mtime': file_mtime, 'text': text,
+        }
+        generation = self._discards.get(self._key(path), 0)
+        threading.Thread(target=self._write_entry, args=(path, entry, generation), daemon=True).start()
+
+    def _write_entry(self, path, entry, generation):
+        from system.platformdirs_pack import atomic_write_text
+        with self._write_lock:
+            if self._discards.get(self._key(path), 0) != generation:
+                return
+            try:
+                atomic_write_text(self._entry_path(path), json.dumps(entry, ensure_ascii=False))
+            except (OSError, ImportError) as e:
+                print(f"写入自动保存日志失败: {e}")
+
+    def discard(self, path):
+        """删除 path 对应的日志 (已经保存或用户放弃了修改)。"""
+        with self._write_lock:
+            key = self._key(path)
+            self._discards[key] = self._discards.get(key, 0) + 1
+            try:
+                self._entry_path(path).unlink()
+            except FileNotFoundError:
+                pass
+            except (OSError, ImportError) as e:
+                print(f"删除自动保存日志失败: {e}")
+
+    def find(self, path):
+        """返回 path 对应的日志内容 (字典)，没有或无法读取时返回 None。"""
+        try:
+            with open(self._entry_path(path), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ImportError, json.JSONDecodeError) as e:
+            print(f"读取自动保存日志失败: {e}")
+            return None
+        if not isinstance(entry, dict) or 'text' not in entry:
+            return None
+        return entry
@@ -0,0 +1,66 @@
+import tkinter as tk
+
+EDIT_OPERATIONS = ('insert', 'delete', 'replace')
+VIEW_OPERATIONS = ('yview', 'see')
+
+
+class TextCommandProxy:
+    """
+    截获 Text 控件的 Tcl 命令 (与 idlelib 的 WidgetRedirector 相同的做法: 把控件命令改名，原名称换成代理)。
+
+    不论修改来自键盘、粘贴、撤销还是程序调用，都会通知监听者:
+        edit_listeners: callback(first_line)，first_line 为受影响的第一行；
+        view_listeners: callback()，可见区域可能发生了变化 (滚动)。
+    """
+
+    def __init__(self, text_widget):
+        self.text = text_widget
+        self.edit_listeners = []
+        self.view_listeners = []
+        self._widget_command = str(text_widget)
+        self._original_command = self._widget_command + "_orig"
+        text_widget.tk.call("rename", self._widget_command, self._original_command)
+        text_widget.tk.createcommand(self._widget_command, self._dispatch)
+
+    def call(self, *args):
+        """直接调用原控件命令 (不通知监听者)。"""
+        return self.text.tk.call(self._original_command, *args)
+
+    def close(self):
+        """还原控件命令 (销毁控件之前调用)。"""
+        self.edit_listeners.clear()
+        self.view_listeners.clear()
+        self.text.tk.deletecommand(self._widget_command)
+        self.text.tk.call("rename", self._original_command, self._widget_command)
+
+    def notify_edit(self, first_line):
+        """用 call() 批量修改后，统一通知一次编辑监听者。"""
+        for listener in self.edit_listeners:
+            listener(first_line)
+
+    def line_of(self, index):
+        return int(str(self.call('index', index)).split('.')[0])
+
+    def visible_lines(self):
+        """返回 (第一个, 最后一个) 可见行的行号。"""
+        first = self.line_of('@0,0')
+        last = self.line_of(f"@0,{self.text.winfo_height()}")
+        return first, last
+
+    def _dispatch(self, operation, *args):
+        try:
+            if operation in EDIT_OPERATIONS and self.edit_listeners:
+                first_line = self.line_of(args[0])
+                result = self.call(operation, *args)
+                for listener in self.edit_listeners:
+                    listener(first_line)
+                return result
+            result = self.call(operation, *args)
+            if operation in VIEW_OPERATIONS and args:
+                for listener in self.view_listeners:
+                    listener()
+            return result
+        except tk.TclError:
+            # 与 idlelib 相同: Tk 自带的绑定会在 catch 中执行可能失败的命令。
+            # 因此经过代理后 text.index('sel.first') 等不会抛出 TclError，应改用 tag_ranges('sel') 判断
+            return ""
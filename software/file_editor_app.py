@@ -1,8 +1,9 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog, font, colorchooser
+from tkinter import ttk, filedialog, messagebox, simpledialog, font, colorchooser
 import os
 import sys
-import chardet
+import queue
+import datetime
 from pathlib import Path
 
 # 获取当前文件的绝对路径
@@ -12,22 +13,323 @@ project_root = os.path.dirname(os.path.dirname(current_file_path))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from system.config import WINDOW_WIDTH, WINDOW_HEIGHT
+from system.config import WINDOW_WIDTH, WINDOW_HEIGHT, EDITOR_LARGE_FILE_THRESHOLD
+from software.file_editor.large_file import LargeFileDocument, LargeFileView
+from software.file_editor.encoding import decode_file, describe
+from software.file_editor.text_proxy import TextCommandProxy
+from software.file_editor.highlighter import SyntaxHighlighter, lexer_for_path
+from software.file_editor.find_replace import FindReplacePanel
+from software.file_editor.instance import InstanceServer, forward_open
+from software.file_editor.saving import (AutosaveJournal, BackgroundSave, save_text_file,
+                                         BACKGROUND_SAVE_CHARS, AUTOSAVE_INTERVAL_MS)
 from system.button.about import show_system_about, show_developer_about
 
+# 检查后台保存是否完成的间隔 (毫秒)
+SAVE_POLL_MS = 50
+# 检查其他进程发来的打开请求的间隔 (毫秒)
+INSTANCE_POLL_MS = 200
+
+
+class EditorTab:
+    """
+    一个标签页 (文档): Text 控件、语法高亮、查找栏，以及该文档的路径、编码和保存状态。
+    状态栏和窗口标题由 FileEditorApp 统一显示当前标签页的内容。
+    """
+
+    def __init__(self, app, notebook):
+        self.app = app
+        self.current_filepath = None
+        self.current_encoding = 'utf-8'
+        # 打开的文件是否带 BOM，保存时原样写回
+        self.current_bom = False
+        self.text_modified = False
+        # 大文件模式: 文件以内存映射方式只读打开，Text 中只放当前显示的一页
+        self.large_file_view = None
+        # 保存在后台线程中进行；未保存的修改定期写入自动保存日志
+        self._save_thread = None
+        self._journal_hash = None
+        # 窗口标题中文件名后的说明，例如 " (新文件)"
+        self.title_note = ""
+        self.status = "就绪"
+
+        self.frame = tk.Frame(notebook, padx=5, pady=5)
+        self.scrollbar = tk.Scrollbar(self.frame)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text_widget = tk.Text(
+            self.frame,
+            wrap=tk.WORD,
+            undo=True,
+            font=app.current_font,
+            yscrollcommand=self.scrollbar.set
+        )
+        if app.text_color:
+            self.text_widget.config(fg=app.text_color)
+        self.text_widget.pack(expand=True, fill=tk.BOTH)
+        self.scrollbar.config(command=self.text_widget.yview)
+
+        # 截获 Text 的编辑和滚动命令，供语法高亮和查找使用
+        self.text_proxy = TextCommandProxy(self.text_widget)
+        # 按文件扩展名进行语法高亮 (只分析可见区域，在后台线程中进行)
+        self.highlighter = SyntaxHighlighter(self.text_widget, self.text_proxy)
+        # 查找/替换栏，默认隐藏；大文件模式下只搜索当前页且不能替换
+        self.find_panel = FindReplacePanel(self.frame, self.text_widget, self.text_proxy,
+                                           is_read_only=lambda: self.large_file_view is not None)
+        self.text_widget.bind("<<Modified>>", self.on_text_modified)
+
+    @property
+    def journal(self):
+        return self.app.journal
+
+    def display_name(self):
+        return os.path.basename(self.current_filepath) if self.current_filepath else "未命名"
+
+    def tab_label(self):
+        return self.display_name() + (" *" if self.text_modified else "")
+
+    def window_title(self):
+        if not self.current_filepath:
+            return "文件编辑器"
+        return f"文件编辑器 - {self.display_name()}{self.title_note}"
+
+    def is_blank(self):
+        """没有文件、没有修改的空白标签页，可以直接用来打开文件。"""
+        return (self.current_filepath is None and not self.text_modified and self.large_file_view is None
+                and not self.text_widget.get('1.0', 'end-1c'))
+
+    def set_status(self, text):
+        self.status = text
+        self.app.update_tab(self)
+
+    def load_file(self, filepath):
+        """从指定的路径加载文件内容到文本框，返回是否成功。"""
+        try:
+            self._close_large_file()
+            self._journal_hash = None
+            if os.path.getsize(filepath) > EDITOR_LARGE_FILE_THRESHOLD:
+                self._load_large_file(filepath)
+                return True
+            with open(filepath, 'rb') as f:
+                raw_data = f.read()
+
+            content, detection = decode_file(filepath, raw_data)
+            self.current_encoding = detection.encoding
+            self.current_bom = detection.bom_length > 0
+
+            self.highlighter.set_lexer(lexer_for_path(filepath))
+            self.text_widget.delete('1.0', tk.END)
+            self.text_widget.insert('1.0', content)
+            self.current_filepath = filepath
+            self.title_note = ""
+            self.text_modified = False
+            self.text_widget.edit_modified(False)
+            self.text_widget.edit_reset()
+            self.set_status(describe(detection))
+            return True
+
+        except Exception as e:
+            messagebox.showerror("打开失败", f"无法打开文件：\n{e}")
+            self.current_filepath = None
+            self.app.update_tab(self)
+            return False
+
+    def _load_large_file(self, filepath):
+        """超过 EDITOR_LARGE_FILE_THRESHOLD 的文件: 只检测开头一段样本的编码，分页只读显示。"""
+        document = LargeFileDocument(filepath)
+        self.highlighter.set_lexer(None)
+        self.large_file_view = LargeFileView(self.text_widget, self.scrollbar, document)
+        self.current_encoding = document.encoding
+        self.current_bom = document.data_start > 0
+        self.current_filepath = filepath
+        self.title_note = " (大文件，只读)"
+        self.text_modified = False
+        self.set_status(f"{describe(document.detection)}，大文件只读模式")
+
+    def _close_large_file(self):
+        if self.large_file_view is not None:
+            self.large_file_view.close()
+            self.large_file_view = None
+
+    def start_new_file(self, filepath):
+        """filepath 还不存在: 作为新文件编辑，第一次保存时创建。"""
+        self.current_filepath = filepath
+        self.highlighter.set_lexer(lexer_for_path(filepath))
+        self.title_note = " (新文件)"
+        self.text_modified = False
+        self.text_widget.edit_modified(False)
+        self.app.update_tab(self)
+
+    def _save_to_path(self, filepath, background=True):
+        """
+        原子地保存到 filepath。较大的缓冲区在后台线程中写入，完成后在状态栏显示结果。
+        返回 True 表示已经保存 (或已开始后台保存)。
+        """
+        if self.large_file_view is not None:
+            messagebox.showinfo("只读", "大文件以只读模式打开，无法编辑保存。")
+            return False
+        if self._save_thread is not None:
+            if not background:
+                self.wait_for_save()
+            else:
+                self.set_status("上一次保存尚未完成，请稍候再试。")
+                return False
+        content = self.text_widget.get("1.0", "end-1c") # 使用 end-1c 避免保存末尾多余的换行符
+        # 先清除修改标志: 保存期间的新修改会重新设置它
+        self.text_widget.edit_modified(False)
+        self.text_modified = False
+        if background and len(content) >= BACKGROUND_SAVE_CHARS:
+            self.set_status(f"正在保存 {os.path.basename(filepath)}...")
+            self._save_thread = BackgroundSave(filepath, content, self.current_encoding, self.current_bom)
+            self._save_thread.start()
+            self.frame.after(SAVE_POLL_MS, self._poll_background_save)
+            return True
+        try:
+            elapsed_ms = save_text_file(filepath, content, self.current_encoding, self.current_bom)
+        except Exception as e:
+            self._save_failed(e)
+            return False
+        self._save_succeeded(filepath, elapsed_ms)
+        return True
+
+    def _poll_background_save(self):
+        if self._save_thread is None:
+            return
+        if self._save_thread.is_alive():
+            self.frame.after(SAVE_POLL_MS, self._poll_background_save)
+            return
+        self._finish_background_save()
+
+    def _finish_background_save(self):
+        thread, self._save_thread = self._save_thread, None
+        if thread.error is not None:
+            self._save_failed(thread.error)
+        else:
+            self._save_succeeded(thread.path, thread.elapsed_ms)
+
+    def wait_for_save(self):
+        """等待后台保存完成 (关闭标签页或退出前)。"""
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._finish_background_save()
+
+    def _save_succeeded(self, filepath, elapsed_ms):
+        if lexer_for_path(filepath) is not self.highlighter.lexer:
+            # 另存为其他类型的文件
+            self.highlighter.set_lexer(lexer_for_path(filepath))
+        if not self.text_modified:
+            # 保存期间没有新的修改，自动保存日志不再需要
+            self.journal.discard(self.current_filepath)
+            self._journal_hash = None
+        self.current_filepath = filepath
+        self.title_note = ""
+        self.set_status(f"已保存到 {filepath} ({elapsed_ms:.0f} ms)")
+
+    def _save_failed(self, error):
+        self.text_widget.edit_modified(True)
+        self.text_modified = True
+        self.set_status("保存失败")
+        messagebox.showerror("保存失败", f"无法保存文件：\n{error}")
+
+    def save_file(self, background=True):
+        if self.current_filepath:
+            return self._save_to_path(self.current_filepath, background)
+        return self.save_file_as(background)
+
+    def save_file_as(self, background=True):
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".txt",
+            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
+        )
+        if filepath:
+            return self._save_to_path(filepath, background)
+        return False
+
+    def autosave(self):
+        """把未保存的修改写入自动保存日志 (内容与上次写入相同时跳过)。"""
+        if not self.text_modified or self.large_file_view is not None:
+            return
+        if self.current_filepath is None and self is not self.app.first_untitled_tab():
+            # 日志中只有一个未命名文件的位置，留给第一个未命名标签页
+            return
+        content = self.text_widget.get("1.0", "end-1c")
+        content_hash = hash(content)
+        if content_hash != self._journal_hash:
+            self.journal.write(self.current_filepath, content, self.current_encoding, self.current_bom)
+            self._journal_hash = content_hash
+
+    def offer_recovery(self):
+        """当前文件有上次未保存的自动保存日志时，询问是否恢复。"""
+        entry = self.journal.find(self.current_filepath)
+        if entry is None:
+            return
+        name = os.path.basename(self.current_filepath) if self.current_filepath else "未命名文件"
+        saved_at = datetime.datetime.fromtimestamp(entry['saved_at']).strftime('%Y-%m-%d %H:%M:%S')
+        message = f"发现「{name}」在 {saved_at} 自动保存的未保存修改，是否恢复？"
+        try:
+            file_changed = self.current_filepath and os.path.getmtime(self.current_filepath) != entry.get('file_mtime')
+        except OSError:
+            file_changed = False
+        if file_changed:
+            message += "\n\n注意: 文件在此之后已被修改。"
+        response = messagebox.askyesnocancel("恢复未保存的修改", message + "\n\n选择「否」将删除这份自动保存。")
+        if response is True:
+            self.text_widget.delete('1.0', tk.END)
+            self.text_widget.insert('1.0', entry['text'])
+            self.current_encoding = entry.get('encoding') or self.current_encoding
+            self.current_bom = bool(entry.get('bom'))
+            self.text_widget.edit_modified(True)
+            self.text_modified = True
+            self.set_status(f"已恢复 {saved_at} 的自动保存，请保存文件")
+        elif response is False:
+            self.journal.discard(self.current_filepath)
+
+    def refresh(self):
+        if not self.current_filepath:
+            messagebox.showinfo("提示", "这是一个新文件，无法刷新。")
+            return
+        if self.text_modified:
+            if not messagebox.askyesno("警告", "文件已修改，确认要刷新并放弃更改吗？"):
+                return
+        self.journal.discard(self.current_filepath)
+        if self.load_file(self.current_filepath):
+            self.set_status("文件已刷新")
+
+    def on_text_modified(self, event=None):
+        if self.large_file_view is not None:
+            # 换页时替换 Text 内容也会触发 <<Modified>>，不算用户修改
+            self.text_widget.edit_modified(False)
+            return
+        modified = bool(self.text_widget.edit_modified())
+        if modified != self.text_modified:
+            self.text_modified = modified
+            self.app.update_tab(self)
+
+    def close(self):
+        """关闭标签页: 停止查找和高亮的后台任务，还原控件命令后销毁控件。"""
+        self.find_panel.hide()
+        self.highlighter.set_lexer(None)
+        self._close_large_file()
+        self.text_proxy.close()
+        self.frame.destroy()
+
 
 class FileEditorApp:
-    def __init__(self, master, project_root):
+    def __init__(self, master, project_root, file_to_open=None):
         self.master = master
         self.master.title("文件编辑器")
         self.master.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
 
         # --- 状态变量初始化 ---
-        self.project_root = project_root
-        self.current_filepath = None
-        self.current_encoding = 'utf-8'
-        self.text_modified = False
-        
+        self.project_root = Path(project_root)
+        self.file_to_open = file_to_open
+        # 每个标签页一个 EditorTab，顺序与 Notebook 中一致
+        self.tabs = []
+        self.journal = AutosaveJournal()
+        # 所有标签页共用的字体和颜色
+        self.current_font = font.Font(font="TkFixedFont")
+        self.default_font = self.current_font
+        self.text_color = None
+
         # --- 将变量初始化移到这里 ---
         # 提前初始化 Tkinter 变量，确保它们在创建UI时已存在
         self.is_bold = tk.BooleanVar()
@@ -40,27 +342,24 @@ class FileEditorApp:
         self.create_widgets()
 
         # --- 绑定事件 ---
-        self.text_widget.bind("<<Modified>>", self.on_text_modified)
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
-        
+
+        # 单实例: 之后从文件管理器或桌面打开的文档通过 socket 发到这里，作为新标签页打开
+        self.instance_server = InstanceServer()
+        if self.instance_server.start():
+            self.master.after(INSTANCE_POLL_MS, self._poll_instance_requests)
+
         # 处理命令行参数
         self.process_command_line_args()
+        self.master.after(AUTOSAVE_INTERVAL_MS, self._autosave)
 
     def process_command_line_args(self):
-        """处理启动时传入的命令行参数"""
-        # 检查 sys.argv 长度，第一个参数是脚本路径，第二个是 project_root
-        # 真正需要处理的文件路径参数是第三个
-        if len(sys.argv) > 2:
-            file_to_open = sys.argv[2]
-            if os.path.isfile(file_to_open):
-                self._load_file(file_to_open)
-            elif os.path.isdir(os.path.dirname(os.path.abspath(file_to_open))):
-                self.current_filepath = file_to_open
-                self.master.title(f"文件编辑器 - {os.path.basename(file_to_open)} (新文件)")
-                self.text_modified = False
-                self.text_widget.edit_modified(False)
-            else:
-                messagebox.showerror("错误", f"无效的文件路径: {file_to_open}")
+        """处理启动时传入的文件路径参数 (project_root 之后的参数)"""
+        if self.file_to_open:
+            self.open_path(self.file_to_open)
+        if not self.tabs:
+            self.new_tab().offer_recovery()
+
 
     def create_menu(self):
         """根据操作系统动态创建菜单栏"""
@@ -88,12 +387,18 @@ class FileEditorApp:
             copy_key = "Command-c"
             paste_key = "Command-v"
             undo_key = "Command-z"
+            find_key = "Command-f"
+            new_tab_key = "Command-n"
+            close_tab_key = "Command-w"
         else:  # Windows 或 Linux
             save_key = "Ctrl-s"
             open_key = "Ctrl-o"
             copy_key = "Ctrl-c"
             paste_key = "Ctrl-v"
             undo_key = "Ctrl-z"
+            find_key = "Ctrl-f"
+            new_tab_key = "Ctrl-n"
+            close_tab_key = "Ctrl-w"
 
         # --- 关于菜单 ---
         about_menu = tk.Menu(self.menubar, tearoff=0)
@@ -107,9 +412,11 @@ class FileEditorApp:
         file_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="文件", menu=file_menu)
         # 为菜单命令添加快捷键提示（accelerator）
+        file_menu.add_command(label="新建标签页", command=self.new_tab, accelerator=new_tab_key)
         file_menu.add_command(label="打开...", command=self.open_file, accelerator=open_key)
         file_menu.add_command(label="保存", command=self.save_file, accelerator=save_key)
         file_menu.add_command(label="另存为...", command=self.save_file_as)
+        file_menu.add_command(label="关闭标签页", command=self.close_tab, accelerator=close_tab_key)
         file_menu.add_separator()
         file_menu.add_command(label="复制", command=self.copy_text, accelerator=copy_key)
         file_menu.add_command(label="粘贴", command=self.paste_text, accelerator=paste_key)
@@ -117,6 +424,7 @@ class FileEditorApp:
         file_menu.add_command(label="查看字数", command=self.show_word_count)
         file_menu.add_command(label="查看编码格式", command=self.show_encoding)
         file_menu.add_separator()
+        file_menu.add_command(label="查找/替换", command=self.show_find_panel, accelerator=find_key)
         file_menu.add_command(label="撤销", command=self.undo_text, accelerator=undo_key)
         file_menu.add_command(label="刷新", command=self.refresh_file)
 
@@ -164,15 +472,19 @@ class FileEditorApp:
         file_mb = tk.Menubutton(top_bar_frame, text="文件", activebackground="#e1e1e1", bg="#f0f0f0", relief=tk.FLAT)
         file_mb.pack(side=tk.LEFT, padx=5, pady=2)
         file_menu = tk.Menu(file_mb, tearoff=0)
+        file_menu.add_command(label="新建标签页", command=self.new_tab)
         file_menu.add_command(label="打开...", command=self.open_file)
         file_menu.add_command(label="保存", command=self.save_file)
         file_menu.add_command(label="另存为...", command=self.save_file_as)
+        file_menu.add_command(label="关闭标签页", command=self.close_tab)
         file_menu.add_separator()
         file_menu.add_command(label="复制", command=self.copy_text)
         file_menu.add_command(label="粘贴", command=self.paste_text)
         file_menu.add_separator()
         file_menu.add_command(label="查看字数", command=self.show_word_count)
         file_menu.add_command(label="查看编码格式", command=self.show_encoding)
+        file_menu.add_separator()
+        file_menu.add_command(label="查找/替换", command=self.show_find_panel)
         file_mb.config(menu=file_menu)
         
         # --- 格式菜单按钮 ---
@@ -200,166 +512,236 @@ class FileEditorApp:
         # --- 退出按钮 ---
         quit_btn = tk.Button(top_bar_frame, text="X", command=self.on_closing, relief=tk.FLAT, bg="#f0f0f0", fg="red", activebackground="#e1e1e1")
         quit_btn.pack(side=tk.RIGHT, padx=5, pady=2)
-        
-    def create_widgets(self):
-        """创建文本框和滚动条"""
-        # 这个 Frame 现在会被 pack 到菜单栏下方
-        main_frame = tk.Frame(self.master, padx=5, pady=5)
-        main_frame.pack(expand=True, fill=tk.BOTH)
 
-        self.scrollbar = tk.Scrollbar(main_frame)
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    def create_widgets(self):
+        """创建标签页容器和状态栏"""
+        # 底部状态栏: 显示当前标签页的编码、检测耗时和保存结果
+        self.status_var = tk.StringVar(value="就绪")
+        status_bar = tk.Label(self.master, textvariable=self.status_var, anchor="w", bd=1, relief=tk.SUNKEN)
+        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # 这个 Notebook 现在会被 pack 到菜单栏下方，每个文档一个标签页
+        self.notebook = ttk.Notebook(self.master)
+        self.notebook.pack(expand=True, fill=tk.BOTH)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        self.master.bind_all('<Control-f>', lambda event: self.show_find_panel())
+        self.master.bind_all('<Control-n>', lambda event: self.new_tab())
+        self.master.bind_all('<Control-w>', lambda event: self.close_tab())
+        if sys.platform == 'darwin':
+            self.master.bind_all('<Command-f>', lambda event: self.show_find_panel())
+            self.master.bind_all('<Command-n>', lambda event: self.new_tab())
+            self.master.bind_all('<Command-w>', lambda event: self.close_tab())
+
+    # --- 标签页管理 ---
+
+    @property
+    def current_tab(self):
+        selected = self.notebook.select()
+        for tab in self.tabs:
+            if str(tab.frame) == selected:
+                return tab
+        return None
+
+    def first_untitled_tab(self):
+        return next((tab for tab in self.tabs if tab.current_filepath is None), None)
+
+    def new_tab(self):
+        """新建一个空白标签页并切换过去。"""
+        tab = EditorTab(self, self.notebook)
+        self.tabs.append(tab)
+        self.notebook.add(tab.frame, text=tab.tab_label())
+        self.notebook.select(tab.frame)
+        tab.text_widget.focus_set()
+        return tab
+
+    def update_tab(self, tab):
+        """刷新标签页的标题；tab 是当前标签页时同时刷新窗口标题和状态栏。"""
+        if tab not in self.tabs:
+            return
+        self.notebook.tab(tab.frame, text=tab.tab_label())
+        if tab is self.current_tab:
+            self.master.title(tab.window_title())
+            self.status_var.set(tab.status)
+
+    def _on_tab_changed(self, event=None):
+        tab = self.current_tab
+        if tab is not None:
+            self.update_tab(tab)
+            tab.text_widget.focus_set()
+
+    def open_path(self, filepath):
+        """在标签页中打开 filepath；已经打开时切换到对应的标签页。"""
+        filepath = os.path.abspath(filepath)
+        for tab in self.tabs:
+            if tab.current_filepath and os.path.realpath(tab.current_filepath) == os.path.realpath(filepath):
+                self.notebook.select(tab.frame)
+                return tab
+        tab = self.current_tab
+        if tab is None or not tab.is_blank():
+            tab = self.new_tab()
+        if os.path.isfile(filepath):
+            if tab.load_file(filepath):
+                tab.offer_recovery()
+        elif os.path.isdir(os.path.dirname(filepath)):
+            tab.start_new_file(filepath)
+            tab.offer_recovery()
+        else:
+            messagebox.showerror("错误", f"无效的文件路径: {filepath}")
+        return tab
 
-        self.text_widget = tk.Text(
-            main_frame,
-            wrap=tk.WORD,
-            undo=True,
-            yscrollcommand=self.scrollbar.set
-        )
-        self.text_widget.pack(expand=True, fill=tk.BOTH)
-        self.scrollbar.config(command=self.text_widget.yview)
-        
-        self.default_font = font.Font(font=self.text_widget['font'])
-        self.current_font = self.default_font
+    def _confirm_close(self, tab):
+        """标签页有未保存的修改时询问是否保存。返回 False 表示用户取消。"""
+        if not tab.text_modified:
+            return True
+        self.notebook.select(tab.frame)
+        response = messagebox.askyesnocancel("关闭", f"「{tab.display_name()}」已修改，您想保存吗？")
+        if response is True:
+            # 关闭前在当前线程中保存完毕
+            return tab.save_file(background=False)
+        if response is False:
+            self.journal.discard(tab.current_filepath)
+            return True
+        return False
 
-    def _load_file(self, filepath):
-        """从指定的路径加载文件内容到文本框"""
+    def close_tab(self, tab=None):
+        """关闭标签页 (默认为当前标签页)；关闭最后一个标签页时保留一个空白标签页。"""
+        tab = tab or self.current_tab
+        if tab is None or not self._confirm_close(tab):
+            return
+        tab.wait_for_save()
+        self.notebook.forget(tab.frame)
+        self.tabs.remove(tab)
+        tab.close()
+        if not self.tabs:
+            self.new_tab()
+
+    def _poll_instance_requests(self):
+        """处理其他进程 (文件管理器、桌面) 通过 socket 发来的打开请求。"""
         try:
-            with open(filepath, 'rb') as f:
-                raw_data = f.read()
-            
-            result = chardet.detect(raw_data)
-            self.current_encoding = result['encoding'] if result['encoding'] else 'utf-8'
-            
-            content = raw_data.decode(self.current_encoding, errors='replace')
-            
-            self.text_widget.delete('1.0', tk.END)
-            self.text_widget.insert('1.0', content)
-            self.current_filepath = filepath
-            self.master.title(f"文件编辑器 - {os.path.basename(filepath)}")
-            self.text_modified = False
-            self.text_widget.edit_modified(False)
-            self.text_widget.edit_reset()
+            while True:
+                paths = self.instance_server.requests.get_nowait()
+                self.master.deiconify()
+                self.master.lift()
+                self.master.focus_force()
+                for path in paths:
+                    self.open_path(path)
+                if not paths and not self.current_tab.is_blank():
+                    self.new_tab()
+        except queue.Empty:
+            pass
+        self.master.after(INSTANCE_POLL_MS, self._poll_instance_requests)
 
-        except Exception as e:
-            messagebox.showerror("打开失败", f"无法打开文件：\n{e}")
-            self.current_filepath = None
-            self.master.title("文件编辑器")
+    def _autosave(self):
+        """定期把各标签页未保存的修改写入自动保存日志。"""
+        for tab in self.tabs:
+            tab.autosave()
+        self.master.after(AUTOSAVE_INTERVAL_MS, self._autosave)
+
+    # --- 菜单命令 (作用于当前标签页) ---
 
     def open_file(self):
-        if self.text_modified:
-            if not messagebox.askyesno("警告", "文件已修改，确认要打开新文件并放弃更改吗？"):
-                return
         filepath = filedialog.askopenfilename(
             filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
         )
         if filepath:
-            self._load_file(filepath)
+            self.open_path(filepath)
 
-    def _save_to_path(self, filepath):
-        try:
-            content = self.text_widget.get("1.0", "end-1c") # 使用 end-1c 避免保存末尾多余的换行符
-            with open(filepath, 'w', encoding=self.current_encoding, errors='replace') as f:
-                f.write(content)
-            self.current_filepath = filepath
-            self.master.title(f"文件编辑器 - {os.path.basename(filepath)}")
-            self.text_modified = False
-            self.text_widget.edit_modified(False)
-            messagebox.showinfo("成功", f"文件已保存到：\n{filepath}")
-            return True
-        except Exception as e:
-            messagebox.showerror("保存失败", f"无法保存文件：\n{e}")
-            return False
+    def save_file(self, background=True):
+        return self.current_tab.save_file(background)
 
-    def save_file(self):
-        if self.current_filepath:
-            self._save_to_path(self.current_filepath)
-        else:
-            self.save_file_as()
+    def save_file_as(self, background=True):
+        return self.current_tab.save_file_as(background)
 
-    def save_file_as(self):
-        filepath = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt"), ("All Files", "*.*")]
-        )
-        if filepath:
-            self._save_to_path(filepath)
+    def show_find_panel(self):
+        tab = self.current_tab
+        # 放在文本区下方
+        tab.find_panel.show(before=tab.scrollbar)
+        return "break"
 
-    def copy_text(self): self.text_widget.event_generate("<<Copy>>")
-    def paste_text(self): self.text_widget.event_generate("<<Paste>>")
+    def copy_text(self): self.current_tab.text_widget.event_generate("<<Copy>>")
+    def paste_text(self): self.current_tab.text_widget.event_generate("<<Paste>>")
 
     def show_word_count(self):
-        content = self.text_widget.get("1.0", tk.END)
+        tab = self.current_tab
+        if tab.large_file_view is not None:
+            size_mb = tab.large_file_view.document.size / 1024 ** 2
+            messagebox.showinfo("字数统计", f"大文件模式下不统计字数。\n文件大小: {size_mb:.1f} MB")
+            return
+        content = tab.text_widget.get("1.0", tk.END)
         word_count = len(content.split())
         char_count = len(content.strip())
         messagebox.showinfo("字数统计", f"单词数: {word_count}\n字符数 (不含首尾空白): {char_count}")
 
     def show_encoding(self):
-        encoding_info = self.current_encoding or "未知 (新文件默认为 UTF-8)"
+        tab = self.current_tab
+        encoding_info = tab.current_encoding or "未知 (新文件默认为 UTF-8)"
+        if tab.current_bom:
+            encoding_info += " (带 BOM)"
         messagebox.showinfo("文件编码", f"当前文件的检测编码为：{encoding_info}")
 
     def change_font_size(self):
         new_size = simpledialog.askinteger("字体大小", "请输入新的字体大小:", initialvalue=self.current_font.cget("size"))
         if new_size and new_size > 0:
+            # 所有标签页共用同一个具名字体，修改后立即生效
             self.current_font.config(size=new_size)
-            self.text_widget.config(font=self.current_font)
 
     def change_font_color(self):
         color_code = colorchooser.askcolor(title="选择字体颜色")
-        if color_code:
-            self.text_widget.config(fg=color_code[1])
+        if color_code and color_code[1]:
+            self.text_color = color_code[1]
+            for tab in self.tabs:
+                tab.text_widget.config(fg=self.text_color)
 
     def toggle_bold(self):
         new_weight = "bold" if self.is_bold.get() else "normal"
         self.current_font.config(weight=new_weight)
-        self.text_widget.config(font=self.current_font)
 
     def toggle_underline(self):
         self.current_font.config(underline=self.is_underline.get())
-        self.text_widget.config(font=self.current_font)
-        
+
     def undo_text(self):
         try:
-            self.text_widget.edit_undo()
+            self.current_tab.text_widget.edit_undo()
         except tk.TclError:
             pass
 
     def refresh_file(self):
-        if not self.current_filepath:
-            messagebox.showinfo("提示", "这是一个新文件，无法刷新。")
-            return
-        if self.text_modified:
-            if not messagebox.askyesno("警告", "文件已修改，确认要刷新并放弃更改吗？"):
-                return
-        self._load_file(self.current_filepath)
-        messagebox.showinfo("成功", "文件已刷新。")
-
-    def on_text_modified(self, event=None):
-        self.text_modified = self.text_widget.edit_modified()
+        self.current_tab.refresh()
 
     def on_closing(self):
-        if self.text_modified:
-            response = messagebox.askyesnocancel("退出", "文件已修改，您想保存吗？")
-            if response is True:
-                if self.save_file():
-                    self.master.destroy()
-            elif response is False:
-                self.master.destroy()
-        else:
-            self.master.destroy()
+        for tab in list(self.tabs):
+            if not self._confirm_close(tab):
+                return
+        # 退出前等待所有后台保存完成
+        for tab in self.tabs:
+            tab.wait_for_save()
+        self.instance_server.stop()
+        self.master.destroy()
+
+
+def run_editor(project_root, file_to_open=None):
+    """
+    编辑器进程的入口 (app.py file_editor_only)。
+    已经有编辑器在运行时把文件交给它打开，本进程不创建窗口直接退出。
+    """
+    if forward_open([file_to_open] if file_to_open else []):
+        print("已在运行中的编辑器打开")
+        return
+    root = tk.Tk()
+    FileEditorApp(root, project_root=Path(project_root), file_to_open=file_to_open)
+    root.mainloop()
+
 
 if __name__ == '__main__':
-    root = tk.Tk()
     # 检查命令行参数以获取 project_root
     if len(sys.argv) > 1:
-        # 假设第二个参数是 project_root
-        project_root_str = sys.argv[1]
-        project_root_path = Path(project_root_str)
-        app = FileEditorApp(root, project_root=project_root_path)
+        # 第二个参数是 project_root，第三个参数 (可选) 是要打开的文件
+        run_editor(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
     else:
         # 如果没有通过命令行参数传递，则使用默认的根路径
+        root = tk.Tk()
         project_root_path = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         messagebox.showwarning("警告", "未通过命令行参数获取 project_root，使用默认路径。")
         app = FileEditorApp(root, project_root=project_root_path)
-        
-    root.mainloop()
+        root.mainloop()
@@ -0,0 +1,281 @@
+import os
+import sys
+import errno
+import queue
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+from collections import OrderedDict
+from pathlib import Path
+
+# 最多缓存多少个目录的扫描结果
+DIR_CACHE_SIZE = 32
+# 轮询模式下检查目录修改时间的间隔 (秒)
+POLL_INTERVAL = 2.0
+
+# inotify 事件掩码 (见 <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _dir_mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class InotifyWatcher:
+    """
+    用 inotify (通过 ctypes 调用 libc) 监视目录，在后台线程中读取事件，
+    把发生变化的目录路径放入 self.changes 队列。
+    """
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失败")
+        self.changes = queue.Queue()
+        self._lock = threading.Lock()
+        self._paths_by_wd = {}
+        self._wd_by_path = {}
+        # 是否遇到过 ENOSPC (监视数量达到系统上限)
+        self.watches_exhausted = False
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def watched_count(self):
+        return len(self._wd_by_path)
+
+    def watch(self, path):
+        """
+        开始监视 path。返回是否成功；
+        ENOSPC 表示达到了 fs.inotify.max_user_watches 上限 (只提示一次)。
+        """
+        with self._lock:
+            if path in self._wd_by_path:
+                return True
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(path)), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error != errno.ENOSPC:
+                    print(f"无法监视目录 {path}: {os.strerror(error)}")
+                elif not self.watches_exhausted:
+                    print("inotify 监视数量已达到 fs.inotify.max_user_watches 上限，其余目录不再实时监视")
+                self.watches_exhausted = self.watches_exhausted or error == errno.ENOSPC
+                return False
+            self._wd_by_path[path] = wd
+            self._paths_by_wd[wd] = path
+            return True
+
+    def unwatch(self, path):
+        with self._lock:
+            wd = self._wd_by_path.pop(path, None)
+            if wd is not None:
+                self._paths_by_wd.pop(wd, None)
+                self._libc.inotify_rm_watch(self._fd, wd)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([self._fd], [], [], 1.0)
+                if not readable:
+                    continue
+                try:
+                    data = os.read(self._fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                self._dispatch(data)
+        finally:
+            os.close(self._fd)
+
+    def _dispatch(self, data):
+        changed = set()
+        offset = 0
+        with self._lock:
+            while offset < len(data):
+                wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + name_len
+                if mask & IN_Q_OVERFLOW:
+                    # 事件队列溢出: 无法知道哪些目录变了，全部视为已修改
+                    changed.update(self._wd_by_path)
+                    continue
+                path = self._paths_by_wd.get(wd)
+                if path is None:
+                    continue
+                changed.add(path)
+                if mask & IN_IGNORED:
+                    # 目录被删除或监视被移除，内核已自动释放该 wd
+                    self._paths_by_wd.pop(wd, None)
+                    self._wd_by_path.pop(path, None)
+        for path in changed:
+            self.changes.put(path)
+
+
+class PollingWatcher:
+    """
+    不支持 inotify 时的后备方案: 定期比较目录的修改时间。
+    只能发现文件的新建/删除/重命名，无法发现文件内容的修改。
+    """
+
+    def __init__(self, interval=POLL_INTERVAL):
+        self.changes = queue.Queue()
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._mtimes = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def watch(self, path):
+        with self._lock:
+            if path not in self._mtimes:
+                self._mtimes[path] = _dir_mtime_ns(path)
+        return True
+
+    def unwatch(self, path):
+        with self._lock:
+            self._mtimes.pop(path, None)
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            with self._lock:
+                snapshot = list(self._mtimes.items())
+            for path, old_mtime in snapshot:
+                new_mtime = _dir_mtime_ns(path)
+                if new_mtime != old_mtime:
+                    with self._lock:
+                        if path in self._mtimes:
+                            self._mtimes[path] = new_mtime
+                    self.changes.put(path)
+
+
+def max_user_watches():
+    """返回 fs.inotify.max_user_watches (每个用户所有进程共享)，无法读取时返回 None。"""
+    try:
+        with open('/proc/sys/fs/inotify/max_user_watches') as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def create_watcher():
+    """Linux 上优先使用 inotify，其他平台或 inotify 不可用时使用轮询。"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            print(f"inotify 不可用，改为轮询目录修改时间: {e}")
+    return PollingWatcher()
+
+
+class CachedListing:
+    """
+    缓存命中时代替 DirectoryScanner: 队列中已经放好了全部目录项，
+    LogicManager 可以用同一套轮询逻辑把它们插入列表。
+    """
+
+    def __init__(self, path, entries):
+        self.path = path
+        self.queue = queue.Queue()
+        self.queue.put(('batch', list(entries)))
+        self.queue.put(('done', None))
+
+    def cancel(self):
+        pass
+
+
+class DirectoryCache:
+    """
+    按路径缓存目录扫描结果 (ScanEntry 列表) 的 LRU 缓存。
+
+    缓存中的目录都会被监视，目录内容变化时对应的条目失效；
+    读取时还会比较目录的修改时间，监视器还没来得及报告的变化也不会返回旧结果。
+    """
+
+    def __init__(self, max_entries=DIR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # Path -> (mtime_ns, [ScanEntry])
+        self._watcher = None
+
+    @property
+    def watcher(self):
+        if self._watcher is None:
+            self._watcher = create_watcher()
+        return self._watcher
+
+    def get(self, path):
+        """返回缓存的目录项列表；未缓存或已过期时返回 None。"""
+        path = Path(path)
+        cached = self._entries.get(path)
+        if cached is None:
+            return None
+        mtime_ns, entries = cached
+        if _dir_mtime_ns(path) != mtime_ns:
+            self.invalidate(path)
+            return None
+        self._entries.move_to_end(path)
+        return entries
+
+    def put(self, path, mtime_ns, entries):
+        """保存扫描结果。mtime_ns 应为扫描开始前读取的目录修改时间。"""
+        path = Path(path)
+        if mtime_ns is None:
+            return
+        self._entries[path] = (mtime_ns, entries)
+        self._entries.move_to_end(path)
+        self.watcher.watch(path)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.watcher.unwatch(evicted)
+
+    def invalidate(self, path):
+        path = Path(path)
+        if self._entries.pop(path, None) is not None:
+            self.watcher.unwatch(path)
+
+    def poll_changes(self):
+        """
+        取出监视器报告的所有变化 (在 UI 线程中调用)，使对应的缓存失效。
+
+        返回:
+            set[Path]: 发生变化的目录。
+        """
+        if self._watcher is None:
+            return set()
+        changed = set()
+        while True:
+            try:
+                changed.add(self._watcher.changes.get_nowait())
+            except queue.Empty:
+                break
+        for path in changed:
+            self.invalidate(path)
+        return changed
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.stop()
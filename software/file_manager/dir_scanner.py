@@ -0,0 +1,76 @@
+import os
+import queue
+import threading
+from collections import namedtuple
+from .file_types import classify
+
+# 每个目录项只 stat 一次，结果保存在这个紧凑的元组中。
+# file_type 为扫描时确定的 FileType (文件夹为 None)，之后显示、排序时不需要再分类
+ScanEntry = namedtuple('ScanEntry', ['name', 'is_dir', 'size', 'mtime', 'file_type'], defaults=(None,))
+
+# 每批发送给 UI 线程的目录项数量
+SCAN_BATCH_SIZE = 256
+# 扫描时是否读取没有扩展名的文件开头的字节来判断类型。默认关闭: 像 /usr/bin 这样的目录
+# 每次浏览都要打开上千个文件；关闭时这些文件显示为 "其他"，打开文件时再嗅探
+SNIFF_ON_SCAN = False
+
+
+class DirectoryScanner(threading.Thread):
+    """
+    在后台线程中扫描目录，把 ScanEntry 分批放入 queue，供 UI 线程通过 after() 轮询。
+
+    队列消息格式为 (类型, 数据):
+        ('batch', [ScanEntry, ...])  一批目录项
+        ('done', None)               扫描完成
+        ('permission_error', 异常)    无权限访问目录
+        ('error', 异常)               其他错误
+    """
+
+    def __init__(self, path, batch_size=SCAN_BATCH_SIZE, sniff=SNIFF_ON_SCAN):
+        super().__init__(daemon=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.sniff = sniff
+        self.queue = queue.Queue()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求停止扫描 (例如用户在扫描途中导航到了其他目录)。"""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        batch = []
+        try:
+            with os.scandir(self.path) as iterator:
+                for entry in iterator:
+                    if self.cancelled:
+                        return
+                    try:
+                        # is_dir() 通常直接使用 readdir 返回的类型信息，不需要额外的系统调用
+                        is_dir = entry.is_dir()
+                        stat = entry.stat()
+                    except OSError:
+                        # 例如失效的符号链接
+                        continue
+                    if is_dir:
+                        file_type = None
+                    elif self.sniff and entry.is_file():
+                        # 只嗅探普通文件 (classify 会检查 st_mode)，在扫描线程中完成
+                        file_type = classify(entry.name, entry.path, stat.st_mode)
+                    else:
+                        file_type = classify(entry.name)
+                    batch.append(ScanEntry(entry.name, is_dir, stat.st_size, stat.st_mtime, file_type))
+                    if len(batch) >= self.batch_size:
+                        self.queue.put(('batch', batch))
+                        batch = []
+            if batch:
+                self.queue.put(('batch', batch))
+            self.queue.put(('done', None))
+        except PermissionError as e:
+            self.queue.put(('permission_error', e))
+        except Exception as e:
+            self.queue.put(('error', e))
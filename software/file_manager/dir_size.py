@@ -0,0 +1,173 @@
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SIZE_CACHE_SUBDIR = "dir_sizes"
+SIZE_DB_FILENAME = "dir_sizes.sqlite3"
+# 同时计算的文件夹数量
+SIZE_WORKERS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    files_bytes INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    PRIMARY KEY (dev, ino)
+);
+"""
+
+
+def _is_virtual_fs(path):
+    """proc、sysfs 等虚拟文件系统的总块数为 0。"""
+    if not hasattr(os, 'statvfs'):
+        return False
+    return os.statvfs(path).f_blocks == 0
+
+
+def _default_db_path():
+    from system.platformdirs_pack import get_cache_path
+    return get_cache_path(SIZE_CACHE_SUBDIR) / SIZE_DB_FILENAME
+
+
+class FolderSizeEngine:
+    """
+    在线程池中计算文件夹的总大小 (类似 du，统计文件的实际字节数，不跟随符号链接)。
+
+    每个目录按 (设备号, inode) 在磁盘上缓存: 修改时间、直接包含的文件字节数和子目录名称。
+    目录的修改时间没变时，不需要重新列出和 stat 其中的文件，只需 stat 目录本身，
+    因此再次计算一棵未变化的目录树只需要每个目录一次 stat。
+    (直接覆盖写入文件内容不会改变目录的修改时间，这种情况下缓存的字节数可能略旧。)
+
+    计算结果保存在 totals (Path -> 字节数) 中，完成的路径放入 completed 队列，供 UI 线程轮询。
+    """
+
+    def __init__(self, max_workers=SIZE_WORKERS, db_path=None):
+        self._db_path = db_path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dir-size")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # 排队或正在计算的文件夹 -> 要求计算它的 generation
+        self._in_progress = {}
+        self.totals = {}
+        self.completed = queue.Queue()
+
+    @property
+    def db_path(self):
+        if self._db_path is None:
+            self._db_path = _default_db_path()
+        return self._db_path
+
+    def request(self, paths):
+        """
+        计划计算这些文件夹的大小 (已在计算中的会被跳过)。
+        取消之前提交、仍在排队的文件夹再次被请求时，只更新它的 generation:
+        旧任务发现自己被取消后会用新的 generation 重新排队 (见 _compute)。
+        """
+        with self._lock:
+            generation = self._generation
+            for path in paths:
+                path = Path(path)
+                if path in self._in_progress:
+                    self._in_progress[path] = generation
+                    continue
+                self._in_progress[path] = generation
+                self._executor.submit(self._compute, path, generation)
+
+    def cancel_pending(self):
+        """放弃所有尚未完成的计算 (例如导航到了其他目录)。"""
+        with self._lock:
+            self._generation += 1
+
+    def is_pending(self, path):
+        return Path(path) in self._in_progress
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _compute(self, path, generation):
+        total = None
+        try:
+            total = self._tree_size(self._connection(), path, generation)
+        except (OSError, sqlite3.Error) as e:
+            print(f"计算文件夹大小失败 {path}: {e}")
+        with self._lock:
+            requested = self._in_progress.get(path)
+            if total is None and requested is not None and requested != generation \
+                    and requested == self._generation:
+                # 因取消而中止，但取消之后又被请求了: 用新的 generation 重新排队
+                self._executor.submit(self._compute, path, requested)
+                return
+            self._in_progress.pop(path, None)
+        if total is not None:
+            self.totals[path] = total
+            self.completed.put(path)
+
+    def _tree_size(self, conn, root, generation):
+        """
+        遍历目录树并返回总字节数；计算被取消时返回 None。
+        与 du -x 一样不跨越文件系统: 挂载在树中的其他文件系统 (U 盘、网络驱动器等) 不计入；
+        /proc、/sys 这类没有存储空间的虚拟文件系统直接算作 0 (其中的 kcore 等文件大小没有意义)。
+        """
+        try:
+            root_dev = os.lstat(root).st_dev
+            if _is_virtual_fs(root):
+                return 0
+        except OSError:
+            return 0
+        total = 0
+        stack = [root]
+        try:
+            while stack:
+                if generation != self._generation:
+                    return None
+                dir_path = stack.pop()
+                try:
+                    stat = os.lstat(dir_path)
+                except OSError:
+                    continue
+                if stat.st_dev != root_dev:
+                    continue
+                row = conn.execute("SELECT mtime_ns, files_bytes, subdirs FROM nodes WHERE dev = ? AND ino = ?",
+                                   (stat.st_dev, stat.st_ino)).fetchone()
+                if row is not None and row[0] == stat.st_mtime_ns:
+                    files_bytes, subdirs = row[1], row[2].split('\0') if row[2] else []
+                else:
+                    files_bytes, subdirs = self._scan_dir(dir_path)
+                    conn.execute("INSERT OR REPLACE INTO nodes (dev, ino, mtime_ns, files_bytes, subdirs) VALUES (?, ?, ?, ?, ?)",
+                                 (stat.st_dev, stat.st_ino, stat.st_mtime_ns, files_bytes, '\0'.join(subdirs)))
+                total += files_bytes
+                stack.extend(os.path.join(dir_path, name) for name in subdirs)
+        finally:
+            conn.commit()
+        return total
+
+    @staticmethod
+    def _scan_dir(dir_path):
+        """返回 (直接包含的文件的总字节数, 子目录名称列表)。"""
+        files_bytes, subdirs = 0, []
+        try:
+            with os.scandir(dir_path) as iterator:
+                for entry in iterator:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            files_bytes += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return files_bytes, subdirs
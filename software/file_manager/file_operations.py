@@ -0,0 +1,462 @@
+import os
+import sys
+import time
+import queue
+import errno
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+# 每次复制系统调用处理的最大字节数 (较小的块可以更快响应暂停/取消)
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+READ_WRITE_CHUNK_SIZE = 1024 * 1024
+# 同时执行的文件操作数量
+MAX_WORKERS = 2
+# 速度采样的最短间隔 (秒)
+RATE_SAMPLE_INTERVAL = 0.5
+
+# 目标已存在时的处理方式
+CONFLICT_OVERWRITE = 'overwrite'
+CONFLICT_SKIP = 'skip'
+CONFLICT_RENAME = 'rename'
+
+# copy_file_range/sendfile 不支持当前文件组合时返回的错误码，遇到时换用下一种方式
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+
+class OperationCancelled(Exception):
+    """用户取消了文件操作。"""
+
+
+class FileOperation:
+    """
+    一个复制/移动/删除任务。由工作线程执行，UI 线程只读取进度字段并调用 pause/resume/cancel。
+
+    state: 'pending' | 'running' | 'paused' | 'done' | 'cancelled' | 'failed'
+    """
+
+    LABELS = {'copy': "复制", 'move': "移动", 'delete': "删除"}
+    FINISHED_STATES = ('done', 'cancelled', 'failed')
+
+    def __init__(self, kind, sources, dest_dir=None, conflict=CONFLICT_OVERWRITE):
+        self.kind = kind
+        self.sources = [Path(source) for source in sources]
+        self.dest_dir = Path(dest_dir) if dest_dir is not None else None
+        self.conflict = conflict
+
+        self.state = 'pending'
+        self.error = None
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.current_name = ""
+        self.started = None
+        self.finished = None
+        self.reported = False
+
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._cancel_event = threading.Event()
+        self._rate = 0.0
+        self._rate_time = None
+        self._rate_bytes = 0
+
+    @property
+    def description(self):
+        names = ", ".join(source.name for source in self.sources[:3])
+        if len(self.sources) > 3:
+            names += f" 等 {len(self.sources)} 项"
+        if self.dest_dir is not None:
+            return f"{self.LABELS[self.kind]} {names} 到 {self.dest_dir}"
+        return f"{self.LABELS[self.kind]} {names}"
+
+    @property
+    def is_finished(self):
+        return self.state in self.FINISHED_STATES
+
+    def affected_dirs(self):
+        """返回内容会被这个任务改变的目录。"""
+        dirs = {source.parent for source in self.sources if self.kind != 'copy'}
+        if self.dest_dir is not None:
+            dirs.add(self.dest_dir)
+        return dirs
+
+    # --- 控制 (UI 线程调用) ---
+
+    def pause(self):
+        if self.state == 'running':
+            self._resume_event.clear()
+            self.state = 'paused'
+
+    def resume(self):
+        if self.state == 'paused':
+            # 暂停期间的时间不计入速度
+            self._rate_time = time.monotonic()
+            self._rate_bytes = self.bytes_done
+            self.state = 'running'
+            self._resume_event.set()
+
+    def cancel(self):
+        self._cancel_event.set()
+        self._resume_event.set()
+
+    # --- 进度 ---
+
+    @property
+    def fraction(self):
+        if self.bytes_total:
+            return min(1.0, self.bytes_done / self.bytes_total)
+        if self.files_total:
+            return min(1.0, self.files_done / self.files_total)
+        return 1.0 if self.state == 'done' else 0.0
+
+    @property
+    def bytes_per_second(self):
+        if self._rate == 0 and self.started is not None and self.bytes_done:
+            # 第一次采样之前使用平均速度
+            elapsed = time.monotonic() - self.started
+            return self.bytes_done / elapsed if elapsed > 0 else 0.0
+        return self._rate
+
+    @property
+    def eta_seconds(self):
+        """预计剩余时间 (秒)，无法估计时返回 None。"""
+        rate = self.bytes_per_second
+        if rate <= 0 or not self.bytes_total:
+            return None
+        return max(0.0, (self.bytes_total - self.bytes_done) / rate)
+
+    # --- 工作线程使用 ---
+
+    def checkpoint(self):
+        """在处理每个数据块/文件之前调用: 暂停时阻塞，取消时抛出 OperationCancelled。"""
+        self._resume_event.wait()
+        if self._cancel_event.is_set():
+            raise OperationCancelled()
+
+    def advance(self, byte_count):
+        self.bytes_done += byte_count
+        now = time.monotonic()
+        if self._rate_time is None:
+            self._rate_time, self._rate_bytes = now, 0
+            return
+        elapsed = now - self._rate_time
+        if elapsed >= RATE_SAMPLE_INTERVAL:
+            sample = (self.bytes_done - self._rate_bytes) / elapsed
+            # 指数平滑，避免 USB 设备缓存刷写时速度剧烈跳动
+            self._rate = sample if self._rate == 0 else 0.7 * self._rate + 0.3 * sample
+            self._rate_time, self._rate_bytes = now, self.bytes_done
+
+
+def _tree_stats(path):
+    """返回 (总字节数, 文件数)，不跟随符号链接。"""
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return 0, 0
+    if not os.path.isdir(path) or os.path.islink(path):
+        return stat.st_size, 1
+    total_bytes, total_files = 0, 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as iterator:
+                for entry in iterator:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    else:
+                        total_bytes += entry.stat(follow_symlinks=False).st_size
+                        total_files += 1
+        except OSError:
+            continue
+    return total_bytes, total_files
+
+
+def _unique_name(target):
+    """为"保留两者"生成不冲突的名称，例如 "报告 (2).txt"。"""
+    stem, suffix = target.stem, target.suffix
+    if target.is_dir():
+        stem, suffix = target.name, ""
+    counter = 2
+    while True:
+        candidate = target.with_name(f"{stem} ({counter}){suffix}")
+        if not os.path.lexists(candidate):
+            return candidate
+        counter += 1
+
+
+def _resolve_target(job, target, source_is_dir):
+    """按冲突策略返回实际的目标路径；返回 None 表示跳过。"""
+    if not os.path.lexists(target):
+        return target
+    if job.conflict == CONFLICT_SKIP:
+        return None
+    if job.conflict == CONFLICT_RENAME:
+        return _unique_name(target)
+    # 覆盖: 文件夹合并到已有文件夹中；类型不同时先删除已有的目标
+    if source_is_dir != (target.is_dir() and not target.is_symlink()):
+        _remove_path(target)
+    return target
+
+
+def _copy_file_range(infd, outfd, count):
+    return os.copy_file_range(infd, outfd, count)
+
+
+def _sendfile(infd, outfd, count):
+    return os.sendfile(outfd, infd, None, count)
+
+
+def _read_write(infd, outfd, count):
+    data = os.read(infd, min(count, READ_WRITE_CHUNK_SIZE))
+    view = memoryview(data)
+    while view:
+        written = os.write(outfd, view)
+        view = view[written:]
+    return len(data)
+
+
+def _copy_methods():
+    """按优先级返回可用的零拷贝方法: copy_file_range (Linux 4.5+)，sendfile，最后是普通读写。"""
+    methods = []
+    if hasattr(os, 'copy_file_range'):
+        methods.append(_copy_file_range)
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        methods.append(_sendfile)
+    methods.append(_read_write)
+    return methods
+
+
+def _copy_file(job, source, target):
+    """
+    分块复制单个文件，每块之后更新进度并检查暂停/取消。
+    数据先写入目标目录中的临时文件并 fsync，复制成功后才用 os.replace 替换目标；
+    取消或出错时只删除临时文件，覆盖的已有文件保持原样。
+    """
+    job.current_name = source.name
+    methods = _copy_methods()
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".part", dir=str(target.parent))
+    try:
+        with open(source, 'rb') as fsrc, os.fdopen(fd, 'wb') as fdst:
+            infd, outfd = fsrc.fileno(), fdst.fileno()
+            copied_any = False
+            while True:
+                job.checkpoint()
+                try:
+                    copied = methods[0](infd, outfd, COPY_CHUNK_SIZE)
+                except OSError as e:
+                    # 只有在还没复制任何数据时才换用下一种方式，避免文件位置不一致
+                    if e.errno in _FALLBACK_ERRNOS and len(methods) > 1 and not copied_any:
+                        methods.pop(0)
+                        continue
+                    raise
+                if copied == 0:
+                    break
+                copied_any = True
+                job.advance(copied)
+            os.fsync(outfd)
+        # 同时替换掉 mkstemp 的 0600 权限
+        shutil.copystat(source, tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    job.files_done += 1
+
+
+def _copy_path(job, source, target):
+    job.checkpoint()
+    if source.is_symlink():
+        if os.path.lexists(target):
+            _remove_path(target)
+        os.symlink(os.readlink(source), target)
+        job.advance(os.lstat(source).st_size)
+        job.files_done += 1
+    elif source.is_dir():
+        os.makedirs(target, exist_ok=True)
+        with os.scandir(source) as iterator:
+            children = [Path(entry.path) for entry in iterator]
+        for child in children:
+            child_target = _resolve_target(job, target / child.name, child.is_dir() and not child.is_symlink())
+            if child_target is None:
+                skipped_bytes, skipped_files = _tree_stats(child)
+                job.advance(skipped_bytes)
+                job.files_done += skipped_files
+                continue
+            _copy_path(job, child, child_target)
+        shutil.copystat(source, target)
+    else:
+        _copy_file(job, source, target)
+
+
+def _remove_path(path, job=None):
+    """删除文件或整个目录树；传入 job 时逐项更新进度并响应取消。"""
+    path = Path(path)
+    if path.is_symlink() or not path.is_dir():
+        if job is not None:
+            job.checkpoint()
+            job.current_name = path.name
+        os.remove(path)
+        if job is not None:
+            job.files_done += 1
+        return
+    if job is None:
+        shutil.rmtree(path)
+        return
+    with os.scandir(path) as iterator:
+        children = [Path(entry.path) for entry in iterator]
+    for child in children:
+        _remove_path(child, job)
+    os.rmdir(path)
+
+
+def _same_device(source, dest_dir):
+    try:
+        return os.lstat(source).st_dev == os.stat(dest_dir).st_dev
+    except OSError:
+        return False
+
+
+def _is_real_dir(path):
+    return os.path.isdir(path) and not os.path.islink(path)
+
+
+def _rename_path(job, source, target):
+    """
+    同一文件系统上的移动。目标是已有的文件夹时与复制一样合并: 逐项移动子项 (冲突按策略处理)，
+    再删除空的源文件夹 (有被跳过的子项时保留)。类型不同的目标已由 _resolve_target 删除。
+    """
+    job.checkpoint()
+    if not (_is_real_dir(source) and _is_real_dir(target)):
+        os.replace(source, target)
+        return
+    with os.scandir(source) as iterator:
+        children = [Path(entry.path) for entry in iterator]
+    for child in children:
+        child_target = _resolve_target(job, target / child.name, _is_real_dir(child))
+        if child_target is not None:
+            _rename_path(job, child, child_target)
+    try:
+        os.rmdir(source)
+    except OSError:
+        pass
+
+
+def _run_transfer(job):
+    """复制或移动: 先确定每个源的目标和方式，再统计需要复制的字节数，最后执行。"""
+    plan = []
+    for source in job.sources:
+        if job.kind == 'move' and source.parent == job.dest_dir:
+            continue  # 移动到原来的目录: 无事可做
+        source_is_dir = source.is_dir() and not source.is_symlink()
+        if source_is_dir and (job.dest_dir == source or source in job.dest_dir.parents):
+            raise ValueError(f"无法将文件夹 '{source.name}' 粘贴到其自身内部。")
+        target = job.dest_dir / source.name
+        if target == source:
+            # 在同一目录中复制: 总是保留两者
+            target = _unique_name(target)
+        else:
+            target = _resolve_target(job, target, source_is_dir)
+        if target is None:
+            continue
+        # 同一文件系统上的移动只需要 rename，不复制任何数据
+        rename = job.kind == 'move' and _same_device(source, job.dest_dir)
+        plan.append((source, target, rename))
+
+    for source, _, rename in plan:
+        if not rename:
+            size, count = _tree_stats(source)
+            job.bytes_total += size
+            job.files_total += count
+
+    for source, target, rename in plan:
+        job.checkpoint()
+        job.current_name = source.name
+        if rename:
+            _rename_path(job, source, target)
+            continue
+        _copy_path(job, source, target)
+        if job.kind == 'move':
+            # 跨文件系统移动: 复制完成后再删除源
+            _remove_path(source)
+
+
+def _run_delete(job):
+    for source in job.sources:
+        job.files_total += _tree_stats(source)[1]
+    for source in job.sources:
+        _remove_path(source, job)
+
+
+def run_operation(job):
+    """在当前线程中执行任务 (工作线程调用)。"""
+    job.state = 'running'
+    job.started = time.monotonic()
+    try:
+        if job.kind == 'delete':
+            _run_delete(job)
+        else:
+            _run_transfer(job)
+        job.state = 'done'
+    except OperationCancelled:
+        job.state = 'cancelled'
+    except Exception as e:
+        job.error = e
+        job.state = 'failed'
+    finally:
+        job.finished = time.monotonic()
+        job.current_name = ""
+
+
+class FileOperationQueue:
+    """
+    文件操作任务队列，由最多 max_workers 个后台线程执行。
+    UI 线程通过 after() 定期读取任务进度，并用 pop_finished() 取出已结束的任务。
+    """
+
+    def __init__(self, max_workers=MAX_WORKERS):
+        self.max_workers = max_workers
+        self.jobs = []
+        self._queue = queue.Queue()
+        self._workers = []
+
+    def submit(self, job):
+        self.jobs.append(job)
+        self._queue.put(job)
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self._workers.append(worker)
+            worker.start()
+        return job
+
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            if job._cancel_event.is_set():
+                job.state = 'cancelled'
+                job.finished = time.monotonic()
+                continue
+            run_operation(job)
+
+    def active_jobs(self):
+        return [job for job in self.jobs if not job.is_finished]
+
+    def cancel_all(self):
+        """取消所有未结束的任务 (关闭窗口时)。工作线程在处理下一个数据块之前响应。"""
+        for job in self.active_jobs():
+            job.cancel()
+
+    def pop_finished(self):
+        """返回尚未报告过的已结束任务。"""
+        finished = [job for job in self.jobs if job.is_finished and not job.reported]
+        for job in finished:
+            job.reported = True
+        return finished
+
+    def clear_finished(self):
+        self.jobs = [job for job in self.jobs if not job.is_finished or not job.reported]
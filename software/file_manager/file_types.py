@@ -0,0 +1,249 @@
+import os
+import json
+import stat
+from collections import namedtuple
+
+# 分类在列表中的显示顺序
+CATEGORY_ORDER = ["文件夹", "图片", "音乐", "视频", "文档", "网页", "压缩包", "其他"]
+# 用户自定义文件类型的配置文件 (位于用户数据目录)
+USER_TYPES_FILENAME = "file_types.json"
+# 内容嗅探时读取的文件开头字节数
+SNIFF_BYTES = 512
+
+# 一个文件的分类: 分类名称 (CATEGORY_ORDER 之一)、图标键 (见 icon_loader) 和 MIME 类型
+FileType = namedtuple('FileType', ['category', 'icon_key', 'mime'])
+
+UNKNOWN_TYPE = FileType("其他", "file", "application/octet-stream")
+TEXT_TYPE = FileType("文档", "editor", "text/plain")
+
+# 内置的扩展名表: (分类, 图标键) -> {扩展名: MIME 类型}
+# 分类和图标键都只在这里定义，不会再出现两张表不一致的情况
+_BUILTIN_TYPES = {
+    ("音乐", "music"): {
+        'mp3': "audio/mpeg", 'wav': "audio/wav", 'flac': "audio/flac", 'aac': "audio/aac",
+        'ogg': "audio/ogg", 'm4a': "audio/mp4",
+    },
+    ("图片", "photo"): {
+        'jpg': "image/jpeg", 'jpeg': "image/jpeg", 'png': "image/png", 'gif': "image/gif",
+        'bmp': "image/bmp", 'tiff': "image/tiff", 'tif': "image/tiff", 'webp': "image/webp",
+        'svg': "image/svg+xml",
+    },
+    ("视频", "video"): {
+        'mp4': "video/mp4", 'mov': "video/quicktime", 'avi': "video/x-msvideo",
+        'mkv': "video/x-matroska", 'wmv': "video/x-ms-wmv", 'webm': "video/webm",
+    },
+    # 可以用内置编辑器打开的文本文档
+    ("文档", "editor"): {
+        'txt': "text/plain", 'md': "text/markdown", 'py': "text/x-python", 'json': "application/json",
+        'xml': "application/xml", 'log': "text/plain", 'ini': "text/plain", 'cfg': "text/plain",
+        'csv': "text/csv", 'sh': "application/x-sh",
+    },
+    # 二进制文档交给系统默认程序打开
+    ("文档", "file"): {
+        'pdf': "application/pdf", 'doc': "application/msword",
+        'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        'xls': "application/vnd.ms-excel",
+        'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    },
+    ("网页", "browser"): {
+        'html': "text/html", 'htm': "text/html", 'css': "text/css", 'js': "text/javascript",
+    },
+    ("压缩包", "file"): {
+        'zip': "application/zip", 'rar': "application/vnd.rar", 'gz': "application/gzip",
+        '7z': "application/x-7z-compressed", 'tar': "application/x-tar", 'xz': "application/x-xz",
+        'bz2': "application/x-bzip2",
+    },
+}
+
+# 没有扩展名的文件按开头的字节判断类型 (类似 libmagic): (偏移, 特征字节, MIME 类型)
+_MAGIC_SIGNATURES = [
+    (0, b'\x89PNG\r\n\x1a\n', "image/png"),
+    (0, b'\xff\xd8\xff', "image/jpeg"),
+    (0, b'GIF87a', "image/gif"),
+    (0, b'GIF89a', "image/gif"),
+    (0, b'II*\x00', "image/tiff"),
+    (0, b'MM\x00*', "image/tiff"),
+    (8, b'WEBP', "image/webp"),
+    (0, b'%PDF-', "application/pdf"),
+    (0, b'PK\x03\x04', "application/zip"),
+    (0, b'\x1f\x8b', "application/gzip"),
+    (0, b'7z\xbc\xaf\x27\x1c', "application/x-7z-compressed"),
+    (0, b'Rar!\x1a\x07', "application/vnd.rar"),
+    (0, b'\xfd7zXZ\x00', "application/x-xz"),
+    (0, b'BZh', "application/x-bzip2"),
+    (257, b'ustar', "application/x-tar"),
+    (0, b'ID3', "audio/mpeg"),
+    (0, b'fLaC', "audio/flac"),
+    (0, b'OggS', "audio/ogg"),
+    (8, b'WAVE', "audio/wav"),
+    (8, b'AVI ', "video/x-msvideo"),
+    (4, b'ftyp', "video/mp4"),
+    (0, b'\x1a\x45\xdf\xa3', "video/x-matroska"),
+]
+# 文本内容的特征 (去掉开头空白、忽略大小写后比较)
+_TEXT_SIGNATURES = [
+    (b'<!doctype html', "text/html"),
+    (b'<html', "text/html"),
+    (b'<svg', "image/svg+xml"),
+    (b'<?xml', "application/xml"),
+    (b'#!', "application/x-sh"),
+]
+
+_by_extension = None
+_by_mime = None
+
+
+def _build_tables():
+    """合并内置表和用户配置，生成 扩展名 -> FileType 和 MIME -> FileType 两个字典。"""
+    by_extension, by_mime = {}, {}
+    for (category, icon_key), extensions in _BUILTIN_TYPES.items():
+        for ext, mime in extensions.items():
+            file_type = FileType(category, icon_key, mime)
+            by_extension[ext] = file_type
+            by_mime.setdefault(mime, file_type)
+    for ext, file_type in _load_user_types().items():
+        by_extension[ext] = file_type
+        by_mime.setdefault(file_type.mime, file_type)
+    return by_extension, by_mime
+
+
+def _load_user_types():
+    """
+    读取用户数据目录下的 file_types.json，格式为:
+        {"扩展名": {"category": "文档", "icon": "editor", "mime": "text/x-lua"}, ...}
+    只写 category 时，图标键和 MIME 类型沿用同一分类中内置类型的默认值。
+    """
+    try:
+        from system.platformdirs_pack import get_config_path
+        with open(get_config_path(USER_TYPES_FILENAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (ImportError, OSError, json.JSONDecodeError) as e:
+        print(f"警告: 无法加载自定义文件类型 {USER_TYPES_FILENAME}: {e}")
+        return {}
+    if not isinstance(data, dict):
+        print(f"警告: {USER_TYPES_FILENAME} 的内容应为对象，已忽略")
+        return {}
+
+    default_icons = {}
+    for category, icon_key in _BUILTIN_TYPES:
+        default_icons.setdefault(category, icon_key)
+    user_types = {}
+    for ext, spec in data.items():
+        if isinstance(spec, str):
+            spec = {'category': spec}
+        category = spec.get('category') if isinstance(spec, dict) else None
+        if category not in CATEGORY_ORDER or category == "文件夹":
+            print(f"警告: 自定义文件类型 '{ext}' 的分类无效，已忽略: {category}")
+            continue
+        icon_key = spec.get('icon', default_icons.get(category, "file"))
+        mime = spec.get('mime', "application/octet-stream")
+        user_types[ext.lower().lstrip('.')] = FileType(category, icon_key, mime)
+    return user_types
+
+
+def _tables():
+    global _by_extension, _by_mime
+    if _by_extension is None:
+        _by_extension, _by_mime = _build_tables()
+    return _by_extension, _by_mime
+
+
+def reload_user_types():
+    """重新读取用户配置 (修改 file_types.json 之后调用)。"""
+    global _by_extension, _by_mime
+    _by_extension, _by_mime = _build_tables()
+
+
+def _extension(filename):
+    dot = filename.rfind('.')
+    # 以点开头且没有其他点的文件 (如 .bashrc) 视为没有扩展名
+    if dot <= 0:
+        return ''
+    return filename[dot + 1:].lower()
+
+
+def _read_head(path, mode=None):
+    """
+    读取普通文件开头的 SNIFF_BYTES 个字节；不是普通文件或无法读取时返回 None。
+    FIFO、socket 和设备文件不会被打开 (打开 FIFO 会一直阻塞，打开设备可能有副作用)。
+    """
+    try:
+        if mode is None:
+            mode = os.stat(path).st_mode
+        if not stat.S_ISREG(mode):
+            return None
+        # O_NONBLOCK: 检查和打开之间文件被换成了 FIFO 时也不会阻塞
+        fd = os.open(path, os.O_RDONLY | getattr(os, 'O_NONBLOCK', 0) | getattr(os, 'O_NOCTTY', 0))
+    except OSError:
+        return None
+    try:
+        if not stat.S_ISREG(os.fstat(fd).st_mode):
+            return None
+        return os.read(fd, SNIFF_BYTES)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def sniff_mime(path, mode=None):
+    """
+    读取文件开头的字节判断 MIME 类型；无法判断、无法读取或不是普通文件时返回 None。
+    mode 为已知的 st_mode (省去一次 stat)。
+    """
+    head = _read_head(path, mode)
+    if not head:
+        return None
+    for offset, signature, mime in _MAGIC_SIGNATURES:
+        if head.startswith(signature, offset):
+            return mime
+    stripped = head.lstrip().lower()
+    for signature, mime in _TEXT_SIGNATURES:
+        if stripped.startswith(signature):
+            return mime
+    if b'\0' in head:
+        return None
+    try:
+        # 末尾可能截断了一个多字节字符
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 3:
+            return None
+    return "text/plain"
+
+
+def classify(filename, path=None, mode=None):
+    """
+    返回文件的 FileType。
+
+    参数:
+        filename (str): 文件名，按扩展名查表。
+        path: 文件完整路径。给出时，没有扩展名的普通文件会读取开头的字节判断类型。
+              嗅探需要读文件，只对单个文件使用 (如打开文件、属性窗口) 或在后台线程中调用。
+        mode: 已知的 st_mode，省去嗅探前的 stat。
+    """
+    by_extension, by_mime = _tables()
+    ext = _extension(filename)
+    file_type = by_extension.get(ext)
+    if file_type is not None:
+        return file_type
+    if path is None or ext:
+        return UNKNOWN_TYPE
+    mime = sniff_mime(path, mode)
+    if mime is None:
+        return UNKNOWN_TYPE
+    if mime == "text/plain":
+        return TEXT_TYPE
+    return by_mime.get(mime, UNKNOWN_TYPE)
+
+
+# Pillow 能生成缩略图的图片类型 (SVG 是矢量图，不在其中)
+THUMBNAIL_MIME_TYPES = frozenset([
+    "image/jpeg", "image/png", "image/gif", "image/bmp", "image/tiff", "image/webp",
+])
+
+
+def has_thumbnail(file_type):
+    return file_type is not None and file_type.mime in THUMBNAIL_MIME_TYPES
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
-from PIL import Image, ImageTk
+import tkinter as tk
+from system.icon_cache import get_photo_image
 
 class IconLoader:
     def __init__(self):
@@ -31,22 +32,16 @@ class IconLoader:
         icon_path = self.project_root / "icons"
         if not icon_path.exists():
             print("警告: 无法找到图标目录。将使用一个空白图片作为备用。")
-            img = Image.new('RGBA', (16, 16), (0, 0, 0, 0))
-            placeholder = ImageTk.PhotoImage(img)
+            placeholder = tk.PhotoImage(width=16, height=16)  # 透明的空白图片
             for name in icon_names.keys():
                 icon_references[name] = placeholder
             return icon_references
 
         for name, filename in icon_names.items():
             try:
-                img_path = icon_path / filename
-                if img_path.exists():
-                    img = Image.open(img_path).resize((16, 16), Image.Resampling.LANCZOS)
-                    icon_references[name] = ImageTk.PhotoImage(img)
-                else:
-                    raise FileNotFoundError
+                # 与桌面共享的图标缓存，首次运行后直接读取缩放好的 16x16 缩略图
+                icon_references[name] = get_photo_image(icon_path / filename, (16, 16))
             except Exception as e:
                 print(f"警告: 加载图标 {filename} 失败: {e}. 将使用一个空白图片。")
-                img = Image.new('RGBA', (16, 16), (0, 0, 0, 0))
-                icon_references[name] = ImageTk.PhotoImage(img)
+                icon_references[name] = tk.PhotoImage(width=16, height=16)
         return icon_references
\ No newline at end of file
@@ -1,13 +1,43 @@
 import os
 import sys
-import shutil
 import subprocess
+import time
+import queue
+import threading
 import datetime
 from pathlib import Path
 from tkinter import messagebox, simpledialog
 import tkinter as tk
 from tkinter import ttk
 import system.config as config
+from system.app_registry import get_app, launch_subprocess, forward_to_instance
+from .dir_scanner import DirectoryScanner, ScanEntry
+from .virtual_list import VirtualTreeView, VIRTUAL_LIST_THRESHOLD
+from .dir_cache import DirectoryCache, CachedListing
+from .file_operations import FileOperation, FileOperationQueue, CONFLICT_OVERWRITE, CONFLICT_RENAME
+from .operations_window import show_operations_window
+from .search_index import SearchIndex
+from .dir_size import FolderSizeEngine
+from .thumbnailer import Thumbnailer
+from .file_types import CATEGORY_ORDER, classify, has_thumbnail
+
+# 每次 after() 回调最多插入的行数，以及轮询扫描结果的间隔 (毫秒)
+ROWS_PER_TICK = 300
+SCAN_POLL_MS = 15
+# 检查目录监视器报告的变化的间隔 (毫秒)
+WATCH_POLL_MS = 1000
+# 当前目录变化后等待多久再自动刷新 (毫秒)；期间的所有变化合并为一次刷新
+AUTO_REFRESH_DELAY_MS = 1500
+# 有文件操作在进行时检查其是否结束的间隔 (毫秒)
+OPERATIONS_POLL_MS = 300
+# 启动后延迟多久开始建立搜索索引 (毫秒)，避免与第一次目录加载争抢磁盘
+SEARCH_INDEX_DELAY_MS = 3000
+SEARCH_POLL_MS = 20
+# 检查文件夹大小计算结果的间隔 (毫秒)
+FOLDER_SIZE_POLL_MS = 200
+# 滚动停止多久之后为可见的图片请求缩略图，以及检查缩略图是否生成完毕的间隔 (毫秒)
+THUMBNAIL_DEBOUNCE_MS = 100
+THUMBNAIL_POLL_MS = 50
 
 class LogicManager:
     def __init__(self, app_instance, tree_widget, path_var):
@@ -16,6 +46,17 @@ class LogicManager:
         self.tree = tree_widget
         self.path_var = path_var
 
+        # 缩略图进程池必须最先创建: fork 要在其他后台线程启动之前发生
+        self.thumbnailer = Thumbnailer()
+        self._image_rows = {}
+        self._thumbnail_after_id = None
+        self._thumbnail_poll_id = None
+        scrollbar = self.app.ui_manager.v_scrollbar
+        def on_tree_scrolled(first, last):
+            scrollbar.set(first, last)
+            self._schedule_thumbnails()
+        self.tree.configure(yscrollcommand=on_tree_scrolled)
+
         self.current_path = Path.home()
         self.history = [self.current_path]
         self.history_index = 0
@@ -23,16 +64,48 @@ class LogicManager:
         self.clipboard_path = None
         self.clipboard_action = None
 
-    def get_file_category(self, filename: str) -> str:
-        """根据文件扩展名返回分类名称。"""
-        ext = filename.split('.')[-1].lower() if '.' in filename else ''
-        if ext in ['mp3', 'wav', 'flac', 'aac']: return "音乐"
-        if ext in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'svg']: return "图片"
-        if ext in ['mp4', 'mov', 'avi', 'mkv', 'wmv']: return "视频"
-        if ext in ['txt', 'md', 'py', 'json', 'xml', 'log', 'ini', 'cfg', 'pdf', 'doc', 'docx', 'xls', 'xlsx']: return "文档"
-        if ext in ['html', 'htm', 'css', 'js']: return "网页"
-        if ext in ['zip', 'rar', 'gz', '7z']: return "压缩包"
-        return "其他"
+        # 后台目录扫描状态
+        self._scanner = None
+        self._scan_after_id = None
+        self._scan_done = False
+        self._scan_started = 0.0
+        self._pending_entries = []
+        self._category_nodes = {}
+        # 分类名称 -> [(ScanEntry, 行 ID)]，扫描结束后用于排序
+        self._category_rows = {}
+        self._rows_need_sort = False
+        # 目录项超过 VIRTUAL_LIST_THRESHOLD 时切换到虚拟列表，只为可见行创建 Treeview 行
+        self._virtual_list = None
+
+        # 目录扫描结果的 LRU 缓存，前进/后退时直接使用；目录变化时自动刷新当前视图
+        self.dir_cache = DirectoryCache()
+        self._scanned_entries = []
+        self._scan_mtime_ns = None
+        self._refresh_pending = False
+        self._auto_refresh_after_id = None
+        # 自动刷新前的视图状态 (展开的分类、选中的名称、滚动位置)，扫描结束后恢复
+        self._view_state = None
+        self.master.after(WATCH_POLL_MS, self._poll_directory_changes)
+
+        # 复制/移动/删除在后台线程中执行
+        self.file_operations = FileOperationQueue()
+        self._operations_window = None
+        self._operations_after_id = None
+        self._closing = False
+
+        # 文件名搜索: 后台建立主目录的索引，搜索结果显示在同一个 Treeview 中
+        self.search_index = SearchIndex()
+        self.master.after(SEARCH_INDEX_DELAY_MS, self.search_index.start)
+        self._search_query = None
+        self._search_paths = {}
+        self._search_after_id = None
+
+        # 文件夹大小在后台线程池中计算，结果逐个填入"大小"列
+        self.folder_size_engine = FolderSizeEngine()
+        self._folder_sizes = {}
+        self._folder_rows = {}
+        self._pending_folder_sizes = set()
+        self._folder_size_after_id = None
 
     def _format_size(self, size_bytes):
         """将字节转换为可读的格式。"""
@@ -45,83 +118,407 @@ class LogicManager:
         else:
             return f"{size_bytes/1024**3:.1f} GB"
 
-    def get_icon_key_for_file(self, filename: str) -> str:
-        """根据文件名返回图标键。"""
-        ext = filename.split('.')[-1].lower() if '.' in filename else ''
-        if ext in ['mp3', 'wav', 'flac', 'aac']: return "music"
-        if ext in ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff']: return "photo"
-        if ext in ['mp4', 'mov', 'avi', 'mkv', 'wmv']: return "video"
-        if ext in ['txt', 'md', 'py', 'json', 'xml', 'log', 'ini', 'cfg', 'pdf', 'doc', 'docx']: return "editor"
-        if ext in ['html', 'htm', 'css', 'js', 'svg']: return "browser"
-        return "file"
-        
-    def populate_file_list(self, path: Path):
-        """填充文件列表，并按类型分组和排序。"""
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        self.app.photo_image_references.clear()
+    def populate_file_list(self, path: Path, use_cache=True):
+        """
+        填充文件列表，并按类型分组和排序。
+        目录在后台线程中扫描，结果通过 after() 分批插入，不会阻塞窗口。
+        use_cache 为 True 且缓存有效时直接使用缓存的扫描结果。
+        """
+        self._clear_view()
 
         self.current_path = path
         self.path_var.set(str(self.current_path))
         self.master.title(f"文件管理器 - {self.current_path.name}")
-        
-        categories = {
-            "文件夹": [], "图片": [], "音乐": [], "视频": [],
-            "文档": [], "网页": [], "压缩包": [], "其他": []
-        }
-        
+
+        self._scan_done = False
+        self._pending_entries = []
+        self._category_nodes = {}
+        self._category_rows = {}
+        self._rows_need_sort = False
+        self._scanned_entries = []
+        self._refresh_pending = False
+        self._view_state = None
+        self._image_rows = {}
+
+        if path.parent != path:
+            self.tree.insert("", "end", **self._parent_row_options())
+
+        self._scan_started = time.perf_counter()
+        cached_entries = self.dir_cache.get(path) if use_cache else None
+        if cached_entries is not None:
+            self._scan_mtime_ns = None
+            self._scanner = CachedListing(path, cached_entries)
+        else:
+            # 在扫描开始前读取修改时间: 扫描途中目录发生变化时，缓存会在下次读取时失效
+            try:
+                self._scan_mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                self._scan_mtime_ns = None
+            self._scanner = DirectoryScanner(path)
+            self._scanner.start()
+        self._poll_scan(self._scanner)
+
+    def _clear_view(self):
+        """停止扫描/搜索并清空列表。"""
+        self._cancel_scan()
+        self._cancel_search()
+        self._cancel_folder_sizes()
+        if self._auto_refresh_after_id is not None:
+            self.master.after_cancel(self._auto_refresh_after_id)
+            self._auto_refresh_after_id = None
+        if self._virtual_list is not None:
+            self._virtual_list.detach()
+            self._virtual_list = None
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+        if self._search_query is not None:
+            self._search_query = None
+            self._search_paths = {}
+            self.tree.configure(displaycolumns=("modified", "size"))
+
+    def _cancel_folder_sizes(self):
+        self.folder_size_engine.cancel_pending()
+        if self._folder_size_after_id is not None:
+            self.master.after_cancel(self._folder_size_after_id)
+            self._folder_size_after_id = None
+        self._folder_sizes = {}
+        self._folder_rows = {}
+        self._pending_folder_sizes = set()
+
+    def _cancel_scan(self):
+        """取消正在进行的扫描 (导航到其他目录时调用)。"""
+        if self._scanner is not None:
+            self._scanner.cancel()
+            self._scanner = None
+        if self._scan_after_id is not None:
+            self.master.after_cancel(self._scan_after_id)
+            self._scan_after_id = None
+
+    def _poll_scan(self, scanner):
+        """从扫描线程的队列中取出结果，每次最多插入 ROWS_PER_TICK 行。"""
+        self._scan_after_id = None
+        if scanner is not self._scanner:
+            return
+
+        # 虚拟列表模式下插入只是追加到条目表，不受每次插入行数的限制
+        limit = ROWS_PER_TICK if self._virtual_list is None else float('inf')
         try:
-            for entry in os.scandir(path):
-                if entry.is_dir():
-                    categories["文件夹"].append(entry)
+            while not self._scan_done and len(self._pending_entries) < limit:
+                kind, payload = scanner.queue.get_nowait()
+                if kind == 'batch':
+                    self._pending_entries.extend(payload)
+                    self._scanned_entries.extend(payload)
+                elif kind == 'done':
+                    self._scan_done = True
+                elif kind == 'permission_error':
+                    self._scanner = None
+                    messagebox.showwarning("权限错误", f"无法访问目录：\n{scanner.path}")
+                    self.go_back(is_error=True)
+                    return
                 else:
-                    category_name = self.get_file_category(entry.name)
-                    categories[category_name].append(entry)
-        except PermissionError:
-            messagebox.showwarning("权限错误", f"无法访问目录：\n{path}")
-            self.go_back(is_error=True)
+                    self._scanner = None
+                    messagebox.showerror("错误", f"无法读取目录内容: {payload}")
+                    return
+        except queue.Empty:
+            pass
+
+        if self._virtual_list is None and len(self._pending_entries) + self._row_count() > VIRTUAL_LIST_THRESHOLD:
+            self._switch_to_virtual_list()
+
+        if self._virtual_list is not None:
+            chunk, self._pending_entries = self._pending_entries, []
+            for entry in chunk:
+                self._virtual_list.add_entries(self._entry_category(entry), (entry,))
+            if self._scan_done:
+                self._virtual_list.sort(key=self._sort_key, reverse=self.sort_criteria[1])
+            self._virtual_list.render()
+        else:
+            if self._scan_done and not self._category_rows:
+                # 小目录一次就扫描完了: 先排序再插入，省去插入后再移动行
+                self._pending_entries.sort(key=self._sort_key, reverse=self.sort_criteria[1])
+
+            chunk = self._pending_entries[:ROWS_PER_TICK]
+            del self._pending_entries[:ROWS_PER_TICK]
+            if chunk and not self._scan_done:
+                # 扫描途中插入的行是无序的，扫描结束后需要重新排序
+                self._rows_need_sort = True
+            self._insert_rows(chunk)
+
+        if self._scan_done and not self._pending_entries:
+            self._finish_scan()
             return
-        except Exception as e:
-            messagebox.showerror("错误", f"无法读取目录内容: {e}")
+        self._scan_after_id = self.master.after(SCAN_POLL_MS, self._poll_scan, scanner)
+
+    def _sort_key(self, entry):
+        sort_key = self.sort_criteria[0]
+        if sort_key == 'date':
+            return entry.mtime
+        if sort_key == 'size':
+            if entry.is_dir:
+                # 大小还没算出来的文件夹排在最后
+                return self._folder_sizes.get(entry.name, -1)
+            return entry.size
+        if sort_key == 'category':
+            return self._entry_category(entry)
+        return entry.name.lower()
+
+    @staticmethod
+    def _file_type(entry):
+        """返回目录项的 FileType (扫描时已确定，旧条目按扩展名查表)。"""
+        return entry.file_type if entry.file_type is not None else classify(entry.name)
+
+    def _entry_category(self, entry):
+        return "文件夹" if entry.is_dir else self._file_type(entry).category
+
+    def _row_count(self):
+        return sum(len(rows) for rows in self._category_rows.values())
+
+    def _row_options(self, entry, directory=None):
+        """
+        返回显示一个目录项所需的 Treeview 行参数 (普通模式、虚拟列表模式和搜索结果共用)。
+        directory 为条目所在目录，默认为当前目录。
+        """
+        modified_time = datetime.datetime.fromtimestamp(entry.mtime).strftime('%Y-%m-%d %H:%M')
+        if entry.is_dir:
+            folder_size = self._folder_sizes.get(entry.name)
+            size = self._format_size(folder_size) if folder_size is not None else ""
+        else:
+            size = self._format_size(entry.size)
+        file_type = None if entry.is_dir else self._file_type(entry)
+        icon_key = "folder" if entry.is_dir else file_type.icon_key
+        # 图标由 icon_references 统一持有，同类文件共用一个 PhotoImage；已生成缩略图的图片显示缩略图
+        photo_image = None
+        if has_thumbnail(file_type):
+            photo_image = self.thumbnailer.get((directory or self.current_path) / entry.name, entry.mtime)
+        if photo_image is None:
+            photo_image = self.app.icon_references.get(icon_key, self.app.icon_references.get("file"))
+        item_tags = ('real_dir',) if entry.is_dir else ('file',)
+        return {'text': entry.name, 'values': (modified_time, size), 'image': photo_image, 'tags': item_tags}
+
+    def _header_options(self, category_name, count, is_open):
+        """虚拟列表中分类标题行的参数 (扁平列表没有展开箭头，用符号和数量表示)。"""
+        marker = "▾" if is_open else "▸"
+        return {'text': f"{marker} {category_name} ({count})", 'values': ("分类", "", ""), 'image': self.app.icon_references.get("folder"), 'tags': ('category_header',)}
+
+    def _parent_row_options(self):
+        return {'text': "..", 'values': ("上一级", "", ""), 'image': self.app.icon_references.get("folder"), 'tags': ('real_dir', 'parent_dir')}
+
+    def _switch_to_virtual_list(self):
+        """把已经插入的行转入虚拟列表的条目表，之后只为可见窗口创建行。"""
+        for i in self.tree.get_children():
+            self.tree.delete(i)
+        has_parent = self.current_path.parent != self.current_path
+        self._virtual_list = VirtualTreeView(
+            self.tree, self.app.ui_manager.v_scrollbar, CATEGORY_ORDER,
+            self._row_options, self._header_options,
+            self._parent_row_options() if has_parent else None,
+            on_render=self._schedule_thumbnails)
+        for category_name, rows in self._category_rows.items():
+            self._virtual_list.add_entries(category_name, [entry for entry, _ in rows])
+        self._category_nodes = {}
+        self._category_rows = {}
+        self._folder_rows = {}
+        self._image_rows = {}
+        self._rows_need_sort = False
+
+    def _get_category_node(self, category_name):
+        """返回分类标题行，不存在时按 CATEGORY_ORDER 的顺序插入。"""
+        node = self._category_nodes.get(category_name)
+        if node is None:
+            order = CATEGORY_ORDER.index(category_name)
+            # 插入位置: ".." 行 (如果有) 之后，排在所有顺序更靠前的分类之后
+            index = 1 if self.current_path.parent != self.current_path else 0
+            index += sum(1 for name in self._category_nodes if CATEGORY_ORDER.index(name) < order)
+            node = self.tree.insert("", index, text=category_name, values=("分类", "", ""), image=self.app.icon_references.get("folder"), open=False, tags=('category_header',))
+            self._category_nodes[category_name] = node
+            self._category_rows[category_name] = []
+        return node
+
+    def _insert_rows(self, entries):
+        for entry in entries:
+            category_name = self._entry_category(entry)
+            category_node = self._get_category_node(category_name)
+            row_id = self.tree.insert(category_node, "end", **self._row_options(entry))
+            if entry.is_dir:
+                self._folder_rows[entry.name] = row_id
+            elif has_thumbnail(self._file_type(entry)):
+                self._image_rows[row_id] = entry
+            self._category_rows[category_name].append((entry, row_id))
+
+    def _finish_scan(self):
+        """扫描结束: 必要时对每个分类内的行重新排序，并缓存扫描结果。"""
+        from_cache = isinstance(self._scanner, CachedListing)
+        self._scanner = None
+        if not from_cache:
+            self.dir_cache.put(self.current_path, self._scan_mtime_ns, self._scanned_entries)
+        if self._rows_need_sort:
+            reverse = self.sort_criteria[1]
+            for category_name, rows in self._category_rows.items():
+                rows.sort(key=lambda row: self._sort_key(row[0]), reverse=reverse)
+                node = self._category_nodes[category_name]
+                for index, (_, row_id) in enumerate(rows):
+                    self.tree.move(row_id, node, index)
+        if self._virtual_list is not None:
+            total = self._virtual_list.entry_count()
+        else:
+            total = self._row_count()
+        elapsed_ms = (time.perf_counter() - self._scan_started) * 1000
+        source = "缓存" if from_cache else "磁盘"
+        print(f"已加载 {self.current_path} ({source}): {total} 项，耗时 {elapsed_ms:.0f} ms")
+        if self._refresh_pending:
+            # 扫描途中目录发生了变化
+            self._auto_refresh()
             return
-        
-        if path.parent != path:
-            self.tree.insert("", "end", text="..", values=("上一级", "", ""), image=self.app.icon_references.get("folder"), tags=('real_dir', 'parent_dir'))
-        
-        for category_name, items in categories.items():
-            if not items:
-                continue
-            
-            sort_key, reverse = self.sort_criteria
+        if self._view_state is not None:
+            self._restore_view_state(self._view_state)
+            self._view_state = None
+        self._request_folder_sizes()
+        self._schedule_thumbnails()
+
+    def _schedule_thumbnails(self):
+        """可见行发生变化 (滚动、展开分类、加载完成) 后，稍等片刻再为可见的图片请求缩略图。"""
+        if self._thumbnail_after_id is None:
+            self._thumbnail_after_id = self.master.after(THUMBNAIL_DEBOUNCE_MS, self._request_visible_thumbnails)
+
+    def _visible_image_entries(self):
+        """返回当前可见的图片行: [(行 ID 或 None, ScanEntry)]。"""
+        if self._virtual_list is not None:
+            return [(None, entry) for entry in self._virtual_list.visible_entries()
+                    if not entry.is_dir and has_thumbnail(self._file_type(entry))]
+        if not self._image_rows:
+            return []
+        visible = []
+        # 每隔半行取一次 identify_row，得到窗口中显示的所有行
+        for y in range(0, self.tree.winfo_height(), 10):
+            row_id = self.tree.identify_row(y)
+            if row_id in self._image_rows and (not visible or visible[-1][0] != row_id):
+                visible.append((row_id, self._image_rows[row_id]))
+        return visible
+
+    def _request_visible_thumbnails(self):
+        self._thumbnail_after_id = None
+        if self._search_query is not None:
+            return
+        visible = self._visible_image_entries()
+        if not visible:
+            return
+        self.thumbnailer.request([(self.current_path / entry.name, entry.mtime) for _, entry in visible])
+        if self.thumbnailer.has_pending and self._thumbnail_poll_id is None:
+            self._thumbnail_poll_id = self.master.after(THUMBNAIL_POLL_MS, self._poll_thumbnails)
+
+    def _poll_thumbnails(self):
+        """把生成好的缩略图换到对应的行上；被 LRU 移除的缩略图换回普通图标。"""
+        self._thumbnail_poll_id = None
+        ready, evicted = self.thumbnailer.poll()
+        if ready or evicted:
+            if self._virtual_list is not None:
+                self._virtual_list.render()
+            else:
+                changed = {(str(self.current_path / entry.name), entry.mtime): row_id
+                           for row_id, entry in self._image_rows.items()}
+                for key in ready + evicted:
+                    row_id = changed.get(key)
+                    if row_id is not None and self.tree.exists(row_id):
+                        photo = self.thumbnailer.get(*key)
+                        if photo is None:
+                            photo = self.app.icon_references.get("photo")
+                        self.tree.item(row_id, image=photo)
+        if self.thumbnailer.has_pending:
+            self._thumbnail_poll_id = self.master.after(THUMBNAIL_POLL_MS, self._poll_thumbnails)
+
+    def _request_folder_sizes(self):
+        """为当前目录中的所有文件夹计划大小计算。"""
+        folders = [self.current_path / entry.name for entry in self._scanned_entries if entry.is_dir]
+        if not folders:
+            return
+        self._pending_folder_sizes = set(folders)
+        self.folder_size_engine.request(folders)
+        self._folder_size_after_id = self.master.after(FOLDER_SIZE_POLL_MS, self._poll_folder_sizes)
+
+    def _poll_folder_sizes(self):
+        """把已经算出的文件夹大小填入列表；全部完成后，如按大小排序则重新排列文件夹。"""
+        self._folder_size_after_id = None
+        updated = False
+        while True:
             try:
-                if sort_key == 'name':
-                    items.sort(key=lambda e: e.name.lower(), reverse=reverse)
-                elif sort_key == 'date':
-                    items.sort(key=lambda e: e.stat().st_mtime, reverse=reverse)
-                elif sort_key == 'size':
-                    items.sort(key=lambda e: e.stat().st_size, reverse=reverse)
-                elif sort_key == 'category':
-                    items.sort(key=lambda e: self.get_file_category(e.name), reverse=reverse)
-            except OSError as e:
-                print(f"排序时无法访问文件属性: {e}")
-
-            category_node = self.tree.insert("", "end", text=category_name, values=("分类", "", ""), image=self.app.icon_references.get("folder"), open=False, tags=('category_header',))
-
-            for item in items:
-                try:
-                    stat = item.stat()
-                    modified_time = datetime.datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M')
-                    size = self._format_size(stat.st_size) if not item.is_dir() else ""
-                    
-                    is_dir = item.is_dir()
-                    icon_key = "folder" if is_dir else self.get_icon_key_for_file(item.name)
-                    photo_image = self.app.icon_references.get(icon_key, self.app.icon_references.get("file"))
-                    self.app.photo_image_references.append(photo_image)
-
-                    item_tags = ('real_dir',) if is_dir else ('file',)
-                    self.tree.insert(category_node, "end", text=item.name, values=(modified_time, size), image=photo_image, tags=item_tags)
-                except OSError:
-                    continue
+                path = self.folder_size_engine.completed.get_nowait()
+            except queue.Empty:
+                break
+            if path not in self._pending_folder_sizes:
+                continue
+            self._pending_folder_sizes.discard(path)
+            self._folder_sizes[path.name] = self.folder_size_engine.totals[path]
+            row_id = self._folder_rows.get(path.name)
+            if row_id is not None and self.tree.exists(row_id):
+                self.tree.set(row_id, "size", self._format_size(self._folder_sizes[path.name]))
+            updated = True
+
+        if updated and self._virtual_list is not None:
+            self._virtual_list.render()
+        if self._pending_folder_sizes:
+            self._folder_size_after_id = self.master.after(FOLDER_SIZE_POLL_MS, self._poll_folder_sizes)
+        elif self.sort_criteria[0] == 'size':
+            self._sort_folders_by_size()
+
+    def _sort_folders_by_size(self):
+        reverse = self.sort_criteria[1]
+        if self._virtual_list is not None:
+            self._virtual_list.sort(key=self._sort_key, reverse=reverse)
+            self._virtual_list.render()
+            return
+        rows = self._category_rows.get("文件夹")
+        if not rows:
+            return
+        rows.sort(key=lambda row: self._sort_key(row[0]), reverse=reverse)
+        node = self._category_nodes["文件夹"]
+        for index, (_, row_id) in enumerate(rows):
+            self.tree.move(row_id, node, index)
+
+    def _poll_directory_changes(self):
+        """定期取出目录监视器报告的变化；当前目录变化时自动刷新。"""
+        changed = self.dir_cache.poll_changes()
+        if self.current_path in changed and self._search_query is None:
+            if self._scanner is not None:
+                self._refresh_pending = True
+            elif self._auto_refresh_after_id is None:
+                # 繁忙的目录会不断产生事件: 合并起来，最多每 AUTO_REFRESH_DELAY_MS 刷新一次
+                self._auto_refresh_after_id = self.master.after(AUTO_REFRESH_DELAY_MS, self._auto_refresh)
+        self.master.after(WATCH_POLL_MS, self._poll_directory_changes)
+
+    def _auto_refresh(self):
+        """重新扫描当前目录，扫描结束后恢复展开的分类、选择和滚动位置。"""
+        self._auto_refresh_after_id = None
+        # 连续刷新 (扫描途中又有变化) 时沿用第一次保存的状态
+        state = self._view_state or self._capture_view_state()
+        self.populate_file_list(self.current_path, use_cache=False)
+        self._view_state = state
+
+    def _capture_view_state(self):
+        if self._virtual_list is not None:
+            open_categories, top, selected = self._virtual_list.view_state()
+            return {'open': open_categories, 'top': top, 'selected': {selected.name} if selected else set()}
+        names = {row_id: entry.name for rows in self._category_rows.values() for entry, row_id in rows}
+        return {
+            'open': {name for name, node in self._category_nodes.items() if self.tree.item(node, 'open')},
+            'top': self.tree.yview()[0],
+            'selected': {names[row_id] for row_id in self.tree.selection() if row_id in names},
+        }
+
+    def _restore_view_state(self, state):
+        if self._virtual_list is not None:
+            self._virtual_list.restore_view(state['open'], state['top'], lambda entry: entry.name in state['selected'])
+            return
+        for name in state['open']:
+            node = self._category_nodes.get(name)
+            if node is not None:
+                self.tree.item(node, open=True)
+        selected = [row_id for rows in self._category_rows.values() for entry, row_id in rows
+                    if entry.name in state['selected']]
+        if selected:
+            self.tree.selection_set(selected)
+            self.tree.focus(selected[0])
+        self.tree.update_idletasks()
+        self.tree.yview_moveto(state['top'])
 
     def on_double_click(self, event=None):
         """处理双击或菜单“打开”事件。"""
@@ -129,6 +526,16 @@ class LogicManager:
         if not item_id:
             return
 
+        if item_id in self._search_paths:
+            full_path = self._search_paths[item_id]
+            if full_path.is_dir():
+                self.navigate_to(full_path)
+            elif full_path.is_file():
+                self._open_file(full_path)
+            else:
+                messagebox.showwarning("打开失败", f"'{full_path}' 已不存在。")
+            return
+
         item = self.tree.item(item_id)
         name_text = item.get('text', '')
         tags = item.get('tags', [])
@@ -139,7 +546,11 @@ class LogicManager:
                 self.navigate_to(new_path)
             return
         if 'category_header' in tags:
-            self.tree.item(item_id, open=not self.tree.item(item_id, 'open'))
+            if self._virtual_list is not None:
+                self._virtual_list.toggle_category(item_id)
+            else:
+                self.tree.item(item_id, open=not self.tree.item(item_id, 'open'))
+                self._schedule_thumbnails()
             return
 
         full_path = self.current_path / name_text
@@ -150,35 +561,29 @@ class LogicManager:
                 messagebox.showwarning("导航失败", f"目录 '{name_text}' 不存在。")
         elif 'file' in tags:
             if full_path.is_file():
-                icon_key = self.get_icon_key_for_file(name_text)
-                if icon_key == "editor":
-                    self.open_document_in_editor(full_path)
+                self._open_file(full_path)
+
+    def _open_file(self, full_path: Path):
+        """文本类文件用内置编辑器打开，其他文件交给系统默认程序。"""
+        if classify(full_path.name, full_path).icon_key == "editor":
+            self.open_document_in_editor(full_path)
+        else:
+            try:
+                if sys.platform == "win32":
+                    os.startfile(full_path)
+                elif sys.platform == "darwin":
+                    subprocess.Popen(["open", full_path])
                 else:
-                    try:
-                        if sys.platform == "win32":
-                            os.startfile(full_path)
-                        elif sys.platform == "darwin":
-                            subprocess.Popen(["open", full_path])
-                        else:
-                            subprocess.Popen(["xdg-open", full_path])
-                    except Exception as e:
-                        messagebox.showerror("打开失败", f"无法使用系统默认程序打开文件：\n{e}")
+                    subprocess.Popen(["xdg-open", full_path])
+            except Exception as e:
+                messagebox.showerror("打开失败", f"无法使用系统默认程序打开文件：\n{e}")
 
     def open_document_in_editor(self, file_path: Path):
-        """为指定的文件路径启动外部文本编辑器子进程。"""
-        try:
-            main_executable = sys.executable
-            file_path_str = str(file_path)
-            if getattr(sys, 'frozen', False):
-                command = [main_executable, "file_editor_only", file_path_str]
-            else:
-                editor_script_path = self.app.project_root / 'software' / 'file_editor_app.py'
-                command = [main_executable, str(editor_script_path), file_path_str]
-            subprocess.Popen(command)
+        """在编辑器中打开文件: 编辑器已在运行时作为新标签页打开，否则启动编辑器子进程。"""
+        spec = get_app('editor')
+        if forward_to_instance(spec, [file_path]):
             return True
-        except Exception as e:
-            messagebox.showerror("启动失败", f"启动文件编辑器时发生未知错误：{e}")
-            return False
+        return bool(launch_subprocess(spec, [file_path]))
 
     def navigate_to(self, path: Path):
         """导航到新路径。"""
@@ -207,7 +612,64 @@ class LogicManager:
             self.populate_file_list(self.history[self.history_index])
 
     def refresh(self):
-        """刷新当前目录。"""
+        """刷新当前目录 (总是重新扫描磁盘)。"""
+        self.populate_file_list(self.current_path, use_cache=False)
+
+    def search(self, query: str):
+        """
+        在文件名索引中搜索，结果显示在列表中；query 为空时回到当前目录。
+        查询在后台线程中执行，支持前缀 ("abc*")、glob ("*.py") 和子串匹配。
+        """
+        query = query.strip()
+        if not query:
+            if self._search_query is not None:
+                self.populate_file_list(self.current_path)
+            return
+        self._clear_view()
+        self._search_query = query
+        self.path_var.set(f"搜索 \"{query}\" ...")
+
+        results = queue.Queue()
+        started = time.perf_counter()
+        threading.Thread(target=lambda: results.put(self.search_index.search(query)), daemon=True).start()
+        self._search_after_id = self.master.after(SEARCH_POLL_MS, self._poll_search, query, results, started)
+
+    def _cancel_search(self):
+        if self._search_after_id is not None:
+            self.master.after_cancel(self._search_after_id)
+            self._search_after_id = None
+
+    def _poll_search(self, query, results, started):
+        self._search_after_id = None
+        if query != self._search_query:
+            return
+        try:
+            matches = results.get_nowait()
+        except queue.Empty:
+            self._search_after_id = self.master.after(SEARCH_POLL_MS, self._poll_search, query, results, started)
+            return
+        self._show_search_results(query, matches, (time.perf_counter() - started) * 1000)
+
+    def _show_search_results(self, query, matches, elapsed_ms):
+        """在列表中显示搜索结果，"位置"列显示所在目录。"""
+        self.tree.configure(displaycolumns=("location", "modified", "size"))
+        for match in matches:
+            file_type = None if match.is_dir else classify(match.path.name)
+            entry = ScanEntry(match.path.name, match.is_dir, match.size, match.mtime, file_type)
+            options = self._row_options(entry, match.path.parent)
+            modified_time, size = options['values']
+            options['values'] = (modified_time, size, str(match.path.parent))
+            row_id = self.tree.insert("", "end", **options)
+            self._search_paths[row_id] = match.path
+
+        status = f"搜索 \"{query}\": {len(matches)} 个结果，{elapsed_ms:.0f} ms"
+        if self.search_index.indexing:
+            status += " (索引尚未完成，结果可能不全)"
+        self.path_var.set(status)
+        self.master.title(f"文件管理器 - 搜索 {query}")
+
+    def _resort(self):
+        """排序方式改变: 目录内容没有变化，可以直接使用缓存的扫描结果。"""
         self.populate_file_list(self.current_path)
 
     def create_new_folder(self):
@@ -230,6 +692,8 @@ class LogicManager:
             return None
         
         item_id = selected_ids[0]
+        if item_id in self._search_paths:
+            return self._search_paths[item_id]
         item = self.tree.item(item_id)
         tags = item.get('tags', [])
         
@@ -248,38 +712,101 @@ class LogicManager:
             self.clipboard_action = 'copy'
             messagebox.showinfo("成功", f"'{path.name}' 已复制。")
 
+    def cut_item(self):
+        """剪切选定的项目，粘贴时移动。"""
+        path = self._get_selected_path()
+        if path:
+            self.clipboard_path = path
+            self.clipboard_action = 'move'
+            messagebox.showinfo("成功", f"'{path.name}' 已剪切。")
+
     def paste_item(self):
-        """将剪贴板中的项目粘贴到当前目录。"""
+        """将剪贴板中的项目粘贴到当前目录 (在后台执行)。"""
         if not self.clipboard_path or not self.clipboard_path.exists():
             messagebox.showwarning("提示", "剪贴板为空或源文件/夹已被移动或删除。")
             return
-        dest_path = self.current_path / self.clipboard_path.name
-        if dest_path.exists():
-            if not messagebox.askyesno("确认", f"'{dest_path.name}' 已存在，要覆盖它吗？"):
+        source = self.clipboard_path
+        if self.clipboard_action == 'move' and source.parent == self.current_path:
+            return
+        if source.is_dir() and (self.current_path == source or source in self.current_path.parents):
+            messagebox.showerror("粘贴失败", f"无法将文件夹 '{source.name}' 粘贴到其自身内部。")
+            return
+
+        conflict = CONFLICT_OVERWRITE
+        dest_path = self.current_path / source.name
+        if dest_path.exists() and dest_path != source:
+            answer = messagebox.askyesnocancel(
+                "确认", f"'{dest_path.name}' 已存在。\n\n是: 覆盖\n否: 保留两者 (自动重命名)\n取消: 不粘贴")
+            if answer is None:
                 return
-        try:
-            if self.clipboard_action == 'copy':
-                if self.clipboard_path.is_dir():
-                    shutil.copytree(self.clipboard_path, dest_path, dirs_exist_ok=True)
-                else:
-                    shutil.copy2(self.clipboard_path, dest_path)
-                self.refresh()
-        except Exception as e:
-            messagebox.showerror("粘贴失败", f"发生错误：{e}")
+            conflict = CONFLICT_OVERWRITE if answer else CONFLICT_RENAME
+
+        self._start_operation(FileOperation(self.clipboard_action, [source], self.current_path, conflict))
+        if self.clipboard_action == 'move':
+            # 移动之后原路径不再存在
+            self.clipboard_path = None
+            self.clipboard_action = None
 
     def delete_item(self):
-        """删除选定的项目。"""
+        """删除选定的项目 (在后台执行)。"""
         path = self._get_selected_path()
         if path:
             if messagebox.askyesno("确认删除", f"您确定要删除 '{path.name}' 吗？\n此操作无法撤销。"):
-                try:
-                    if path.is_dir():
-                        shutil.rmtree(path)
-                    else:
-                        os.remove(path)
-                    self.refresh()
-                except Exception as e:
-                    messagebox.showerror("删除失败", f"发生错误：{e}")
+                self._start_operation(FileOperation('delete', [path]))
+
+    def _start_operation(self, job):
+        self.file_operations.submit(job)
+        self.show_operations()
+        if self._operations_after_id is None:
+            self._operations_after_id = self.master.after(OPERATIONS_POLL_MS, self._poll_file_operations)
+
+    def show_operations(self):
+        """显示文件操作进度窗口 (已打开时提到最前)。"""
+        if self._operations_window is not None and self._operations_window.winfo_exists():
+            self._operations_window.lift()
+            return
+        self._operations_window = show_operations_window(self.master, self.file_operations, self._format_size)
+
+    def _poll_file_operations(self):
+        """检查已结束的文件操作: 报告错误，并刷新受影响的当前目录。"""
+        self._operations_after_id = None
+        needs_refresh = False
+        for job in self.file_operations.pop_finished():
+            if job.state == 'failed':
+                messagebox.showerror(f"{job.LABELS[job.kind]}失败", f"发生错误：{job.error}")
+            if self.current_path in job.affected_dirs():
+                needs_refresh = True
+        if needs_refresh and self._search_query is None:
+            self.refresh()
+        if self.file_operations.active_jobs():
+            self._operations_after_id = self.master.after(OPERATIONS_POLL_MS, self._poll_file_operations)
+
+    def close(self):
+        """
+        关闭窗口 (WM_DELETE_WINDOW)。工作线程是守护线程，直接退出会中断正在进行的复制，
+        因此有文件操作时先确认，取消后等待工作线程清理掉临时文件再关闭。
+        """
+        if self._closing:
+            return
+        active = self.file_operations.active_jobs()
+        if active:
+            if not messagebox.askyesno("文件操作进行中", f"还有 {len(active)} 个文件操作没有完成。\n"
+                                       "关闭窗口会取消这些操作，确定要关闭吗？", icon='warning'):
+                return
+            self.file_operations.cancel_all()
+        self._closing = True
+        self._close_when_idle()
+
+    def _close_when_idle(self):
+        if self.file_operations.active_jobs():
+            self.master.after(OPERATIONS_POLL_MS, self._close_when_idle)
+            return
+        # 停止缩略图进程池、目录监视器、搜索索引和文件夹大小计算
+        self.thumbnailer.shutdown()
+        self.dir_cache.close()
+        self.search_index.stop()
+        self.folder_size_engine.cancel_pending()
+        self.master.destroy()
 
     def show_properties(self):
         """显示选定项目的属性。"""
@@ -304,20 +831,34 @@ class LogicManager:
             # 使用 ttk.Frame 替代 tk.Frame 以支持 padding 参数
             frame = ttk.Frame(prop_win, padding="10") 
             frame.pack(expand=True, fill=tk.BOTH)
-            icon_key = "folder" if is_dir else self.get_icon_key_for_file(path.name)
+            file_type = None if is_dir else classify(path.name, path, stat.st_mode)
+            icon_key = "folder" if is_dir else file_type.icon_key
             self.app.property_window_icon = self.app.icon_references.get(icon_key)
             icon_label = ttk.Label(frame, image=self.app.property_window_icon, text=path.name, compound=tk.LEFT, font=("", 12, "bold"))
             icon_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=5)
             # ... (其他属性标签)
             ttk.Separator(frame, orient='horizontal').grid(row=1, column=0, columnspan=2, sticky='ew', pady=5)
             ttk.Label(frame, text="类型:").grid(row=2, column=0, sticky="w")
-            category = "文件夹" if is_dir else self.get_file_category(path.name)
+            category = "文件夹" if is_dir else file_type.category
             ttk.Label(frame, text=category).grid(row=2, column=1, sticky="w")
             ttk.Label(frame, text="位置:").grid(row=3, column=0, sticky="w")
             ttk.Label(frame, text=str(path.parent), wraplength=250).grid(row=3, column=1, sticky="w")
             ttk.Label(frame, text="大小:").grid(row=4, column=0, sticky="w")
-            size_str = self._format_size(stat.st_size) if not is_dir else "N/A"
-            ttk.Label(frame, text=size_str).grid(row=4, column=1, sticky="w")
+            size_var = tk.StringVar(value=self._format_size(stat.st_size) if not is_dir else "计算中...")
+            ttk.Label(frame, textvariable=size_var).grid(row=4, column=1, sticky="w")
+            if is_dir:
+                self.folder_size_engine.request([path])
+
+                def poll_folder_size():
+                    if not prop_win.winfo_exists():
+                        return
+                    if self.folder_size_engine.is_pending(path):
+                        prop_win.after(FOLDER_SIZE_POLL_MS, poll_folder_size)
+                    elif path in self.folder_size_engine.totals:
+                        size_var.set(self._format_size(self.folder_size_engine.totals[path]))
+                    else:
+                        size_var.set("N/A")
+                prop_win.after(FOLDER_SIZE_POLL_MS, poll_folder_size)
             ttk.Label(frame, text="修改日期:").grid(row=5, column=0, sticky="w")
             mod_time = datetime.datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
             ttk.Label(frame, text=mod_time).grid(row=5, column=1, sticky="w")
@@ -330,13 +871,13 @@ class LogicManager:
 
     def sort_by_name(self):
         self.sort_criteria = ('name', False)
-        self.refresh()
+        self._resort()
     def sort_by_date(self):
         self.sort_criteria = ('date', True)
-        self.refresh()
+        self._resort()
     def sort_by_size(self):
         self.sort_criteria = ('size', True)
-        self.refresh()
+        self._resort()
     def sort_by_category(self):
         self.sort_criteria = ('category', False)
-        self.refresh()
+        self._resort()
@@ -21,14 +21,13 @@ class FileManagerApp:
         self.master.title("文件管理器")
         self.master.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
         
-        # 将项目根目录存储为实例属性
-        self.project_root = project_root
+        # 将项目根目录存储为实例属性 (命令行启动时传入的是字符串)
+        self.project_root = Path(project_root)
         
         # 实例化图标加载器
         self.icon_loader = IconLoader()
         self.icon_references = self.icon_loader.load_icons()
         self.property_window_icon = None
-        self.photo_image_references = []
 
         # 实例化UI和逻辑管理器，并传入必要的参数
         self.ui_manager = UIManager(self.master, self.icon_references)
@@ -40,6 +39,7 @@ class FileManagerApp:
             'go_back': self.logic_manager.go_back,
             'go_forward': self.logic_manager.go_forward,
             'copy': self.logic_manager.copy_item,
+            'cut': self.logic_manager.cut_item,
             'paste': self.logic_manager.paste_item,
             'delete': self.logic_manager.delete_item,
             'properties': self.logic_manager.show_properties,
@@ -49,8 +49,12 @@ class FileManagerApp:
             'sort_date': self.logic_manager.sort_by_date,
             'sort_size': self.logic_manager.sort_by_size,
             'on_double_click': self.logic_manager.on_double_click,
+            'operations': self.logic_manager.show_operations,
+            'search': self.logic_manager.search,
         })
         
+        self.master.protocol("WM_DELETE_WINDOW", self.logic_manager.close)
+
         # 初始填充列表
         self.logic_manager.populate_file_list(Path.home())
 
@@ -0,0 +1,113 @@
+import tkinter as tk
+from tkinter import ttk
+
+# 进度刷新间隔 (毫秒)
+REFRESH_MS = 500
+
+STATE_LABELS = {
+    'pending': "等待中", 'running': "进行中", 'paused': "已暂停",
+    'done': "已完成", 'cancelled': "已取消", 'failed': "失败",
+}
+
+
+def _format_eta(seconds):
+    if seconds is None:
+        return "正在估计剩余时间"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"剩余约 {seconds} 秒"
+    if seconds < 3600:
+        return f"剩余约 {seconds // 60} 分 {seconds % 60} 秒"
+    return f"剩余约 {seconds // 3600} 小时 {seconds % 3600 // 60} 分"
+
+
+def show_operations_window(master, op_queue, format_size):
+    """
+    显示"文件操作"窗口，每 REFRESH_MS 毫秒刷新各任务的进度、速度和剩余时间。
+    :param master: 文件管理器主窗口。
+    :param op_queue: FileOperationQueue 实例。
+    :param format_size: 把字节数格式化为可读字符串的函数。
+    :return: 创建的 Toplevel 窗口。
+    """
+    window = tk.Toplevel(master)
+    window.title("文件操作")
+    window.geometry("460x260")
+
+    list_frame = ttk.Frame(window, padding=5)
+    list_frame.pack(fill="both", expand=True)
+    bottom_frame = ttk.Frame(window, padding=(5, 0, 5, 5))
+    bottom_frame.pack(fill="x")
+
+    # 任务 -> 该任务的控件
+    rows = {}
+
+    def toggle_pause(job):
+        if job.state == 'paused':
+            job.resume()
+        else:
+            job.pause()
+        update()
+
+    def create_row(job):
+        frame = ttk.Frame(list_frame, padding=(0, 3))
+        frame.pack(fill="x")
+        title = ttk.Label(frame, text=job.description, anchor="w")
+        title.grid(row=0, column=0, columnspan=3, sticky="ew")
+        progress = ttk.Progressbar(frame, maximum=1.0, mode="determinate")
+        progress.grid(row=1, column=0, sticky="ew")
+        pause_button = ttk.Button(frame, text="暂停", width=6, command=lambda: toggle_pause(job))
+        pause_button.grid(row=1, column=1, padx=(5, 0))
+        cancel_button = ttk.Button(frame, text="取消", width=6, command=job.cancel)
+        cancel_button.grid(row=1, column=2, padx=(5, 0))
+        status = ttk.Label(frame, text="", anchor="w", foreground="gray")
+        status.grid(row=2, column=0, columnspan=3, sticky="ew")
+        frame.grid_columnconfigure(0, weight=1)
+        rows[job] = {'frame': frame, 'progress': progress, 'pause': pause_button, 'cancel': cancel_button, 'status': status}
+
+    def status_text(job):
+        state = STATE_LABELS[job.state]
+        if job.state == 'failed':
+            return f"{state}: {job.error}"
+        if job.is_finished or job.state == 'pending':
+            return state
+        if job.bytes_total:
+            text = (f"{format_size(job.bytes_done)} / {format_size(job.bytes_total)}，"
+                    f"{format_size(int(job.bytes_per_second))}/s，")
+            text += "已暂停" if job.state == 'paused' else _format_eta(job.eta_seconds)
+        else:
+            text = f"{job.files_done} / {job.files_total} 项，{state}"
+        if job.current_name:
+            text += f" - {job.current_name}"
+        return text
+
+    def update():
+        if not window.winfo_exists():
+            return
+        for job in op_queue.jobs:
+            if job not in rows:
+                create_row(job)
+        for job, widgets in list(rows.items()):
+            if job not in op_queue.jobs:
+                widgets['frame'].destroy()
+                del rows[job]
+                continue
+            widgets['progress']['value'] = job.fraction
+            widgets['status'].config(text=status_text(job))
+            widgets['pause'].config(text="继续" if job.state == 'paused' else "暂停",
+                                    state="disabled" if job.is_finished else "normal")
+            widgets['cancel'].config(state="disabled" if job.is_finished else "normal")
+
+    def clear_finished():
+        op_queue.clear_finished()
+        update()
+
+    ttk.Button(bottom_frame, text="清除已完成", command=clear_finished).pack(side="left")
+    ttk.Button(bottom_frame, text="关闭", command=window.destroy).pack(side="right")
+
+    def schedule_update():
+        update()
+        if window.winfo_exists():
+            window.after(REFRESH_MS, schedule_update)
+
+    schedule_update()
+    return window
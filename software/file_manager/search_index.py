@@ -0,0 +1,328 @@
+import os
+import time
+import queue
+import sqlite3
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from .dir_cache import InotifyWatcher, max_user_watches
+
+SEARCH_CACHE_SUBDIR = "search"
+INDEX_FILENAME = "file_index.sqlite3"
+# 不进入的目录 (体积大且很少需要按文件名搜索)
+SKIP_DIR_NAMES = {'.git', '.hg', '.svn', '.cache', '__pycache__', 'node_modules', '.Trash'}
+# 每累计多少次写入提交一次事务
+COMMIT_BATCH = 2000
+# 每次搜索最多返回的结果数
+MAX_RESULTS = 500
+# inotify 最多监视的目录数。max_user_watches 由同一用户的所有进程共享 (旧内核默认只有 8192)，
+# 因此最多使用其中的一半，给 DirectoryCache 和其他程序留出余量
+MAX_WATCHED_DIRS = 2048
+# 没有 inotify (或监视数量不够覆盖整个目录树) 时重新检查整个索引的间隔 (秒)
+REINDEX_INTERVAL = 600
+
+SearchResult = namedtuple('SearchResult', ['path', 'is_dir', 'size', 'mtime'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    UNIQUE (parent, name)
+);
+CREATE INDEX IF NOT EXISTS files_name ON files (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL);
+"""
+
+# trigram 分词器 (SQLite 3.34+) 支持任意子串匹配，不区分大小写
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(name, content='files', content_rowid='id', tokenize='trigram');
+CREATE TRIGGER IF NOT EXISTS files_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts (rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts (files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+"""
+
+
+def _default_db_path():
+    from system.platformdirs_pack import get_cache_path
+    return get_cache_path(SEARCH_CACHE_SUBDIR) / INDEX_FILENAME
+
+
+def _escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _longest_literal(pattern):
+    """返回 glob 模式中最长的普通字符片段，用于先用全文索引缩小范围。"""
+    literal, longest, in_bracket = "", "", False
+    for char in pattern:
+        if in_bracket:
+            in_bracket = char != ']'
+            continue
+        if char in '*?[':
+            in_bracket = char == '['
+            longest = max(longest, literal, key=len)
+            literal = ""
+        else:
+            literal += char
+    return max(longest, literal, key=len)
+
+
+class SearchIndex:
+    """
+    文件名索引。后台线程遍历 root 下的所有目录，把文件名写入用户缓存目录中的 SQLite 数据库
+    (可用时使用 FTS5 trigram 全文索引)，之后通过 inotify 增量更新。
+
+    再次启动时只重新列出修改时间发生变化的目录，未变化的目录直接使用数据库中的子目录列表。
+    搜索在调用者的线程中执行，使用独立的只读连接 (WAL 模式下不会被写入阻塞)。
+    """
+
+    def __init__(self, root=None, db_path=None):
+        self.root = Path(root) if root is not None else Path.home()
+        self._db_path = db_path
+        self.indexing = False
+        self.indexed_dirs = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._watcher = None
+        self._watch_limit = MAX_WATCHED_DIRS
+        # 有目录因为数量上限没有被监视: 需要定期重新检查
+        self._watches_incomplete = False
+        self._pending_writes = 0
+
+    @property
+    def db_path(self):
+        if self._db_path is None:
+            self._db_path = _default_db_path()
+        return self._db_path
+
+    def start(self):
+        """启动后台索引线程 (重复调用无效)。"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.stop()
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _ensure_schema(conn):
+        conn.executescript(_SCHEMA)
+        try:
+            conn.executescript(_FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            # 旧版 SQLite 没有 trigram 分词器: 退回到 LIKE 查询
+            print(f"文件搜索: FTS5 trigram 不可用，将使用较慢的 LIKE 查询: {e}")
+        conn.commit()
+
+    # --- 索引 (后台线程) ---
+
+    def _run(self):
+        try:
+            conn = self._connect()
+            self._ensure_schema(conn)
+        except (OSError, sqlite3.Error) as e:
+            print(f"文件搜索: 无法打开索引数据库: {e}")
+            return
+        try:
+            self._watcher = InotifyWatcher()
+        except (OSError, AttributeError):
+            self._watcher = None
+        system_limit = max_user_watches()
+        if system_limit is not None:
+            self._watch_limit = min(MAX_WATCHED_DIRS, system_limit // 2)
+
+        while not self._stop_event.is_set():
+            self._crawl(conn)
+            if self._watcher is None:
+                # 没有 inotify: 定期重新检查 (未修改的目录不会被重新列出)
+                self._stop_event.wait(REINDEX_INTERVAL)
+                continue
+            self._follow_changes(conn)
+        conn.close()
+
+    def _crawl(self, conn):
+        self.indexing = True
+        started = time.perf_counter()
+        self.indexed_dirs = 0
+        stack = [self.root]
+        while stack and not self._stop_event.is_set():
+            stack.extend(self._sync_dir(conn, stack.pop()))
+            self.indexed_dirs += 1
+        conn.commit()
+        self._pending_writes = 0
+        self.indexing = False
+        count = conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+        print(f"文件搜索: 索引 {self.root} 完成，{count} 项，耗时 {time.perf_counter() - started:.1f} s")
+
+    def _follow_changes(self, conn):
+        """
+        inotify 报告某个目录发生变化时，只重新同步该目录。
+        有目录没有被监视时，每隔 REINDEX_INTERVAL 返回一次，由 _run 重新检查整个索引。
+        """
+        deadline = time.monotonic() + REINDEX_INTERVAL
+        while not self._stop_event.is_set():
+            if self._watches_incomplete and time.monotonic() >= deadline:
+                return
+            try:
+                path = self._watcher.changes.get(timeout=1.0)
+            except queue.Empty:
+                if self._pending_writes:
+                    conn.commit()
+                    self._pending_writes = 0
+                continue
+            # force: 目录中文件内容的修改不会改变目录的 mtime，但会改变文件的大小和修改时间
+            subdirs = self._sync_dir(conn, path, force=True)
+            # 只需要遍历新出现的子目录，已索引的子目录由它们自己的监视负责
+            stack = [subdir for subdir in subdirs if conn.execute(
+                "SELECT 1 FROM dirs WHERE path = ?", (str(subdir),)).fetchone() is None]
+            while stack and not self._stop_event.is_set():
+                stack.extend(self._sync_dir(conn, stack.pop()))
+
+    def _watch(self, path):
+        if self._watcher is None or self._watches_incomplete:
+            return
+        if self._watcher.watched_count >= self._watch_limit or not self._watcher.watch(path):
+            # 达到上限 (或 ENOSPC): 不再添加监视，改为定期重新检查
+            self._watches_incomplete = True
+
+    def _note_writes(self, conn, count):
+        self._pending_writes += count
+        if self._pending_writes >= COMMIT_BATCH:
+            conn.commit()
+            self._pending_writes = 0
+
+    def _sync_dir(self, conn, dir_path, force=False):
+        """
+        让数据库中 dir_path 的直接子项与磁盘一致，返回需要继续遍历的子目录。
+        目录的 mtime 没有变化时 (且不是 force) 不重新列出，直接从数据库读取子目录。
+        """
+        parent = str(dir_path)
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            self._delete_subtree(conn, dir_path)
+            return []
+        self._watch(dir_path)
+
+        row = conn.execute("SELECT mtime_ns FROM dirs WHERE path = ?", (parent,)).fetchone()
+        if not force and row is not None and row[0] == mtime_ns:
+            names = conn.execute("SELECT name FROM files WHERE parent = ? AND is_dir = 1", (parent,)).fetchall()
+            return [dir_path / name for (name,) in names if name not in SKIP_DIR_NAMES]
+
+        on_disk = {}
+        try:
+            with os.scandir(dir_path) as iterator:
+                for entry in iterator:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    on_disk[entry.name] = (int(is_dir), stat.st_size, stat.st_mtime)
+        except OSError:
+            return []
+
+        in_db = {name: (is_dir, size, mtime) for name, is_dir, size, mtime in conn.execute(
+            "SELECT name, is_dir, size, mtime FROM files WHERE parent = ?", (parent,))}
+
+        removed = [name for name in in_db if name not in on_disk]
+        for name in removed:
+            conn.execute("DELETE FROM files WHERE parent = ? AND name = ?", (parent, name))
+            if in_db[name][0]:
+                self._delete_subtree(conn, dir_path / name)
+        changed = [(parent, name) + values for name, values in on_disk.items() if in_db.get(name) != values]
+        conn.executemany(
+            "INSERT INTO files (parent, name, is_dir, size, mtime) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (parent, name) DO UPDATE SET is_dir = excluded.is_dir, size = excluded.size, mtime = excluded.mtime",
+            changed)
+        conn.execute("INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)", (parent, mtime_ns))
+        self._note_writes(conn, len(removed) + len(changed) + 1)
+
+        return [dir_path / name for name, (is_dir, _, _) in on_disk.items() if is_dir and name not in SKIP_DIR_NAMES]
+
+    def _delete_subtree(self, conn, dir_path):
+        """删除某个目录下的所有索引项 (目录被删除或移走时)。"""
+        # 用区分大小写的范围比较而不是 LIKE (LIKE 忽略 ASCII 大小写，会连 foo/ 下的索引项一起删除)，
+        # 同时可以使用 (parent, name) 和 dirs 主键上的索引
+        prefix = str(dir_path).rstrip(os.sep) + os.sep
+        params = (str(dir_path), prefix, prefix + '\U0010ffff')
+        conn.execute("DELETE FROM files WHERE parent = ? OR (parent >= ? AND parent < ?)", params)
+        conn.execute("DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", params)
+        if self._watcher is not None:
+            self._watcher.unwatch(dir_path)
+        self._note_writes(conn, 1)
+
+    # --- 搜索 ---
+
+    def search(self, query, limit=MAX_RESULTS):
+        """
+        按文件名搜索，不区分大小写。
+            "abc*"          前缀匹配 (使用 name 索引)
+            "*.py", "a?c"   glob 匹配
+            其他             子串匹配 (使用 trigram 全文索引)
+
+        返回:
+            list[SearchResult]: 名称较短 (更接近查询) 的结果在前。
+        """
+        query = query.strip()
+        if not query:
+            return []
+        try:
+            conn = sqlite3.connect(str(self.db_path), timeout=10)
+        except (OSError, sqlite3.Error) as e:
+            print(f"文件搜索: 无法打开索引数据库: {e}")
+            return []
+        try:
+            has_fts = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'files_fts'").fetchone() is not None
+            sql, params = self._build_query(query, has_fts)
+            rows = conn.execute(sql + " ORDER BY length(f.name), f.name LIMIT ?", params + [limit]).fetchall()
+        except sqlite3.Error as e:
+            print(f"文件搜索: 查询失败: {e}")
+            return []
+        finally:
+            conn.close()
+        return [SearchResult(Path(parent) / name, bool(is_dir), size, mtime) for parent, name, is_dir, size, mtime in rows]
+
+    @staticmethod
+    def _build_query(query, has_fts):
+        select = "SELECT f.parent, f.name, f.is_dir, f.size, f.mtime FROM files f"
+        fts_join = " JOIN files_fts ON files_fts.rowid = f.id"
+        is_glob = any(char in query for char in '*?[')
+
+        if is_glob and query.endswith('*') and not any(char in query[:-1] for char in '*?['):
+            # 前缀: 用 NOCASE 排序规则下的范围查询，可以使用 files_name 索引
+            # (带 ESCAPE 的 LIKE 不会使用索引)。U+10FFFF 大于任何文件名中的字符
+            prefix = query[:-1]
+            return (select + " WHERE f.name COLLATE NOCASE >= ? AND f.name COLLATE NOCASE < ?",
+                    [prefix, prefix + '\U0010ffff'])
+        if is_glob:
+            sql, params = select, []
+            literal = _longest_literal(query)
+            if has_fts and len(literal) >= 3:
+                # 先用全文索引找出包含最长普通片段的文件名，再做 glob 匹配
+                sql += fts_join + " WHERE files_fts MATCH ? AND"
+                params.append('"' + literal.replace('"', '""') + '"')
+            else:
+                sql += " WHERE"
+            return sql + " lower(f.name) GLOB ?", params + [query.lower()]
+        if has_fts and len(query) >= 3:
+            return select + fts_join + " WHERE files_fts MATCH ?", ['"' + query.replace('"', '""') + '"']
+        # trigram 索引不能匹配少于 3 个字符的查询
+        return select + " WHERE f.name LIKE ? ESCAPE '\\'", ['%' + _escape_like(query) + '%']
@@ -0,0 +1,199 @@
+import os
+import sys
+import math
+import queue
+import struct
+import hashlib
+import tempfile
+import importlib.util
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+# freedesktop 缩略图规范中 "normal" 尺寸的最大边长
+NORMAL_THUMBNAIL_SIZE = 128
+# 列表中显示的缩略图最大边长 (与 16px 图标一致)
+ROW_THUMBNAIL_SIZE = 16
+# 内存中最多保留的 PhotoImage 数量
+THUMBNAIL_LRU_SIZE = 256
+THUMBNAIL_WORKERS = 2
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def thumbnail_dir():
+    """
+    返回 freedesktop 共享缩略图目录 ($XDG_CACHE_HOME/thumbnails/normal)，
+    与其他文件管理器共用同一份缩略图。非 Linux 平台使用本应用的缓存目录。
+    """
+    if sys.platform.startswith('linux'):
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return Path(cache_home) / 'thumbnails' / 'normal'
+    from system.platformdirs_pack import get_cache_path
+    return get_cache_path('thumbnails') / 'normal'
+
+
+def _read_png_text(path):
+    """读取 PNG 中 IDAT 之前的 tEXt 块 (不需要 PIL)。"""
+    text = {}
+    with open(path, 'rb') as f:
+        if f.read(8) != _PNG_SIGNATURE:
+            return text
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, chunk_type = struct.unpack('>I4s', header)
+            if chunk_type in (b'IDAT', b'IEND'):
+                break
+            data = f.read(length)
+            f.seek(4, os.SEEK_CUR)  # CRC
+            if chunk_type == b'tEXt' and b'\0' in data:
+                key, value = data.split(b'\0', 1)
+                text[key.decode('latin-1')] = value.decode('latin-1')
+    return text
+
+
+def generate_thumbnail(source_path, mtime, thumb_dir):
+    """
+    在工作进程中运行: 确保 source_path 有最新的 freedesktop 缩略图，返回缩略图路径。
+
+    缩略图文件名为文件 URI 的 MD5，PNG 中记录 Thumb::URI 和 Thumb::MTime，
+    源文件修改时间不一致时重新生成。
+    """
+    uri = Path(source_path).absolute().as_uri()
+    thumb_path = Path(thumb_dir) / (hashlib.md5(uri.encode('utf-8')).hexdigest() + '.png')
+    try:
+        text = _read_png_text(thumb_path)
+        if text.get('Thumb::URI') == uri and text.get('Thumb::MTime') == str(int(mtime)):
+            return str(thumb_path)
+    except OSError:
+        pass
+
+    from PIL import Image, PngImagePlugin
+
+    with Image.open(source_path) as img:
+        # 对 JPEG 使用 draft() 让解码器直接按 1/2、1/4、1/8 缩小解码，大图可以快很多
+        img.draft('RGB', (NORMAL_THUMBNAIL_SIZE, NORMAL_THUMBNAIL_SIZE))
+        img.thumbnail((NORMAL_THUMBNAIL_SIZE, NORMAL_THUMBNAIL_SIZE))
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        info = PngImagePlugin.PngInfo()
+        info.add_text('Thumb::URI', uri)
+        info.add_text('Thumb::MTime', str(int(mtime)))
+        info.add_text('Software', 'RPD File Manager')
+
+        os.makedirs(thumb_dir, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=thumb_dir, suffix='.png')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                img.save(f, 'PNG', pnginfo=info)
+            # 规范要求缩略图只对所有者可读写
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, thumb_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    return str(thumb_path)
+
+
+def _create_executor():
+    """
+    Linux 上使用 fork 方式的进程池 (解码不占用 UI 进程的 GIL)。
+    不能用 spawn: 子进程会重新执行 app.py 的命令行分发。其他平台退回到线程池。
+    """
+    if sys.platform.startswith('linux'):
+        import multiprocessing
+        return ProcessPoolExecutor(max_workers=THUMBNAIL_WORKERS, mp_context=multiprocessing.get_context('fork'))
+    return ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+
+
+def _noop():
+    return None
+
+
+class Thumbnailer:
+    """
+    图片缩略图: 在进程池中生成 freedesktop 缩略图，UI 线程用 Tk 原生 PNG 支持读取并缩小到行高。
+    PhotoImage 保存在容量有限的 LRU 中，键为 (源文件路径, 修改时间)。
+    """
+
+    def __init__(self, max_photos=THUMBNAIL_LRU_SIZE):
+        self.max_photos = max_photos
+        self._thumb_dir = str(thumbnail_dir())
+        self._photos = OrderedDict()
+        self._pending = set()
+        self._failed = set()
+        self._completed = queue.Queue()
+        # 没有安装 Pillow 时不生成缩略图，继续显示普通图标
+        self.enabled = importlib.util.find_spec('PIL') is not None
+        self._executor = None
+        if self.enabled:
+            self._executor = _create_executor()
+            # fork 方式的进程池会在第一次提交时创建全部工作进程；
+            # 趁其他后台线程启动之前提交一个空任务，让 fork 发生在单线程状态下
+            self._executor.submit(_noop)
+
+    @property
+    def has_pending(self):
+        return bool(self._pending)
+
+    def get(self, path, mtime):
+        """返回已经加载的缩略图 PhotoImage，没有时返回 None。"""
+        key = (str(path), mtime)
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+        return photo
+
+    def request(self, items):
+        """为 [(路径, 修改时间), ...] 中还没有缩略图的图片计划生成缩略图。"""
+        if not self.enabled:
+            return
+        for path, mtime in items:
+            key = (str(path), mtime)
+            if key in self._photos or key in self._pending or key in self._failed:
+                continue
+            self._pending.add(key)
+            future = self._executor.submit(generate_thumbnail, key[0], mtime, self._thumb_dir)
+            future.add_done_callback(lambda f, key=key: self._completed.put((key, f)))
+
+    def poll(self):
+        """
+        在 UI 线程中调用: 加载已生成的缩略图。
+
+        返回:
+            (ready, evicted): 新加载的键列表，以及因 LRU 容量被移除的键列表。
+        """
+        ready, evicted = [], []
+        while True:
+            try:
+                key, future = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(key)
+            try:
+                photo = self._load_row_photo(future.result())
+            except Exception as e:
+                print(f"生成缩略图失败 {key[0]}: {e}")
+                self._failed.add(key)
+                continue
+            self._photos[key] = photo
+            ready.append(key)
+            while len(self._photos) > self.max_photos:
+                evicted.append(self._photos.popitem(last=False)[0])
+        return ready, evicted
+
+    @staticmethod
+    def _load_row_photo(thumb_path):
+        """读取 128px 缩略图并按整数倍缩小到不超过行高。"""
+        photo = tk.PhotoImage(file=thumb_path)
+        factor = math.ceil(max(photo.width(), photo.height()) / ROW_THUMBNAIL_SIZE)
+        return photo.subsample(factor) if factor > 1 else photo
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -8,7 +8,9 @@ class UIManager:
         self.master = master
         self.icon_references = icon_references
         self.path_var = tk.StringVar()
+        self.search_var = tk.StringVar()
         self.tree = None
+        self.v_scrollbar = None
         self._create_menu()
         self._create_widgets()
 
@@ -66,26 +68,36 @@ class UIManager:
 
     def _create_widgets(self):
         """创建文件列表视图。"""
-        path_entry = ttk.Entry(self.master, textvariable=self.path_var, state='readonly')
-        path_entry.pack(fill=tk.X, padx=5, pady=5)
+        top_frame = tk.Frame(self.master)
+        top_frame.pack(fill=tk.X, padx=5, pady=5)
+        path_entry = ttk.Entry(top_frame, textvariable=self.path_var, state='readonly')
+        path_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # 回车搜索，Esc 清空并回到当前目录
+        self.search_entry = ttk.Entry(top_frame, textvariable=self.search_var, width=24)
+        self.search_entry.pack(side=tk.RIGHT)
+        ttk.Label(top_frame, text="搜索:").pack(side=tk.RIGHT, padx=(10, 2))
         
         tree_frame = tk.Frame(self.master)
         tree_frame.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
         
-        self.tree = ttk.Treeview(tree_frame, columns=("modified", "size"), show="tree headings")
+        # "位置"列只在显示搜索结果时出现
+        self.tree = ttk.Treeview(tree_frame, columns=("modified", "size", "location"), displaycolumns=("modified", "size"), show="tree headings")
         self.tree.heading("#0", text="名称")
         self.tree.heading("modified", text="修改时间")
         self.tree.heading("size", text="大小")
+        self.tree.heading("location", text="位置")
 
         self.tree.column("#0", width=240, stretch=tk.NO)
         self.tree.column("modified", width=140, anchor="w")
         self.tree.column("size", width=80, anchor="e")
+        self.tree.column("location", width=220, anchor="w")
 
-        v_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
+        # 虚拟列表模式会接管这个滚动条
+        self.v_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.v_scrollbar.set)
         
         self.tree.grid(row=0, column=0, sticky="nsew")
-        v_scrollbar.grid(row=0, column=1, sticky="ns")
+        self.v_scrollbar.grid(row=0, column=1, sticky="ns")
         
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
@@ -97,11 +109,13 @@ class UIManager:
             self.file_menu.add_command(label="打开", command=commands['on_double_click'])
             self.file_menu.add_separator()
             self.file_menu.add_command(label="复制", command=commands['copy'])
+            self.file_menu.add_command(label="剪切", command=commands['cut'])
             self.file_menu.add_command(label="粘贴", command=commands['paste'])
             self.file_menu.add_command(label="查看属性", command=commands['properties'])
             self.file_menu.add_command(label="删除", command=commands['delete'])
             self.file_menu.add_separator()
             self.file_menu.add_command(label="新建文件夹", command=commands['new_folder'])
+            self.file_menu.add_command(label="文件操作进度", command=commands['operations'])
             
             self.sort_menu.add_command(label="按名称排序", command=commands['sort_name'])
             self.sort_menu.add_command(label="按种类排序", command=commands['sort_category'])
@@ -117,11 +131,13 @@ class UIManager:
             self.file_menu.add_command(label="打开", command=commands['on_double_click'])
             self.file_menu.add_separator()
             self.file_menu.add_command(label="复制", command=commands['copy'])
+            self.file_menu.add_command(label="剪切", command=commands['cut'])
             self.file_menu.add_command(label="粘贴", command=commands['paste'])
             self.file_menu.add_command(label="查看属性", command=commands['properties'])
             self.file_menu.add_command(label="删除", command=commands['delete'])
             self.file_menu.add_separator()
             self.file_menu.add_command(label="新建文件夹", command=commands['new_folder'])
+            self.file_menu.add_command(label="文件操作进度", command=commands['operations'])
             self.file_menu.add_separator()
             self.file_menu.add_command(label="系统信息", command=lambda: show_system_about(self.master))
             self.file_menu.add_command(label="关于开发者", command=lambda: show_developer_about(self.master))
@@ -138,23 +154,35 @@ class UIManager:
             self.refresh_btn.config(command=commands['refresh'])
 
         self.tree.bind("<Double-1>", commands['on_double_click'])
+        self.search_entry.bind("<Return>", lambda e: commands['search'](self.search_var.get()))
+        self.search_entry.bind("<Escape>", lambda e: (self.search_var.set(""), commands['search']("")))
         self._bind_hotkeys(commands)
 
     def _bind_hotkeys(self, commands):
         """绑定快捷键。"""
         if sys.platform == 'darwin':
-            self.master.bind_all('<Command-c>', lambda e: commands['copy']())
-            self.master.bind_all('<Command-v>', lambda e: commands['paste']())
-            self.master.bind_all('<Command-d>', lambda e: commands['delete']())
+            self.master.bind_all('<Command-c>', self._hotkey(commands['copy']))
+            self.master.bind_all('<Command-x>', self._hotkey(commands['cut']))
+            self.master.bind_all('<Command-v>', self._hotkey(commands['paste']))
+            self.master.bind_all('<Command-d>', self._hotkey(commands['delete']))
             self.master.bind_all('<Command-r>', lambda e: commands['refresh']())
             self.master.bind_all('<Command-Left>', lambda e: commands['go_back']())
             self.master.bind_all('<Command-Right>', lambda e: commands['go_forward']())
             self.master.bind_all('<Command-o>', lambda e: commands['on_double_click']())
         else:
-            self.master.bind_all('<Control-c>', lambda e: commands['copy']())
-            self.master.bind_all('<Control-v>', lambda e: commands['paste']())
-            self.master.bind_all('<Delete>', lambda e: commands['delete']())
+            self.master.bind_all('<Control-c>', self._hotkey(commands['copy']))
+            self.master.bind_all('<Control-x>', self._hotkey(commands['cut']))
+            self.master.bind_all('<Control-v>', self._hotkey(commands['paste']))
+            self.master.bind_all('<Delete>', self._hotkey(commands['delete']))
             self.master.bind_all('<F5>', lambda e: commands['refresh']())
             self.master.bind_all('<Alt-Left>', lambda e: commands['go_back']())
             self.master.bind_all('<Alt-Right>', lambda e: commands['go_forward']())
             self.master.bind_all('<Control-o>', lambda e: commands['on_double_click']())
+
+    def _hotkey(self, command):
+        """编辑类快捷键: 焦点在输入框 (例如搜索框) 中时交给输入框处理，不操作文件。"""
+        def callback(event):
+            if isinstance(event.widget, tk.Entry):
+                return
+            command()
+        return callback
@@ -0,0 +1,269 @@
+from tkinter import ttk
+
+# 目录项超过该数量时切换到虚拟列表模式
+VIRTUAL_LIST_THRESHOLD = 2000
+# 可见区域之外额外绑定的行数
+OVERSCAN_ROWS = 5
+# 超出数据末尾的行
+_BLANK_ROW = {'text': "", 'values': (), 'image': "", 'tags': ()}
+# 鼠标滚轮每次滚动的行数
+WHEEL_SCROLL_ROWS = 3
+
+
+class VirtualTreeView:
+    """
+    虚拟列表: 只为可见窗口 (加上少量 overscan) 创建固定数量的 Treeview 行，
+    滚动时重新绑定这些行的内容，而不是为每个目录项都插入一行。
+
+    数据保存在紧凑的条目表 category_entries (分类名称 -> [ScanEntry]) 中。
+    分类标题以普通行的形式显示，展开/折叠由 open_categories 记录。
+    显示的行 (self.rows) 依次为: 可选的 ".." 行、分类标题、展开分类下的目录项。
+    """
+
+    def __init__(self, tree, scrollbar, category_order, row_options, header_options, parent_row_options=None, on_render=None):
+        """
+        Args:
+            tree (ttk.Treeview): 要接管的 Treeview。
+            scrollbar (ttk.Scrollbar): Treeview 的垂直滚动条。
+            category_order (list): 分类的显示顺序。
+            row_options (callable): ScanEntry -> tree.item() 参数字典 (text, values, image, tags)。
+            header_options (callable): (分类名称, 数量, 是否展开) -> tree.item() 参数字典。
+            parent_row_options (dict): ".." 行的参数；为 None 表示没有上一级目录。
+            on_render (callable): 每次重新绑定可见行之后调用 (例如按需加载缩略图)。
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.category_order = category_order
+        self.row_options = row_options
+        self.header_options = header_options
+        self.parent_row_options = parent_row_options
+        self.on_render = on_render
+
+        self.category_entries = {}
+        self.open_categories = set()
+        self.rows = []
+        self.first = 0
+        self.slots = []
+        # 选中的行 (种类, 数据) 及其在 self.rows 中的位置；行重新生成后按选中的行重新查找位置
+        self.selected_row = None
+        self.selected_index = None
+        self._rows_dirty = True
+
+        style = ttk.Style(tree)
+        self.row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+
+        # 接管滚动: Treeview 自身始终停在顶部，由我们决定显示哪一段数据
+        self._saved_yscrollcommand = self.tree.cget('yscrollcommand')
+        self.tree.configure(yscrollcommand=lambda *args: None)
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self._bound_sequences = {
+            '<MouseWheel>': self._on_mousewheel,
+            '<Button-4>': lambda e: self.scroll_rows(-WHEEL_SCROLL_ROWS),
+            '<Button-5>': lambda e: self.scroll_rows(WHEEL_SCROLL_ROWS),
+            '<Up>': lambda e: self._move_selection(-1),
+            '<Down>': lambda e: self._move_selection(1),
+            '<Prior>': lambda e: self._move_selection(-self.visible_rows),
+            '<Next>': lambda e: self._move_selection(self.visible_rows),
+            '<Home>': lambda e: self._move_selection(-len(self.rows)),
+            '<End>': lambda e: self._move_selection(len(self.rows)),
+            '<Configure>': lambda e: self.render(),
+            '<<TreeviewSelect>>': self._on_select,
+        }
+        for sequence, handler in self._bound_sequences.items():
+            self.tree.bind(sequence, self._wrap(handler))
+
+    @staticmethod
+    def _wrap(handler):
+        def callback(event):
+            handler(event)
+            # 阻止 Treeview 的默认类绑定再次滚动/移动选择
+            return "break"
+        return callback
+
+    def detach(self):
+        """删除所有行并把滚动控制交还给 Treeview (切换到其他目录时调用)。"""
+        for sequence in self._bound_sequences:
+            self.tree.unbind(sequence)
+        if self.slots:
+            self.tree.delete(*self.slots)
+        self.slots = []
+        self.tree.configure(yscrollcommand=self._saved_yscrollcommand)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    # --- 数据 ---
+
+    def add_entries(self, category_name, entries):
+        self.category_entries.setdefault(category_name, []).extend(entries)
+        self._rows_dirty = True
+
+    def sort(self, key, reverse=False):
+        for entries in self.category_entries.values():
+            entries.sort(key=key, reverse=reverse)
+        self._rows_dirty = True
+
+    def restore_view(self, open_categories, top_fraction, is_selected):
+        """
+        恢复展开的分类、滚动位置 (占总行数的比例) 和选择 (第一个 is_selected(ScanEntry) 为真的目录项)，
+        用于目录自动刷新之后。
+        """
+        self.open_categories = set(open_categories)
+        self._rebuild_rows()
+        self.first = int(top_fraction * len(self.rows))
+        self._select(next((index for index, (kind, payload) in enumerate(self.rows)
+                           if kind == 'entry' and is_selected(payload)), None))
+        self.render()
+
+    def view_state(self):
+        """返回 (展开的分类, 滚动位置比例, 选中的目录项或 None)。"""
+        top = self.first / len(self.rows) if self.rows else 0.0
+        selected = None
+        if self.selected_row is not None and self.selected_row[0] == 'entry':
+            selected = self.selected_row[1]
+        return set(self.open_categories), top, selected
+
+    def entry_count(self):
+        return sum(len(entries) for entries in self.category_entries.values())
+
+    def visible_entries(self):
+        """返回当前窗口中绑定的所有目录项 (用于缩略图等按需加载)。"""
+        return [self.rows[index][1] for index in range(self.first, min(self.first + len(self.slots), len(self.rows)))
+                if self.rows[index][0] == 'entry']
+
+    def _rebuild_rows(self):
+        rows = []
+        if self.parent_row_options is not None:
+            rows.append(('parent', None))
+        for category_name in self.category_order:
+            entries = self.category_entries.get(category_name)
+            if not entries:
+                continue
+            rows.append(('header', category_name))
+            if category_name in self.open_categories:
+                rows.extend(('entry', entry) for entry in entries)
+        self.rows = rows
+        self._rows_dirty = False
+        # 展开/折叠上方的分类或重新排序后，选中的目录项位置会变化
+        try:
+            self.selected_index = rows.index(self.selected_row) if self.selected_row is not None else None
+        except ValueError:
+            # 选中的目录项所在的分类被折叠了
+            self.selected_row = self.selected_index = None
+
+    def _select(self, index):
+        self.selected_index = index
+        self.selected_row = self.rows[index] if index is not None else None
+
+    def toggle_category(self, slot_id):
+        """展开/折叠 slot_id 所在行的分类。"""
+        index = self._slot_to_index(slot_id)
+        if index is None or self.rows[index][0] != 'header':
+            return
+        category_name = self.rows[index][1]
+        if category_name in self.open_categories:
+            self.open_categories.discard(category_name)
+        else:
+            self.open_categories.add(category_name)
+        self._rows_dirty = True
+        self._select(index)
+        self.render()
+
+    # --- 渲染 ---
+
+    @property
+    def visible_rows(self):
+        # 减去表头的高度 (约一行)
+        return max(1, self.tree.winfo_height() // self.row_height - 1)
+
+    def _slot_to_index(self, slot_id):
+        if slot_id not in self.slots:
+            return None
+        index = self.first + self.slots.index(slot_id)
+        return index if index < len(self.rows) else None
+
+    def _options_for(self, row):
+        kind, payload = row
+        if kind == 'entry':
+            return self.row_options(payload)
+        if kind == 'header':
+            return self.header_options(payload, len(self.category_entries[payload]), payload in self.open_categories)
+        return self.parent_row_options
+
+    def render(self):
+        """根据 self.first 把数据绑定到固定数量的行上。"""
+        if self._rows_dirty:
+            self._rebuild_rows()
+
+        visible = self.visible_rows
+        slot_count = min(len(self.rows), visible + OVERSCAN_ROWS)
+        while len(self.slots) < slot_count:
+            self.slots.append(self.tree.insert("", "end", iid=f"vrow{len(self.slots)}", text=""))
+        while len(self.slots) > slot_count:
+            self.tree.delete(self.slots.pop())
+
+        # 滚动到底部时最后一行在窗口底部，窗口下方的预留行超出数据末尾，清空显示
+        self.first = max(0, min(self.first, len(self.rows) - visible))
+        for offset, slot_id in enumerate(self.slots):
+            index = self.first + offset
+            if index < len(self.rows):
+                self.tree.item(slot_id, **self._options_for(self.rows[index]))
+            else:
+                self.tree.item(slot_id, **_BLANK_ROW)
+        self.tree.yview_moveto(0)
+
+        if self.rows:
+            self.scrollbar.set(self.first / len(self.rows), min(1.0, (self.first + visible) / len(self.rows)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self._sync_selection()
+        if self.on_render is not None:
+            self.on_render()
+
+    def _sync_selection(self):
+        """把选中的数据行映射回当前窗口中的行；选中行滚出窗口时暂时清除 Treeview 的选择。"""
+        index = self.selected_index
+        if index is not None and self.first <= index < self.first + len(self.slots):
+            slot_id = self.slots[index - self.first]
+            if self.tree.selection() != (slot_id,):
+                self.tree.selection_set(slot_id)
+            self.tree.focus(slot_id)
+        elif self.tree.selection():
+            self.tree.selection_set(())
+
+    def scroll_rows(self, delta):
+        self.first += delta
+        self.render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            self.first += amount * (self.visible_rows if args[2] == 'pages' else 1)
+        self.render()
+
+    def _on_mousewheel(self, event):
+        # Windows 上 delta 为 120 的倍数，macOS 上为较小的整数
+        if abs(event.delta) >= 120:
+            self.scroll_rows(-(event.delta // 120) * WHEEL_SCROLL_ROWS)
+        else:
+            self.scroll_rows(-event.delta)
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            index = self._slot_to_index(selection[0])
+            if index is not None:
+                self._select(index)
+
+    def _move_selection(self, delta):
+        if not self.rows:
+            return
+        current = self.selected_index if self.selected_index is not None else self.first - 1
+        self._select(max(0, min(len(self.rows) - 1, current + delta)))
+        # 让选中行保持在可见区域内
+        visible = self.visible_rows
+        if self.selected_index < self.first:
+            self.first = self.selected_index
+        elif self.selected_index >= self.first + visible:
+            self.first = self.selected_index - visible + 1
+        self.render()
@@ -6,7 +6,7 @@ import subprocess
 from tkinter import messagebox
 from pathlib import Path
 import re 
-from urllib.parse import urlparse # 用于 URL 解析
+from urllib.parse import urlparse, urljoin # 用于 URL 解析
 import webbrowser # 用于打开 URL
 
 current_file_path = os.path.abspath(__file__)
@@ -35,11 +35,29 @@ except ImportError:
     print("警告: 未能导入 system.config 中的窗口尺寸，使用默认值 (480x320)。")
 
 # --- 网络和多线程依赖 ---
-import requests
-import feedparser
-import threading
+import queue
+import time
+from software.rss_reader.fetcher import FeedFetcher, sort_timeline
+from software.rss_reader.store import ArticleStore, article_key
+from software.rss_reader.html_text import html_to_rich_text
+from software.rss_reader.subscriptions import load_subscriptions, save_subscriptions, add_subscriptions
 # ----------------------------
 
+# 检查抓取结果的间隔 (毫秒)
+FETCH_POLL_MS = 100
+# 抓取过程中最多每隔多久重新显示一次时间线 (毫秒)，先完成的订阅源不必等最慢的那个
+TIMELINE_REFRESH_MS = 500
+# 分段显示文章: 每段最多占用 Tk 主线程 RENDER_SLICE_SECONDS 秒，段与段之间让出事件循环处理输入和重绘
+RENDER_SLICE_SECONDS = 0.015
+RENDER_CHUNK_DELAY_MS = 1
+# 每页的文章数，其余的点击 "显示更多" 后再显示
+RENDER_PAGE_SIZE = 100
+ALL_FEEDS_LABEL = "全部订阅"
+UNREAD_LABEL = "未读文章"
+STARRED_LABEL = "星标文章"
+# 订阅源之前的固定视图: (下拉框中的文字, 视图名称)
+SPECIAL_VIEWS = [(ALL_FEEDS_LABEL, None), (UNREAD_LABEL, 'unread'), (STARRED_LABEL, 'starred')]
+
 # ==============================================================================
 # RSS 阅读器主应用
 # ==============================================================================
@@ -57,9 +75,38 @@ class RSSReaderApp:
         y = (screen_height // 2) - (APP_HEIGHT // 2)
         self.master.geometry(f'+{x}+{y}')
         
-        # 用于管理后台线程
-        self.fetch_thread = None
-        self.rss_url = tk.StringVar(value="https://winddine.top/rss.xml") # 默认 URL
+        # 订阅列表保存在用户数据目录中；所有订阅源由 FeedFetcher 的线程池并发抓取
+        self.subscriptions = load_subscriptions()
+        self.fetcher = FeedFetcher()
+        # URL -> 最近一次的 FeedResult
+        self.feed_results = {}
+        # 文章保存在 SQLite 中 (含已读和星标状态)，启动时先显示上次保存的文章，不需要等待网络
+        self.store = ArticleStore()
+        # 键 (article_key) -> Article
+        self.articles, self.read_keys, self.starred_keys = self.store.load()
+        # 当前视图的文章、已经显示的数量和本页的结束位置；第 n 篇文章的文字带有 entry_<n> 标签
+        self._render_articles = []
+        self._render_position = 0
+        self._render_page_end = 0
+        self._chunk_after_id = None
+        # 刷新期间重新显示后要恢复的滚动位置: (文章序号或 None, 相对该文章开头的行数, 滚动比例)
+        self._scroll_anchor = None
+        # 展开了摘要的文章 (键)
+        self._expanded_keys = set()
+        # 摘要中的链接: href_<n> 标签 -> URL
+        self._summary_links = {}
+        self._fetch_remaining = 0
+        # 本次运行中下载的字节数，以及因条件请求 (304) 和缓存而节省的字节数
+        self.bytes_received = 0
+        self.bytes_saved = 0
+        self._round_sources = {}
+        self._poll_after_id = None
+        self._render_after_id = None
+        # 当前选中的订阅源 URL ("全部订阅" 等固定视图时为空)
+        self.rss_url = tk.StringVar(value="")
+        # 固定视图: None (全部订阅)、'unread' 或 'starred'
+        self._view = None
+        self.feed_choice = tk.StringVar(value=ALL_FEEDS_LABEL)
         
         # -------------------
         # 整合菜单功能
@@ -67,8 +114,12 @@ class RSSReaderApp:
         self.create_menu()
         
         self._setup_ui()
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        if self.articles:
+            self._update_header()
+            self._render_timeline()
         
-        # 立即加载默认 URL
+        # 立即刷新所有订阅源
         self.load_feed()
 
     # ==========================================================================
@@ -94,9 +145,11 @@ class RSSReaderApp:
         file_menu = tk.Menu(self.menubar, tearoff=0)
         self.menubar.add_cascade(label="文件", menu=file_menu)
         file_menu.add_command(label="刷新", command=self.load_feed)
+        file_menu.add_command(label="订阅管理", command=self._manage_subscriptions)
+        file_menu.add_command(label="全部标为已读", command=self._mark_all_read)
         file_menu.add_command(label="打开URL", command=self._open_current_feed_link)
         file_menu.add_separator()
-        file_menu.add_command(label="关闭", command=self.master.quit)
+        file_menu.add_command(label="关闭", command=self._on_close)
 
         # 关于菜单 (系统信息, 开发者信息)
         about_menu = tk.Menu(self.menubar, tearoff=0)
@@ -116,9 +169,11 @@ class RSSReaderApp:
         file_mb.pack(side=tk.LEFT, padx=5, pady=2)
         file_menu = tk.Menu(file_mb, tearoff=0)
         file_menu.add_command(label="刷新", command=self.load_feed)
+        file_menu.add_command(label="订阅管理", command=self._manage_subscriptions)
+        file_menu.add_command(label="全部标为已读", command=self._mark_all_read)
         file_menu.add_command(label="打开URL", command=self._open_current_feed_link)
         file_menu.add_separator()
-        file_menu.add_command(label="关闭", command=self.master.quit)
+        file_menu.add_command(label="关闭", command=self._on_close)
         file_mb.config(menu=file_menu)
         
         # 关于菜单按钮
@@ -129,7 +184,7 @@ class RSSReaderApp:
         about_menu.add_command(label="开发者信息", command=lambda:show_developer_about(self.master))
         about_mb.config(menu=about_menu)
 
-        quit_btn = tk.Button(top_bar_frame, text="X", command=self.master.quit, relief=tk.FLAT, bg="#f0f0f0", fg="red", activebackground="#e1e1e1")
+        quit_btn = tk.Button(top_bar_frame, text="X", command=self._on_close, relief=tk.FLAT, bg="#f0f0f0", fg="red", activebackground="#e1e1e1")
         quit_btn.pack(side=tk.RIGHT, padx=5, pady=2)
         
     def _sanitize_url(self, url):
@@ -156,7 +211,7 @@ class RSSReaderApp:
         """
         raw_url = self.rss_url.get()
         if not raw_url:
-             messagebox.showinfo("提示", "URL 栏为空，无法打开。")
+             messagebox.showinfo("提示", "请先在列表中选择一个订阅源。")
              return
              
         target_url = self._sanitize_url(raw_url)
@@ -181,34 +236,32 @@ class RSSReaderApp:
     # UI/逻辑功能 (移除图片相关内容)
     # ==========================================================================
 
-    def _extract_text_and_images(self, text):
+    def _rich_summary(self, article):
         """
-        [精简] 仅用于清理 HTML 标签并提取纯文本。
+        文章摘要的带样式文字片段。通常已经在抓取线程中转换好 (Article.content)，
+        旧缓存中的文章才在这里转换。
         """
-        # 1. 替换 <br> 或 <br /> 为换行符
-        text_with_newlines = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
-
-        # 2. 移除所有 HTML 标签
-        cleaned_text = re.sub(r'<[^>]+>', '', text_with_newlines)
-        
-        # 3. 清理结果：移除多余的空白行和首尾空格
-        # 返回一个空的 list 作为图片 URL，以匹配原来的方法签名（尽管现在不再使用）
-        return cleaned_text.strip(), []
+        if article.content is not None:
+            return article.content
+        return html_to_rich_text(article.summary)
 
     def _setup_ui(self):
         """配置应用程序界面，现在只有 URL 栏和文章文本区。"""
         # -------------------
-        # 1. URL 输入框架 (顶部)
+        # 1. 订阅源选择 (顶部): "全部订阅" 显示合并的时间线，也可以只看一个订阅源
         # -------------------
         url_frame = ttk.Frame(self.master, padding="5 5 5 2")
         url_frame.pack(fill='x')
         
-        ttk.Label(url_frame, text="URL:").pack(side='left', padx=(0, 5))
+        ttk.Label(url_frame, text="订阅:").pack(side='left', padx=(0, 5))
         
-        self.url_entry = ttk.Entry(url_frame, textvariable=self.rss_url)
-        self.url_entry.pack(side='left', fill='x', expand=True, padx=(0, 5))
+        self.feed_combo = ttk.Combobox(url_frame, textvariable=self.feed_choice, state='readonly')
+        self.feed_combo.pack(side='left', fill='x', expand=True, padx=(0, 5))
+        self.feed_combo.bind('<<ComboboxSelected>>', lambda event: self._on_feed_selected())
+        self._update_feed_choices()
         
         ttk.Button(url_frame, text="刷新", command=self.load_feed).pack(side='left')
+        ttk.Button(url_frame, text="管理", command=self._manage_subscriptions).pack(side='left', padx=(5, 0))
 
         # -------------------
         # 2. 标题和描述 (中间)
@@ -219,7 +272,7 @@ class RSSReaderApp:
         header_frame.grid_columnconfigure(1, weight=1) # 描述占位
 
         # 博客标题 (左侧)
-        self.title_label = ttk.Label(header_frame, text="博客标题: 正在加载...", 
+        self.title_label = ttk.Label(header_frame, text="时间线: 正在加载...", 
                                      font=('Arial', 10, 'bold'), wraplength=(APP_WIDTH // 2) - 10)
         self.title_label.grid(row=0, column=0, sticky='w')
 
@@ -264,7 +317,26 @@ class RSSReaderApp:
         # 配置标签 tag 来模拟链接
         self.content_text.tag_config('title', font=('Arial', 11, 'bold')) 
         self.content_text.tag_config('link', foreground='#0066cc', underline=1)
-        self.content_text.tag_bind('link', '<Button-1>', self._open_link)
+        # 已读文章的标题为灰色 (在 link 之后创建，优先级更高)
+        self.content_text.tag_config('read', foreground='#888888')
+        self.content_text.tag_config('star', foreground='#e6a700')
+        self.content_text.tag_config('more', foreground='#0066cc', underline=1, justify='center')
+        # 摘要的样式 (名称与 html_text.STYLE_ELEMENTS 对应)
+        self.content_text.tag_config('heading', font=('Arial', 10, 'bold'))
+        self.content_text.tag_config('bold', font=('Arial', 9, 'bold'))
+        self.content_text.tag_config('italic', font=('Arial', 9, 'italic'))
+        self.content_text.tag_config('code', font='TkFixedFont', background='#f0f0f0')
+        self.content_text.tag_config('pre', font='TkFixedFont', background='#f0f0f0', lmargin1=10, lmargin2=10)
+        self.content_text.tag_config('quote', foreground='#555555', lmargin1=15, lmargin2=15)
+        self.content_text.tag_config('summary_link', foreground='#0066cc', underline=1)
+        self.content_text.tag_bind('link', '<Button-1>', self._on_title_click)
+        self.content_text.tag_bind('star', '<Button-1>', self._on_star_click)
+        self.content_text.tag_bind('toggle', '<Button-1>', self._on_toggle_click)
+        self.content_text.tag_bind('more', '<Button-1>', lambda e: self._show_more())
+        self.content_text.tag_bind('summary_link', '<Button-1>', self._on_summary_link_click)
+        for tag in ('link', 'star', 'toggle', 'more', 'summary_link'):
+            self.content_text.tag_bind(tag, '<Enter>', lambda e: self.content_text.config(cursor='hand2'))
+            self.content_text.tag_bind(tag, '<Leave>', lambda e: self.content_text.config(cursor=''))
         
         # 初始化内容
         self.content_text.insert('1.0', "最新文章将显示在此处。请点击刷新按钮。")
@@ -279,128 +351,450 @@ class RSSReaderApp:
 
     def load_feed(self):
         """
-        加载并解析 RSS 订阅源，在后台线程中执行网络操作，以避免阻塞 UI。
+        刷新所有订阅源。抓取在 FeedFetcher 的线程池中并发进行，不会阻塞 UI；
+        仍在抓取中的订阅源不会重复加入。
         """
-        if self.fetch_thread and self.fetch_thread.is_alive():
-            messagebox.showinfo("提示", "正在加载中，请稍候...")
+        if not self.subscriptions:
+            self._clear_content(initial=False)
+            self.title_label.config(text="时间线: 没有订阅")
+            self.feed_desc_var.set("描述: 请在「管理」中添加订阅源")
             return
-
+        queued = self.fetcher.fetch_all([feed['url'] for feed in self.subscriptions])
+        self._fetch_remaining += queued
+        if not self.articles:
+            self._clear_content(initial=True) # 显示加载信息
+        self._update_header()
+        if self._poll_after_id is None:
+            self._poll_after_id = self.master.after(FETCH_POLL_MS, self._poll_fetch_results)
+
+    def _poll_fetch_results(self):
+        """在主线程中接收抓取结果，合并到时间线中。"""
+        self._poll_after_id = None
+        received = False
+        while True:
+            try:
+                result = self.fetcher.results.get_nowait()
+            except queue.Empty:
+                break
+            received = True
+            self._fetch_remaining -= 1
+            self._store_feed_result(result)
+        if received:
+            self._update_header()
+            if self._fetch_remaining <= 0:
+                self._render_timeline(keep_view=True)
+                self._report_round()
+                self._prune_store()
+            elif self._render_after_id is None:
+                self._render_after_id = self.master.after(TIMELINE_REFRESH_MS, self._render_timeline, True)
+        if self._fetch_remaining > 0:
+            self._poll_after_id = self.master.after(FETCH_POLL_MS, self._poll_fetch_results)
+
+    def _report_round(self):
+        """一轮刷新完成后在控制台打印流量统计。"""
+        sources, self._round_sources = self._round_sources, {}
+        print(f"RSS 刷新完成: 完整下载 {sources.get('network', 0)} 个，304 未修改 {sources.get('not_modified', 0)} 个，"
+              f"缓存有效 {sources.get('cache', 0)} 个；累计下载 {self.bytes_received / 1024:.0f} KB，"
+              f"节省 {self.bytes_saved / 1024:.0f} KB")
+
+    def _store_feed_result(self, result):
+        self.bytes_received += result.bytes_received
+        self.bytes_saved += result.bytes_saved
+        self._round_sources[result.source] = self._round_sources.get(result.source, 0) + 1
+        feed = self._subscription(result.url)
+        if feed is None:
+            # 抓取期间被取消订阅
+            return
+        if result.error and result.url in self.feed_results:
+            # 抓取失败时保留上一次成功的文章，只记录错误
+            self.feed_results[result.url] = self.feed_results[result.url]._replace(error=result.error)
+        else:
+            self.feed_results[result.url] = result
+            for article in result.articles:
+                self.articles[article_key(article)] = article
+            self.store.save(result.articles)
+        if result.title and feed['title'] != result.title:
+            feed['title'] = result.title
+            save_subscriptions(self.subscriptions)
+            self._update_feed_choices()
+
+    def _prune_store(self):
+        """执行数据库的保留策略；仍在订阅源中的文章不删除 (否则下次抓取时会重新作为未读文章出现)。"""
+        keep = [article_key(article) for result in self.feed_results.values() for article in result.articles]
+        self.store.prune([feed['url'] for feed in self.subscriptions], keep)
+
+    def _subscription(self, url):
+        return next((feed for feed in self.subscriptions if feed['url'] == url), None)
+
+    def _feed_label(self, feed):
+        return feed['title'] or feed['url']
+
+    def _update_feed_choices(self):
+        self.feed_combo['values'] = ([label for label, _ in SPECIAL_VIEWS] +
+                                     [self._feed_label(feed) for feed in self.subscriptions])
+        feed = self._selected_feed()
+        self.feed_choice.set(self._feed_label(feed) if feed else self._view_label())
+
+    def _view_label(self):
+        return next(label for label, view in SPECIAL_VIEWS if view == self._view)
+
+    def _selected_feed(self):
+        """返回当前选中的订阅 (字典)，选中固定视图 ("全部订阅" 等) 时返回 None。"""
         url = self.rss_url.get()
-        self.title_label.config(text=f"博客标题: 正在加载 '{url}'...")
-        self._clear_content(initial=True) # 显示加载信息
+        return self._subscription(url) if url else None
 
-        # 启动后台线程进行网络请求和解析
-        self.fetch_thread = threading.Thread(target=self._fetch_and_parse_feed, args=(url,))
-        self.fetch_thread.daemon = True
-        self.fetch_thread.start()
-
-    def _fetch_and_parse_feed(self, url):
-        """
-        在后台线程中执行网络请求和 RSS 解析。
-        """
-        result = {'success': False, 'error': None, 'feed': None}
-        
-        try:
-            # 1. 网络请求
-            headers = {'User-Agent': 'Tkinter_RSS_Reader/1.0'}
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # 2. RSS 解析
-            feed = feedparser.parse(response.content)
-            
-            if feed.bozo and not feed.entries:
-                if feed.bozo_exception:
-                    result['error'] = f"RSS 解析警告/错误: {feed.bozo_exception}"
-                if feed.entries:
-                    result['success'] = True
-                    result['feed'] = feed
-                else:
-                    result['error'] = "RSS 解析失败且未获取到任何文章。"
+    def _on_feed_selected(self):
+        index = self.feed_combo.current()
+        if 0 <= index < len(SPECIAL_VIEWS):
+            self._view = SPECIAL_VIEWS[index][1]
+            self.rss_url.set("")
+        else:
+            feed = self.subscriptions[index - len(SPECIAL_VIEWS)]
+            self._view = None
+            self.rss_url.set(feed['url'])
+        self._update_header()
+        self._render_timeline()
+
+    def _visible_articles(self):
+        """当前视图中的文章，按发布时间从新到旧排序。"""
+        feed = self._selected_feed()
+        if feed is not None:
+            articles = (article for article in self.articles.values() if article.feed_url == feed['url'])
+        elif self._view == 'unread':
+            articles = (article for key, article in self.articles.items() if key not in self.read_keys)
+        elif self._view == 'starred':
+            articles = (article for key, article in self.articles.items() if key in self.starred_keys)
+        else:
+            articles = self.articles.values()
+        return sort_timeline(articles)
+
+    def _update_header(self):
+        """标题栏显示当前视图，描述栏显示抓取进度和错误。"""
+        feed = self._selected_feed()
+        errors = [result for result in self.feed_results.values() if result.error]
+        if feed is None:
+            loaded = sum(1 for feed in self.subscriptions if feed['url'] in self.feed_results)
+            unread = sum(1 for key in self.articles if key not in self.read_keys)
+            if self._view is None:
+                self.title_label.config(text=f"时间线: {len(self.subscriptions)} 个订阅源")
             else:
-                result['success'] = True
-                result['feed'] = feed
-                
-        except requests.exceptions.Timeout as e:
-            result['error'] = f"网络请求超时 (10秒): {e}"
-        except requests.exceptions.ConnectionError as e:
-            result['error'] = f"无法连接到该 URL，请检查网络和 URL: {e}"
-        except requests.exceptions.RequestException as e:
-            result['error'] = f"网络请求失败: {e}"
-        except Exception as e:
-            result['error'] = f"未知错误: {e}"
-            
-        # 线程安全地调度 UI 更新
-        self.master.after(0, lambda: self._update_ui_with_data(result))
+                self.title_label.config(text=f"时间线: {self._view_label()}")
+            description = f"已加载 {loaded}/{len(self.subscriptions)}，未读 {unread} 篇"
+            if self._fetch_remaining > 0:
+                description += f"，正在抓取 {self._fetch_remaining} 个"
+            if errors:
+                description += f"，{len(errors)} 个失败"
+            if self.bytes_saved:
+                description += f"，缓存节省 {self.bytes_saved / 1024:.0f} KB"
+        else:
+            result = self.feed_results.get(feed['url'])
+            self.title_label.config(text=f"博客标题: {self._feed_label(feed)}")
+            if result is None:
+                description = "正在加载..."
+            elif result.error:
+                description = f"加载失败\n{result.error}"
+            else:
+                description = result.description or "无描述信息"
+        self.feed_desc_var.set(f"描述: {description}")
 
-    def _update_ui_with_data(self, result):
+    def _render_timeline(self, keep_view=False):
         """
-        在主线程中接收解析结果并更新 UI。(已移除图片处理逻辑)
+        重新显示当前视图的文章 (全部订阅的时间线、未读、星标或单个订阅源)，按发布时间排序。
+
+        文章由 _render_chunk 分段插入，每段之后用 after() 让出 Tk 主线程；
+        摘要默认折叠，点击 ▸ 展开时才转换和插入。
+        keep_view 为 True 时 (抓取期间的刷新) 保留已显示的页数，并让窗口顶部仍停在原来的文章上；
+        窗口在最顶部时不保留，新文章直接显示出来。
         """
+        # 直接调用时 (抓取完成、切换视图等) 取消已经计划的定时刷新，避免再完整显示一次
+        if self._render_after_id is not None:
+            self.master.after_cancel(self._render_after_id)
+            self._render_after_id = None
+        if self._chunk_after_id is not None:
+            self.master.after_cancel(self._chunk_after_id)
+            self._chunk_after_id = None
+        anchor_key, offset = None, 0
+        top_fraction = self.content_text.yview()[0]
+        if keep_view and top_fraction > 0:
+            anchor_key, offset = self._top_entry()
+        page_end = self._render_page_end if keep_view else 0
+        self._render_articles = self._visible_articles()
+        self._render_position = 0
+        self._summary_links = {}
+        self._scroll_anchor = None
+        if keep_view and top_fraction > 0:
+            n = next((n for n, article in enumerate(self._render_articles) if article_key(article) == anchor_key), None)
+            self._scroll_anchor = (n, offset, top_fraction)
+            if n is not None:
+                page_end = max(page_end, n + 1)
+        self._render_page_end = max(RENDER_PAGE_SIZE, page_end)
         
-        self._clear_content(initial=False) 
-        
-        if not result['success']:
-            # 处理错误情况
-            error_message = result.get('error', '加载失败，无详细错误信息。')
-            self.title_label.config(text="博客标题: 错误")
-            self.feed_desc_var.set(f"描述: 加载失败\n{error_message}")
-            return
-            
-        feed = result['feed']
-        
-        # 1. 更新标题和描述
-        feed_title = feed.feed.get('title', '未知标题')
-        feed_description = feed.feed.get('subtitle', feed.feed.get('description', '无描述信息'))
-        
-        self.title_label.config(text=f"博客标题: {feed_title}")
-        self.feed_desc_var.set(f"描述: {feed_description}") 
-
-        # 2. 插入文章内容
         self.content_text.config(state='normal')
+        self.content_text.delete('1.0', tk.END)
         
-        if not feed.entries:
-            self.content_text.insert('1.0', "此订阅源加载成功，但目前没有文章内容。")
-        
-        for entry_index, entry in enumerate(feed.entries):
-            # --- 1. 获取文章信息和摘要 ---
-            title = entry.get('title', '无标题')
-            published = entry.get('published', entry.get('updated', '无日期'))
-            link = entry.get('link', '#')
-            author = entry.get('author', '未知作者') 
-            category_list = entry.get('tags', [])
-            category = category_list[0]['term'] if category_list else entry.get('category', '无分类')
-            
-            if entry.get('content') and isinstance(entry['content'], list) and entry['content'][0].get('value'):
-                summary = entry['content'][0]['value']
+        if not self._render_articles:
+            if self._fetch_remaining > 0:
+                self.content_text.insert('1.0', "正在从互联网加载 RSS 订阅源...")
+            elif self._view == 'unread':
+                self.content_text.insert('1.0', "没有未读文章。")
+            elif self._view == 'starred':
+                self.content_text.insert('1.0', "没有星标文章。点击文章标题前的 ☆ 可以加上星标。")
             else:
-                summary = entry.get('summary', entry.get('description', '无摘要'))
-                
-            # 从 HTML 摘要中提取纯文本 (图片 URL 自动被忽略)
-            summary_cleaned, _ = self._extract_text_and_images(summary)
-            
-            # --- 2. 插入内容，创建新排版 ---
-            
-            # 插入标题 (包含链接 tag)
-            start_index = self.content_text.index(tk.END)
-            self.content_text.insert(tk.END, title, 'title') 
-            end_index_of_title = self.content_text.index(tk.END)
-            self.content_text.tag_add('link', start_index, end_index_of_title)
-            # 注意：这里仍然使用 webbrowser 打开文章的链接
-            self.content_text.tag_bind('link', '<Button-1>', lambda e, url=link: self._open_link(e, url))
-            self.content_text.insert(tk.END, "\n")
-
-            # 插入元数据
-            metadata_line = f"作者: {author} | 分类: {category} | 发布时间: {published}\n"
-            self.content_text.insert(tk.END, metadata_line)
-            
-            # 插入摘要 (只插入纯文本)
-            self.content_text.insert(tk.END, f"\n摘要:\n{summary_cleaned}\n")
+                self.content_text.insert('1.0', "订阅源加载完成，但目前没有文章内容。")
+        self.content_text.config(state='disabled')
+        # 第一段直接显示，不等待下一次事件循环
+        self._render_chunk()
+
+    def _render_chunk(self):
+        """插入下一段文章，直到用完时间片或到达本页末尾。"""
+        self._chunk_after_id = None
+        deadline = time.perf_counter() + RENDER_SLICE_SECONDS
+        end = min(self._render_page_end, len(self._render_articles))
+        show_source = self._selected_feed() is None
+        self.content_text.config(state='normal')
+        while self._render_position < end:
+            self._insert_entry(self._render_position, self._render_articles[self._render_position], show_source)
+            self._render_position += 1
+            if time.perf_counter() >= deadline:
+                break
+        if self._render_position >= end and end < len(self._render_articles):
+            remaining = len(self._render_articles) - end
+            self.content_text.insert(tk.END, f"显示更多 (还有 {remaining} 篇)\n", 'more')
+        self.content_text.config(state='disabled')
+        if self._scroll_anchor is not None:
+            self._restore_scroll(self._render_position >= end)
+        if self._render_position < end:
+            self._chunk_after_id = self.master.after(RENDER_CHUNK_DELAY_MS, self._render_chunk)
+
+    def _top_entry(self):
+        """返回窗口顶部所在文章的 (键, 顶部相对文章开头的行数)；顶部不在文章上时返回 (None, 0)。"""
+        top = self.content_text.index('@0,0')
+        # 顶部可能在文章之间的分隔符上，向上找最近的文章
+        for back in range(4):
+            for tag in self.content_text.tag_names(f"{top} - {back} lines"):
+                if tag.startswith('entry_'):
+                    n = int(tag[len('entry_'):])
+                    if n >= self._render_position:
+                        continue
+                    start = str(self.content_text.tag_ranges(tag)[0])
+                    return article_key(self._render_articles[n]), int(top.split('.')[0]) - int(start.split('.')[0])
+        return None, 0
+
+    def _restore_scroll(self, finished):
+        """锚点文章已经插入时滚动回原来的位置；找不到原来的文章时在本页显示完后按比例恢复。"""
+        n, offset, top_fraction = self._scroll_anchor
+        if n is not None and n < self._render_position:
+            self.content_text.yview(f"{self.content_text.tag_ranges(f'entry_{n}')[0]} + {offset} lines")
+        elif n is None and finished:
+            self.content_text.yview_moveto(top_fraction)
+        else:
+            return
+        self._scroll_anchor = None
+
+    def _show_more(self):
+        """显示下一页文章。"""
+        if self._chunk_after_id is not None:
+            return
+        more = self.content_text.tag_ranges('more')
+        if more:
+            self.content_text.config(state='normal')
+            self.content_text.delete(more[0], more[-1])
+            self.content_text.config(state='disabled')
+        self._render_page_end += RENDER_PAGE_SIZE
+        self._render_chunk()
+
+    def _insert_entry(self, n, article, show_source):
+        """在末尾插入一篇文章: 折叠按钮、星标、标题和元数据，摘要只在展开时插入。"""
+        key = article_key(article)
+        entry_tag = f"entry_{n}"
+        self.content_text.insert(tk.END, "▾" if key in self._expanded_keys else "▸", ('toggle', entry_tag),
+                                 " ", entry_tag,
+                                 "★" if key in self.starred_keys else "☆", ('star', entry_tag),
+                                 " ", entry_tag)
+        title_tags = ('title', 'link', 'read', entry_tag) if key in self.read_keys else ('title', 'link', entry_tag)
+        self.content_text.insert(tk.END, article.title, title_tags, "\n", entry_tag)
+
+        # 插入元数据 (时间线中还显示来自哪个订阅源)
+        source = f"来源: {article.feed_title} | " if show_source else ""
+        metadata_line = f"{source}作者: {article.author} | 分类: {article.category} | 发布时间: {article.published}\n"
+        self.content_text.insert(tk.END, metadata_line, entry_tag)
+        if key in self._expanded_keys:
+            self._insert_summary(entry_tag, article)
+
+        # 插入分隔符 (不属于文章)
+        self.content_text.insert(tk.END, "\n— — — — — — — — — — — — — — — — —\n\n")
+
+    def _insert_summary(self, entry_tag, article):
+        """在文章 (entry_tag) 的末尾插入带样式的摘要 (一次 insert 调用插入所有片段)。"""
+        chunks = ["\n摘要:\n", ('summary', entry_tag)]
+        for text, style, href in self._rich_summary(article):
+            tags = (*style, 'summary', entry_tag)
+            if href:
+                link_tag = f"href_{len(self._summary_links)}"
+                # 相对链接以文章地址为基准
+                self._summary_links[link_tag] = urljoin(article.link, href)
+                tags += ('summary_link', link_tag)
+            chunks += [text, tags]
+        chunks += ["\n", ('summary', entry_tag)]
+        self.content_text.insert(self.content_text.tag_ranges(entry_tag)[-1], *chunks)
+
+    def _on_summary_link_click(self, event):
+        index = self.content_text.index(f"@{event.x},{event.y}")
+        for tag in self.content_text.tag_names(index):
+            if tag in self._summary_links:
+                self._open_link(event, self._summary_links[tag])
+                return
 
-            # 插入分隔符
-            self.content_text.insert(tk.END, "\n— — — — — — — — — — — — — — — — —\n\n")
+    def _entry_at(self, event):
+        """返回点击位置所在文章的 (entry 标签, 键)，不在文章上时返回 None。"""
+        index = self.content_text.index(f"@{event.x},{event.y}")
+        for tag in self.content_text.tag_names(index):
+            if tag.startswith('entry_'):
+                n = int(tag[len('entry_'):])
+                if n < self._render_position:
+                    return tag, article_key(self._render_articles[n])
+        return None
+
+    def _on_title_click(self, event):
+        found = self._entry_at(event)
+        if found is None:
+            return
+        entry_tag, key = found
+        if key not in self.read_keys:
+            self.read_keys.add(key)
+            self.store.set_read([key])
+            first, last = self.content_text.tag_nextrange('title', self.content_text.tag_ranges(entry_tag)[0])
+            self.content_text.tag_add('read', first, last)
+            self._update_header()
+        self._open_link(event, self.articles[key].link)
+
+    def _on_star_click(self, event):
+        found = self._entry_at(event)
+        if found is None:
+            return
+        entry_tag, key = found
+        starred = key not in self.starred_keys
+        if starred:
+            self.starred_keys.add(key)
+        else:
+            self.starred_keys.discard(key)
+        self.store.set_starred(key, starred)
+        first, _ = self.content_text.tag_nextrange('star', self.content_text.tag_ranges(entry_tag)[0])
+        self.content_text.config(state='normal')
+        self.content_text.insert(first, "★" if starred else "☆", ('star', entry_tag))
+        self.content_text.delete(f"{first}+1c")
+        self.content_text.config(state='disabled')
 
+    def _on_toggle_click(self, event):
+        """展开或折叠文章的摘要。"""
+        found = self._entry_at(event)
+        if found is None:
+            return
+        entry_tag, key = found
+        entry_start, entry_end = self.content_text.tag_ranges(entry_tag)[0], self.content_text.tag_ranges(entry_tag)[-1]
+        toggle, _ = self.content_text.tag_nextrange('toggle', entry_start)
+        self.content_text.config(state='normal')
+        if key in self._expanded_keys:
+            self._expanded_keys.discard(key)
+            summary = self.content_text.tag_nextrange('summary', entry_start, entry_end)
+            if summary:
+                self.content_text.delete(*summary)
+            symbol = "▸"
+        else:
+            self._expanded_keys.add(key)
+            self._insert_summary(entry_tag, self.articles[key])
+            symbol = "▾"
+        self.content_text.insert(toggle, symbol, ('toggle', entry_tag))
+        self.content_text.delete(f"{toggle}+1c")
         self.content_text.config(state='disabled')
+
+    def _mark_all_read(self):
+        """把当前视图中的文章全部标为已读。"""
+        keys = [key for key in map(article_key, self._visible_articles()) if key not in self.read_keys]
+        if not keys:
+            return
+        self.read_keys.update(keys)
+        self.store.set_read(keys)
+        self._update_header()
+        self._render_timeline()
+
+    def _manage_subscriptions(self):
+        """订阅管理窗口: 一次粘贴多个 URL (每行一个) 添加订阅，或删除选中的订阅。"""
+        dialog = tk.Toplevel(self.master)
+        dialog.title("订阅管理")
+        dialog.transient(self.master)
+
+        list_frame = ttk.Frame(dialog, padding=5)
+        list_frame.pack(fill='both', expand=True)
+        listbox = tk.Listbox(list_frame, selectmode=tk.EXTENDED, height=8)
+        list_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=listbox.yview)
+        listbox.config(yscrollcommand=list_scrollbar.set)
+        list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        listbox.pack(side=tk.LEFT, fill='both', expand=True)
+
+        def refresh_list():
+            listbox.delete(0, tk.END)
+            for feed in self.subscriptions:
+                listbox.insert(tk.END, f"{feed['title']} - {feed['url']}" if feed['title'] else feed['url'])
+
+        def remove_selected():
+            indices = set(listbox.curselection())
+            if not indices:
+                return
+            removed = {self.subscriptions[index]['url'] for index in indices}
+            for url in removed:
+                self.feed_results.pop(url, None)
+            self.subscriptions[:] = [feed for i, feed in enumerate(self.subscriptions) if i not in indices]
+            save_subscriptions(self.subscriptions)
+            # 已取消订阅的文章从内存和数据库中删除 (星标文章保留)
+            for key, article in list(self.articles.items()):
+                if article.feed_url in removed and key not in self.starred_keys:
+                    del self.articles[key]
+            self._prune_store()
+            refresh_list()
+            self._after_subscriptions_changed()
+
+        def add_urls():
+            added, invalid = add_subscriptions(self.subscriptions, add_text.get('1.0', tk.END))
+            if invalid:
+                messagebox.showwarning("无效的 URL", "以下内容不是有效的 URL，已跳过:\n" + "\n".join(invalid[:10]), parent=dialog)
+            if added:
+                save_subscriptions(self.subscriptions)
+                refresh_list()
+                add_text.delete('1.0', tk.END)
+                self._after_subscriptions_changed()
+                # 只抓取新加入的订阅源
+                self._fetch_remaining += self.fetcher.fetch_all(added)
+                self._update_header()
+                if self._poll_after_id is None:
+                    self._poll_after_id = self.master.after(FETCH_POLL_MS, self._poll_fetch_results)
+
+        ttk.Button(dialog, text="删除所选", command=remove_selected).pack(fill='x', padx=5)
+        ttk.Label(dialog, text="添加订阅 (每行一个 URL):").pack(anchor='w', padx=5, pady=(5, 0))
+        add_text = tk.Text(dialog, height=4, width=40)
+        add_text.pack(fill='x', padx=5)
+        ttk.Button(dialog, text="添加", command=add_urls).pack(fill='x', padx=5, pady=5)
+        refresh_list()
+
+    def _after_subscriptions_changed(self):
+        if self._selected_feed() is None:
+            # 选中的订阅源已被删除
+            self.rss_url.set("")
+        self._update_feed_choices()
+        self._update_header()
+        self._render_timeline()
+
+    def _on_close(self):
+        if self._poll_after_id is not None:
+            self.master.after_cancel(self._poll_after_id)
+        if self._chunk_after_id is not None:
+            self.master.after_cancel(self._chunk_after_id)
+        if self._render_after_id is not None:
+            self.master.after_cancel(self._render_after_id)
+        self.fetcher.close()
+        # 等待文章和已读状态写入数据库
+        self.store.close()
+        self.master.quit()
         
     def _clear_content(self, initial=False):
         """清空内容区域以便加载新数据。"""
@@ -432,7 +826,7 @@ class RSSReaderApp:
         # else: pass
 
 # ==============================================================================
-# 启动块 (被 rss_init.py 或 app.py 作为子进程启动时执行)
+# 启动块 (被 app.py 作为子进程启动，或直接运行时执行)
 # ==============================================================================
 
 if __name__ == '__main__':
@@ -0,0 +1,212 @@
+import time
+import queue
+import calendar
+import threading
+from collections import namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+import feedparser
+
+from .http_cache import FeedCache
+from .html_text import html_to_rich_text
+
+# 同时抓取的订阅源数量 (线程数)
+MAX_FETCH_WORKERS = 6
+# 同一主机同时进行的请求数量，避免同一网站的多个订阅源把它的连接占满
+MAX_PER_HOST = 2
+FETCH_TIMEOUT = 10
+USER_AGENT = 'Tkinter_RSS_Reader/1.0'
+
+# timestamp 为发布时间 (UTC 秒)，没有日期的文章为 None；summary 为原始 HTML；
+# content 为工作线程中由 summary 转换好的带样式文字片段 (见 html_text.html_to_rich_text)，
+# 旧版本的缓存和数据库中没有这一项，此时为 None
+Article = namedtuple('Article', ['feed_url', 'feed_title', 'guid', 'title', 'link', 'author',
+                                 'category', 'published', 'timestamp', 'summary', 'content'],
+                     defaults=(None,))
+# 抓取失败时 error 为错误信息，articles 为空列表；
+# source 为 'network' (下载了完整内容)、'not_modified' (服务器返回 304) 或 'cache' (缓存仍在有效期内，没有请求)；
+# bytes_saved 为因缓存而不需要下载的字节数
+FeedResult = namedtuple('FeedResult', ['url', 'title', 'description', 'articles', 'error', 'elapsed_ms',
+                                       'source', 'bytes_received', 'bytes_saved'])
+
+
+def _entry_timestamp(entry):
+    for key in ('published_parsed', 'updated_parsed'):
+        parsed = entry.get(key)
+        if parsed:
+            return calendar.timegm(parsed)
+    return None
+
+
+def parse_entry(feed_url, feed_title, entry):
+    """把 feedparser 的一篇文章转换为 Article (在抓取线程中调用，摘要的 HTML 也在这里转换)。"""
+    title = entry.get('title', '无标题')
+    link = entry.get('link', '#')
+    category_list = entry.get('tags', [])
+    category = category_list[0]['term'] if category_list else entry.get('category', '无分类')
+    if entry.get('content') and isinstance(entry['content'], list) and entry['content'][0].get('value'):
+        summary = entry['content'][0]['value']
+    else:
+        summary = entry.get('summary', entry.get('description', '无摘要'))
+    return Article(
+        feed_url=feed_url, feed_title=feed_title,
+        guid=entry.get('id') or link or title,
+        title=title, link=link,
+        author=entry.get('author', '未知作者'),
+        category=category,
+        published=entry.get('published', entry.get('updated', '无日期')),
+        timestamp=_entry_timestamp(entry),
+        summary=summary,
+        content=html_to_rich_text(summary),
+    )
+
+
+def _from_cache(url, entry, source, started):
+    """用缓存中已经解析好的文章构造结果 (JSON 中的片段为列表)；缓存格式不兼容时返回 None。"""
+    feed = entry.get('feed') or {}
+    try:
+        articles = [Article(**article) for article in feed.get('articles', [])]
+    except TypeError:
+        return None
+    return FeedResult(url, feed.get('title', ''), feed.get('description', ''), articles, None,
+                      (time.perf_counter() - started) * 1000, source, 0, entry.get('body_length', 0))
+
+
+def fetch_feed(session, url, cache=None):
+    """
+    在工作线程中下载并解析一个订阅源，不抛出异常。
+
+    有 cache 时先查缓存: 仍在有效期内 (Cache-Control / Expires / <ttl>) 直接使用缓存中的文章；
+    否则带上 If-None-Match / If-Modified-Since 发送条件请求，服务器返回 304 时同样使用缓存。
+
+    返回:
+        FeedResult
+    """
+    started = time.perf_counter()
+    entry = cache.get(url) if cache is not None else None
+    if FeedCache.is_fresh(entry):
+        result = _from_cache(url, entry, 'cache', started)
+        if result is not None:
+            return result
+        entry = None
+    title, description, articles, error, received = "", "", [], None, 0
+    try:
+        headers = FeedCache.validators(entry) if entry is not None else {}
+        response = session.get(url, timeout=FETCH_TIMEOUT, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            result = _from_cache(url, cache.revalidated(url, entry, response.headers), 'not_modified', started)
+            if result is not None:
+                return result
+            # 缓存无法使用: 不带条件头重新请求
+            response = session.get(url, timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        received = len(response.content)
+        feed = feedparser.parse(response.content)
+        if feed.bozo and not feed.entries:
+            error = f"RSS 解析失败且未获取到任何文章: {feed.bozo_exception}"
+        else:
+            title = feed.feed.get('title', '') or url
+            description = feed.feed.get('subtitle', feed.feed.get('description', ''))
+            articles = [parse_entry(url, title, item) for item in feed.entries]
+            if cache is not None:
+                cache.store(url, response.headers, received, feed.feed.get('ttl'), {
+                    'title': title, 'description': description,
+                    'articles': [article._asdict() for article in articles],
+                })
+    except requests.exceptions.Timeout as e:
+        error = f"网络请求超时 ({FETCH_TIMEOUT}秒): {e}"
+    except requests.exceptions.ConnectionError as e:
+        error = f"无法连接到该 URL，请检查网络和 URL: {e}"
+    except requests.exceptions.RequestException as e:
+        error = f"网络请求失败: {e}"
+    except Exception as e:
+        error = f"未知错误: {e}"
+    return FeedResult(url, title, description, articles, error, (time.perf_counter() - started) * 1000,
+                      'network', received, 0)
+
+
+def sort_timeline(articles):
+    """按发布时间从新到旧排序，没有日期的文章排在最后。"""
+    return sorted(articles, key=lambda article: (article.timestamp is None, -(article.timestamp or 0)))
+
+
+def merge_timeline(results):
+    """把各订阅源的文章合并为一条时间线 (排序同 sort_timeline)。"""
+    return sort_timeline(article for result in results if not result.error for article in result.articles)
+
+
+class FeedFetcher:
+    """
+    并发抓取多个订阅源。
+
+    最多 max_workers 个工作线程，同一主机同时最多 per_host 个请求 (其余的排队，
+    不会占用工作线程)。每个线程复用自己的 requests.Session (保持连接)，
+    请求经过 FeedCache (条件请求和 HTTP 缓存)。
+    结果按完成顺序放入 results 队列，由 Tk 主线程用 after() 轮询。
+    """
+
+    def __init__(self, max_workers=MAX_FETCH_WORKERS, per_host=MAX_PER_HOST, cache=None):
+        self.per_host = per_host
+        self.cache = cache if cache is not None else FeedCache()
+        self.results = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rss-fetch")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # 主机 -> 等待中的 URL；主机 -> 进行中的请求数
+        self._waiting = {}
+        self._active = {}
+        # 排队或正在抓取的 URL，重复刷新时不会再次加入
+        self._in_flight = set()
+
+    def fetch_all(self, urls):
+        """
+        开始抓取 urls (已经在抓取中的会被跳过)。
+
+        返回:
+            int: 本次实际加入队列的订阅源数量，results 中会相应地出现这么多个结果。
+        """
+        queued = 0
+        with self._lock:
+            for url in urls:
+                if url in self._in_flight:
+                    continue
+                self._in_flight.add(url)
+                self._waiting.setdefault(urlparse(url).netloc.lower(), deque()).append(url)
+                queued += 1
+            for host in list(self._waiting):
+                self._start_next(host)
+        return queued
+
+    def _start_next(self, host):
+        """在持有 _lock 时调用: 在主机的并发限制内提交等待中的请求。"""
+        waiting = self._waiting[host]
+        while waiting and self._active.get(host, 0) < self.per_host:
+            self._active[host] = self._active.get(host, 0) + 1
+            self._executor.submit(self._run, host, waiting.popleft())
+        if not waiting:
+            del self._waiting[host]
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            self._local.session = session
+        return session
+
+    def _run(self, host, url):
+        result = fetch_feed(self._session(), url, self.cache)
+        with self._lock:
+            self._in_flight.discard(url)
+            self._active[host] -= 1
+            if not self._active[host]:
+                del self._active[host]
+            if host in self._waiting:
+                self._start_next(host)
+        self.results.put(result)
+
+    def close(self):
+        """取消排队中的请求 (正在进行的请求在超时内结束)。"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,219 @@
+import re
+from html.parser import HTMLParser
+
+# 内容会被整体丢弃的元素
+SKIP_ELEMENTS = {'script', 'style', 'head', 'title', 'noscript', 'template', 'iframe', 'svg', 'math', 'object'}
+# 前后各空一行的块级元素
+PARAGRAPH_ELEMENTS = {'p', 'blockquote', 'pre', 'ul', 'ol', 'dl', 'table', 'figure',
+                      'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr'}
+# 前后换行的块级元素
+LINE_ELEMENTS = {'div', 'section', 'article', 'header', 'footer', 'aside', 'nav', 'main', 'li',
+                 'dt', 'dd', 'tr', 'figcaption', 'caption', 'address', 'details', 'summary'}
+# 元素 -> 文字样式 (即 Text 控件的 tag 名称)
+STYLE_ELEMENTS = {
+    'h1': 'heading', 'h2': 'heading', 'h3': 'heading', 'h4': 'heading', 'h5': 'heading', 'h6': 'heading',
+    'b': 'bold', 'strong': 'bold', 'th': 'bold', 'dt': 'bold',
+    'i': 'italic', 'em': 'italic', 'cite': 'italic',
+    'code': 'code', 'kbd': 'code', 'samp': 'code', 'tt': 'code',
+    'pre': 'pre', 'blockquote': 'quote',
+}
+# 没有结束标签的元素
+VOID_ELEMENTS = {'br', 'hr', 'img', 'input', 'meta', 'link', 'area', 'base', 'col', 'embed', 'source', 'track', 'wbr'}
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class RichTextParser(HTMLParser):
+    """
+    把 HTML 流式地转换为带样式的文字片段。可以多次 feed() 分段输入，最后调用 close()。
+
+    片段为 (文字, 样式元组, 链接地址或 None)，样式为 STYLE_ELEMENTS 中的名称，
+    相邻的同样式片段会合并。实体由 HTMLParser 解码，script/style 等的内容被丢弃，
+    pre 以外的空白折叠为一个空格，段落之间最多空一行，列表项前加 "• " 或序号。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.segments = []
+        # 正在累积的片段: 文字列表和 (样式, 链接)
+        self._parts = []
+        self._key = None
+        self._styles = {}
+        self._style = ()
+        self._links = []
+        self._skip_depth = 0
+        # 列表栈: 有序列表为下一个序号，无序列表为 None
+        self._lists = []
+        # 输出末尾连续的换行数 (开头视为已经换行)，以及末尾是否为空白
+        self._newlines = 2
+        self._space = True
+
+    # --- 输出 ---
+
+    def _emit(self, text):
+        key = (self._style, self._links[-1] if self._links else None)
+        if key != self._key:
+            self._flush()
+            self._key = key
+        self._parts.append(text)
+        stripped = text.rstrip('\n')
+        if stripped:
+            self._newlines = len(text) - len(stripped)
+        else:
+            self._newlines += len(text)
+        self._space = text[-1].isspace()
+
+    def _flush(self):
+        if self._parts:
+            self.segments.append(("".join(self._parts), *self._key))
+            self._parts = []
+
+    def _set_style(self, name, delta):
+        self._styles[name] = max(0, self._styles.get(name, 0) + delta)
+        self._style = tuple(sorted(name for name, depth in self._styles.items() if depth))
+
+    def _break(self, count):
+        """保证输出末尾至少有 count 个换行 (开头不换行)。"""
+        if self._newlines < count:
+            self._emit_plain("\n" * (count - self._newlines))
+
+    def _emit_plain(self, text):
+        # 换行不带样式和链接，避免下划线和背景延伸到行尾
+        style, links = self._style, self._links
+        self._style, self._links = (), []
+        self._emit(text)
+        self._style, self._links = style, links
+
+    # --- HTMLParser 回调 ---
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_ELEMENTS:
+            if tag not in VOID_ELEMENTS:
+                self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if tag == 'br':
+            self._emit_plain("\n")
+            return
+        if tag in ('ul', 'ol') and self._lists:
+            # 嵌套列表不空行
+            self._break(1)
+        elif tag in PARAGRAPH_ELEMENTS:
+            self._break(2)
+        elif tag in LINE_ELEMENTS:
+            self._break(1)
+        if tag in ('td', 'th') and not self._space:
+            self._emit(" ")
+        if tag in STYLE_ELEMENTS:
+            self._set_style(STYLE_ELEMENTS[tag], 1)
+        if tag == 'a':
+            self._links.append(dict(attrs).get('href') or None)
+        elif tag in ('ul', 'ol'):
+            self._lists.append(1 if tag == 'ol' else None)
+        elif tag == 'li':
+            indent = "  " * max(0, len(self._lists) - 1)
+            number = self._lists[-1] if self._lists else None
+            if number is None:
+                self._emit(f"{indent}• ")
+            else:
+                self._emit(f"{indent}{number}. ")
+                self._lists[-1] += 1
+        elif tag == 'img':
+            alt = (dict(attrs).get('alt') or "").strip()
+            if alt:
+                self.handle_data(f"[图片: {alt}]")
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_ELEMENTS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag in STYLE_ELEMENTS:
+            self._set_style(STYLE_ELEMENTS[tag], -1)
+        if tag == 'a' and self._links:
+            self._links.pop()
+        elif tag in ('ul', 'ol') and self._lists:
+            self._lists.pop()
+            if self._lists:
+                self._break(1)
+                return
+        if tag in PARAGRAPH_ELEMENTS:
+            self._break(2)
+        elif tag in LINE_ELEMENTS:
+            self._break(1)
+
+    def handle_data(self, data):
+        if self._skip_depth or not data:
+            return
+        if 'pre' in self._style:
+            self._emit(data)
+            return
+        text = _WHITESPACE_RE.sub(" ", data)
+        if self._space or self._newlines:
+            text = text.lstrip(" ")
+        if text:
+            self._emit(text)
+
+    def close(self):
+        super().close()
+        self._flush()
+        # 去掉末尾的空白
+        while self.segments:
+            text, style, href = self.segments[-1]
+            text = text.rstrip()
+            if text:
+                self.segments[-1] = (text, style, href)
+                break
+            self.segments.pop()
+
+
+def html_to_rich_text(html):
+    """
+    把 HTML 转换为带样式的文字片段列表 (见 RichTextParser)。
+
+    返回:
+        list: [(文字, 样式元组, 链接地址或 None), ...]
+    """
+    parser = RichTextParser()
+    parser.feed(html or "")
+    parser.close()
+    return parser.segments
+
+
+if __name__ == '__main__':
+    # 与原来的正则表达式去标签方式比较速度: python -m software.rss_reader.html_text [HTML 文件...]
+    import sys
+    import time
+
+    def regex_strip(text):
+        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+        return re.sub(r'<[^>]+>', '', text).strip()
+
+    if len(sys.argv) > 1:
+        samples = []
+        for path in sys.argv[1:]:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                samples.append(f.read())
+    else:
+        article = ("<h2>标题 &amp; 副标题</h2><p>这是一段<strong>加粗</strong>和<em>强调</em>的文字，"
+                   "带有<a href='https://example.com/a'>链接</a>和 <code>inline_code()</code>。</p>"
+                   "<ul><li>第一项</li><li>第二项 <b>重点</b></li></ul>"
+                   "<pre>def main():\n    return 0\n</pre><script>var x = 1;</script>"
+                   "<blockquote><p>引用的段落 &lt;原文&gt;</p></blockquote><img src='a.png' alt='示意图'>")
+        # 500 篇文章，每篇约 16 KB 的内容
+        samples = [article * 40] * 500
+    total_kb = sum(len(sample.encode('utf-8')) for sample in samples) / 1024
+    for name, convert in (("正则表达式", regex_strip), ("html.parser", html_to_rich_text)):
+        started = time.perf_counter()
+        for sample in samples:
+            convert(sample)
+        elapsed = time.perf_counter() - started
+        print(f"{name}: {len(samples)} 篇 / {total_kb:.0f} KB, {elapsed * 1000:.0f} ms "
+              f"({elapsed * 1000 / len(samples):.2f} ms/篇)")
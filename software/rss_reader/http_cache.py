@@ -0,0 +1,145 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+
+CACHE_SUBDIR = "rss_feeds"
+# 缓存的最长有效期 (秒)，即使服务器的 max-age 或订阅源的 <ttl> 更长
+MAX_FRESHNESS_SECONDS = 24 * 3600
+
+_MAX_AGE_RE = re.compile(r'max-age\s*=\s*"?(\d+)', re.IGNORECASE)
+
+
+def freshness_seconds(headers, feed_ttl=None, now=None):
+    """
+    根据响应头和订阅源的 <ttl> (分钟) 计算缓存在多少秒内不需要再请求。
+
+    依次使用 Cache-Control 的 max-age、Expires，再与 <ttl> 取较大值；
+    no-cache / no-store 时为 0 (每次都用条件请求验证)。
+    """
+    now = time.time() if now is None else now
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-cache' in cache_control or 'no-store' in cache_control:
+        return 0
+    seconds = 0
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        seconds = int(match.group(1))
+    elif headers.get('Expires'):
+        try:
+            seconds = parsedate_to_datetime(headers['Expires']).timestamp() - now
+        except (TypeError, ValueError, IndexError):
+            seconds = 0
+    try:
+        seconds = max(seconds, int(feed_ttl) * 60) if feed_ttl else seconds
+    except (TypeError, ValueError):
+        pass
+    return max(0, min(seconds, MAX_FRESHNESS_SECONDS))
+
+
+class FeedCache:
+    """
+    订阅源的 HTTP 缓存，位于用户缓存目录的 rss_feeds 下，每个订阅源一个 JSON 文件 (文件名为 URL 的 SHA-1)。
+
+    条目内容: ETag、Last-Modified、有效期、响应体大小，以及已经解析好的订阅源标题、描述和文章，
+    因此服务器返回 304 或缓存仍在有效期内时，既不需要下载也不需要重新解析。
+    """
+
+    def __init__(self, directory=None):
+        self._directory = directory
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        if self._directory is None:
+            from system.platformdirs_pack import get_cache_path
+            self._directory = get_cache_path(CACHE_SUBDIR)
+        return self._directory
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+
+    def get(self, url):
+        """返回 url 的缓存条目 (字典)，没有时返回 None。"""
+        with self._lock:
+            if url in self._entries:
+                return self._entries[url]
+        try:
+            with open(self._path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ImportError, json.JSONDecodeError) as e:
+            print(f"读取订阅源缓存失败 ({url}): {e}")
+            entry = None
+        if entry is not None and entry.get('url') != url:
+            entry = None
+        with self._lock:
+            self._entries[url] = entry
+        return entry
+
+    @staticmethod
+    def is_fresh(entry, now=None):
+        return entry is not None and (time.time() if now is None else now) < entry.get('expires_at', 0)
+
+    @staticmethod
+    def validators(entry):
+        """条件请求头: If-None-Match / If-Modified-Since。"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, headers, body_length, feed_ttl, feed):
+        """
+        保存一次完整的响应。feed 为可以序列化为 JSON 的解析结果 (标题、描述、文章)。
+        响应头为 Cache-Control: no-store 时只删除旧条目。
+        """
+        if 'no-store' in headers.get('Cache-Control', '').lower():
+            self._write(url, None)
+            return
+        now = time.time()
+        entry = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'feed_ttl': feed_ttl,
+            'fetched_at': now,
+            'expires_at': now + freshness_seconds(headers, feed_ttl, now),
+            'body_length': body_length,
+            'feed': feed,
+        }
+        self._write(url, entry)
+
+    def revalidated(self, url, entry, headers):
+        """服务器返回 304: 更新有效期 (以及服务器可能发来的新 ETag)。"""
+        now = time.time()
+        entry = dict(entry)
+        entry['etag'] = headers.get('ETag') or entry.get('etag')
+        entry['last_modified'] = headers.get('Last-Modified') or entry.get('last_modified')
+        entry['fetched_at'] = now
+        entry['expires_at'] = now + freshness_seconds(headers, entry.get('feed_ttl'), now)
+        self._write(url, entry)
+        return entry
+
+    def _write(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+        try:
+            if entry is None:
+                os.unlink(self._path(url))
+            else:
+                from system.platformdirs_pack import atomic_write_text
+                atomic_write_text(self._path(url), json.dumps(entry, ensure_ascii=False))
+        except FileNotFoundError:
+            pass
+        except (OSError, ImportError) as e:
+            print(f"写入订阅源缓存失败 ({url}): {e}")
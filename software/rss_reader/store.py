@@ -0,0 +1,213 @@
+import json
+import time
+import queue
+import sqlite3
+import hashlib
+import threading
+
+from .fetcher import Article
+
+ARTICLES_DB_FILENAME = "rss_articles.sqlite3"
+# 保留策略: 超过 RETENTION_DAYS 天的文章、以及每个订阅源超出 MAX_ARTICLES_PER_FEED 篇的旧文章会被删除，
+# 星标文章始终保留
+RETENTION_DAYS = 60
+MAX_ARTICLES_PER_FEED = 200
+# 启动时最多载入的文章数 (按时间从新到旧)
+MAX_LOADED_ARTICLES = 2000
+
+_ARTICLE_COLUMNS = ", ".join(Article._fields)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS articles (
+    key TEXT PRIMARY KEY,
+    feed_url TEXT NOT NULL,
+    feed_title TEXT NOT NULL,
+    guid TEXT NOT NULL,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    author TEXT NOT NULL,
+    category TEXT NOT NULL,
+    published TEXT NOT NULL,
+    timestamp INTEGER,
+    summary TEXT NOT NULL,
+    content TEXT,
+    first_seen REAL NOT NULL,
+    is_read INTEGER NOT NULL DEFAULT 0,
+    starred INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS articles_feed_time ON articles (feed_url, timestamp);
+CREATE INDEX IF NOT EXISTS articles_time ON articles (timestamp);
+"""
+
+# 文章内容变化时才更新 (没有变化的行不会被重写)，已读和星标状态保持不变
+_UPSERT = f"""
+INSERT INTO articles (key, {_ARTICLE_COLUMNS}, first_seen) VALUES (?, {", ".join("?" * len(Article._fields))}, ?)
+ON CONFLICT (key) DO UPDATE SET
+    feed_title = excluded.feed_title, title = excluded.title, link = excluded.link,
+    author = excluded.author, category = excluded.category, published = excluded.published,
+    timestamp = excluded.timestamp, summary = excluded.summary, content = excluded.content
+WHERE title IS NOT excluded.title OR summary IS NOT excluded.summary OR timestamp IS NOT excluded.timestamp
+    OR feed_title IS NOT excluded.feed_title OR content IS NOT excluded.content
+"""
+
+
+def article_key(article):
+    """去重用的键: GUID (没有 GUID 时为链接) 的 SHA-1。同一篇文章出现在多个订阅源中时只保存一次。"""
+    return hashlib.sha1((article.guid or article.link).encode('utf-8')).hexdigest()
+
+
+def _to_row(article):
+    # content (带样式的文字片段) 以 JSON 保存
+    return (*article[:-1], None if article.content is None else json.dumps(article.content, ensure_ascii=False))
+
+
+def _from_row(fields):
+    content = fields[-1]
+    return Article(*fields[:-1], None if content is None else json.loads(content))
+
+
+def _default_db_path():
+    from system.platformdirs_pack import get_config_path
+    return get_config_path(ARTICLES_DB_FILENAME)
+
+
+class ArticleStore:
+    """
+    文章的 SQLite 存储 (用户数据目录中的 rss_articles.sqlite3)，包含已读和星标状态。
+
+    启动时 load() 在调用者的线程中直接读取，不需要等待网络；
+    写入 (保存文章、修改状态、清理) 交给后台线程按顺序执行，不会因为 SD 卡的 fsync 阻塞 UI。
+    """
+
+    def __init__(self, db_path=None):
+        self._db_path = db_path
+        self._writes = queue.Queue()
+        self._thread = None
+
+    @property
+    def db_path(self):
+        if self._db_path is None:
+            self._db_path = _default_db_path()
+        return self._db_path
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        # 只对新建的数据库生效: 清理后可以用 incremental_vacuum 把空闲页还给文件系统
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+        if 'content' not in columns:
+            # 旧版本创建的数据库
+            conn.execute("ALTER TABLE articles ADD COLUMN content TEXT")
+        return conn
+
+    def load(self, limit=MAX_LOADED_ARTICLES):
+        """
+        读取最近的文章。
+
+        返回:
+            (dict, set, set): 键 -> Article、已读文章的键、星标文章的键。数据库无法打开时均为空。
+        """
+        articles, read, starred = {}, set(), set()
+        try:
+            conn = self._connect()
+        except (OSError, ImportError, sqlite3.Error) as e:
+            print(f"RSS: 无法打开文章数据库: {e}")
+            return articles, read, starred
+        try:
+            # 星标文章不受数量限制
+            rows = conn.execute(
+                f"SELECT key, is_read, starred, {_ARTICLE_COLUMNS} FROM articles "
+                f"WHERE key IN (SELECT key FROM articles ORDER BY COALESCE(timestamp, first_seen) DESC LIMIT ?) "
+                f"OR starred = 1", (limit,))
+            for key, is_read, is_starred, *fields in rows:
+                articles[key] = _from_row(fields)
+                if is_read:
+                    read.add(key)
+                if is_starred:
+                    starred.add(key)
+        except (sqlite3.Error, ValueError) as e:
+            print(f"RSS: 读取文章数据库失败: {e}")
+        finally:
+            conn.close()
+        return articles, read, starred
+
+    # --- 写入 (后台线程) ---
+
+    def _submit(self, operation, *args):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run_writer, daemon=True)
+            self._thread.start()
+        self._writes.put((operation, args))
+
+    def _run_writer(self):
+        try:
+            conn = self._connect()
+        except (OSError, ImportError, sqlite3.Error) as e:
+            print(f"RSS: 无法打开文章数据库，文章不会被保存: {e}")
+            conn = None
+        while True:
+            operation, args = self._writes.get()
+            if operation is None:
+                break
+            if conn is None:
+                continue
+            try:
+                with conn:
+                    operation(conn, *args)
+            except sqlite3.Error as e:
+                print(f"RSS: 写入文章数据库失败: {e}")
+        if conn is not None:
+            conn.close()
+
+    def save(self, articles):
+        """保存 (或更新) 一批文章。"""
+        now = time.time()
+        rows = [(article_key(article), *_to_row(article), now) for article in articles]
+        if rows:
+            self._submit(lambda conn: conn.executemany(_UPSERT, rows))
+
+    def set_read(self, keys, is_read=True):
+        keys = [(int(is_read), key) for key in keys]
+        if keys:
+            self._submit(lambda conn: conn.executemany("UPDATE articles SET is_read = ? WHERE key = ?", keys))
+
+    def set_starred(self, key, starred):
+        self._submit(lambda conn: conn.execute("UPDATE articles SET starred = ? WHERE key = ?", (int(starred), key)))
+
+    def prune(self, feed_urls, keep_keys=(), retention_days=RETENTION_DAYS, per_feed=MAX_ARTICLES_PER_FEED):
+        """
+        执行保留策略: 删除已取消订阅的订阅源的文章、超过保留天数的文章，
+        以及每个订阅源超出数量上限的旧文章，然后归还空闲页。
+        星标文章和 keep_keys 中的文章 (仍在订阅源中的，删除后下次抓取又会作为未读文章出现) 不会被删除。
+        """
+        feed_urls = list(feed_urls)
+        keep_keys = [(key,) for key in keep_keys]
+
+        def run(conn):
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (key TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.keep")
+            conn.executemany("INSERT OR IGNORE INTO temp.keep (key) VALUES (?)", keep_keys)
+            removable = "starred = 0 AND key NOT IN (SELECT key FROM temp.keep)"
+            placeholders = ", ".join("?" * len(feed_urls))
+            conn.execute(f"DELETE FROM articles WHERE {removable} AND feed_url NOT IN ({placeholders})", feed_urls)
+            conn.execute(f"DELETE FROM articles WHERE {removable} AND COALESCE(timestamp, first_seen) < ?",
+                         (time.time() - retention_days * 86400,))
+            conn.execute(
+                f"DELETE FROM articles WHERE {removable} AND key IN ("
+                "SELECT key FROM (SELECT key, ROW_NUMBER() OVER "
+                "(PARTITION BY feed_url ORDER BY COALESCE(timestamp, first_seen) DESC) AS position FROM articles) "
+                "WHERE position > ?)", (per_feed,))
+
+        self._submit(run)
+        # 每一步释放一页，需要把结果读完
+        self._submit(lambda conn: conn.execute("PRAGMA incremental_vacuum").fetchall())
+
+    def close(self):
+        """等待已提交的写入完成。"""
+        if self._thread is not None:
+            self._writes.put((None, ()))
+            self._thread.join(timeout=5)
+            self._thread = None
@@ -0,0 +1,77 @@
+import json
+from urllib.parse import urlparse
+
+SUBSCRIPTIONS_FILENAME = "rss_subscriptions.json"
+# 第一次启动 (还没有订阅列表) 时的默认订阅
+DEFAULT_FEEDS = [{'url': "https://winddine.top/rss.xml", 'title': ""}]
+
+
+def normalize_url(url):
+    """去掉首尾空白，没有协议头时补上 https://；不像 URL 的内容返回空字符串。"""
+    url = url.strip()
+    if not url:
+        return ""
+    if not urlparse(url).scheme:
+        url = 'https://' + url
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+        return ""
+    return url
+
+
+def load_subscriptions():
+    """
+    读取用户数据目录下的订阅列表，格式为:
+        {"feeds": [{"url": "https://.../rss.xml", "title": "博客名称"}, ...]}
+    文件不存在时返回默认订阅。
+    """
+    try:
+        from system.platformdirs_pack import get_config_path
+        with open(get_config_path(SUBSCRIPTIONS_FILENAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return [dict(feed) for feed in DEFAULT_FEEDS]
+    except (ImportError, OSError, json.JSONDecodeError) as e:
+        print(f"警告: 无法加载订阅列表 {SUBSCRIPTIONS_FILENAME}: {e}")
+        return [dict(feed) for feed in DEFAULT_FEEDS]
+    feeds = data.get('feeds') if isinstance(data, dict) else None
+    if not isinstance(feeds, list):
+        print(f"警告: {SUBSCRIPTIONS_FILENAME} 中没有订阅列表，已忽略")
+        return [dict(feed) for feed in DEFAULT_FEEDS]
+    subscriptions, seen = [], set()
+    for feed in feeds:
+        url = normalize_url(feed.get('url', '')) if isinstance(feed, dict) else ""
+        if url and url not in seen:
+            seen.add(url)
+            subscriptions.append({'url': url, 'title': str(feed.get('title') or "")})
+    return subscriptions
+
+
+def save_subscriptions(subscriptions):
+    """原子地保存订阅列表。"""
+    try:
+        from system.platformdirs_pack import save_user_config
+    except ImportError as e:
+        print(f"警告: 无法保存订阅列表: {e}")
+        return
+    save_user_config({'feeds': subscriptions}, SUBSCRIPTIONS_FILENAME, indent=2)
+
+
+def add_subscriptions(subscriptions, text):
+    """
+    把 text 中的 URL (每行一个，也可以用空格分隔) 加入订阅列表，跳过重复和无效的行。
+
+    返回:
+        (list, list): 新加入的 URL 和无法识别的内容。
+    """
+    existing = {feed['url'] for feed in subscriptions}
+    added, invalid = [], []
+    for token in text.split():
+        url = normalize_url(token)
+        if not url:
+            invalid.append(token)
+        elif url not in existing:
+            existing.add(url)
+            subscriptions.append({'url': url, 'title': ""})
+            added.append(url)
+    return added, invalid
@@ -3,17 +3,20 @@ import threading
 from tkinter import messagebox
 import tkinter.colorchooser as colorchooser
 import platform
-import psutil
-from PIL import Image, ImageTk
 import os
 import sys 
+import time
 import traceback 
 import inspect
 from pathlib import Path
 import subprocess
 
+from system.app_supervisor import AppSupervisor
+from system.app_registry import get_app, launch_subprocess, resolve_args, forward_to_instance
+from system.lazy_import import lazy_callable
+
 # --- 辅助函数：启动独立应用 (支持类和函数两种入口) ---
-def start_sub_process_app(module_path: str, entry_name: str):
+def start_sub_process_app(module_path: str, entry_name: str, args=(), entry_kind=None):
     """
     【此函数在子进程中执行】
     通过动态导入并调用模块内的主类/函数来启动独立应用窗口。
@@ -22,6 +25,8 @@ def start_sub_process_app(module_path: str, entry_name: str):
     Args:
         module_path (str): 要导入的模块路径，例如 'software.deepseek_app'。
         entry_name (str): 模块内的主类或主启动函数的名称，例如 'App' 或 'create_pong_game'。
+        args (list): 命令行传入的额外参数，依次传给入口 (类入口排在 Tk 根窗口之后)。
+        entry_kind (str): 'runner' 表示入口类自行管理窗口，无参实例化后调用 run()。
     """
     try:
         # 1. 动态导入目标模块
@@ -32,15 +37,18 @@ def start_sub_process_app(module_path: str, entry_name: str):
         
         print(f"子进程启动模块: {module_path}")
         
-        if inspect.isclass(entry_point):
-            # 适用于标准的 Tkinter App 类 (e.g., CameraApp)
+        if entry_kind == 'runner':
+            # 适用于自行管理窗口的应用类 (e.g., CameraApp)
+            entry_point(*args).run()
+        elif inspect.isclass(entry_point):
+            # 适用于标准的 Tkinter App 类 (e.g., RSSReaderApp, FileManagerApp)
             app_root = tk.Tk()
             app_root.title(module_path.split('.')[-1].replace('_', ' ').title())
-            entry_point(app_root) 
+            entry_point(app_root, *args) 
             app_root.mainloop()
         elif callable(entry_point):
             # 适用于启动函数 (e.g., create_deepseek_ui, create_pong_game)
-            entry_point()
+            entry_point(*args)
         else:
              messagebox.showerror("启动失败", f"模块 {module_path} 中的入口 {entry_name} 既不是类也不是可执行函数。")
         
@@ -59,7 +67,7 @@ def start_sub_process_app(module_path: str, entry_name: str):
 
 
 class LogicHandler:
-    def __init__(self, app_instance, icon_manager, ui, app_launchers):
+    def __init__(self, app_instance, icon_manager, ui):
         self.app = app_instance
         self.icon_manager = icon_manager
         self.ui = ui
@@ -68,8 +76,11 @@ class LogicHandler:
         self.icons = {}
         self.developer_avatar_path = "icons/developer_avatar.png"
         
-        # 接收外部传入的启动函数字典
-        self.app_launchers = app_launchers
+        # 预热进程客户端 (由 DesktopApp 设置)，为 None 时总是新建子进程
+        self.zygote = None
+        # 跟踪已启动应用的子进程，实现单实例复用
+        self.supervisor = AppSupervisor()
+        self._schedule_reap()
 
     def edit_background_color(self):
         color_code = colorchooser.askcolor(title="选择桌面背景颜色")
@@ -89,43 +100,56 @@ class LogicHandler:
             self.open_reset()
 
     def get_command_for_icon(self, icon_id):
-        # 所有的 open_xxx 方法都委托给 _launch_app_thread
-        if icon_id == "terminal":
-            return self.open_terminal
-        elif icon_id == "browser":
-            return self.open_browser
-        elif icon_id == "files":
-            return self.open_file_manager
-        elif icon_id == "editor":
-            return self.open_editor
-        elif icon_id == "camera":
-            return self.open_camera
-        elif icon_id == "deepseek":
-            return self.open_deepseek
-        elif icon_id == "games":
-            return self.open_game
-        elif icon_id == "rss_reader":
-            return self.open_rss_reader
-        else:
-            return lambda: messagebox.showinfo("操作", f"双击了图标: {icon_id}\n请在此处实现您的功能！")
+        # 所有已注册的应用都委托给 launch_app
+        if get_app(icon_id):
+            return lambda: self.launch_app(icon_id)
+        return lambda: messagebox.showinfo("操作", f"双击了图标: {icon_id}\n请在此处实现您的功能！")
 
-    def _launch_app_thread(self, app_key, app_name):
+    def launch_app(self, app_id, *extra_args):
         """通用的应用启动函数，使用线程来避免阻塞主UI。"""
-        # 确保启动器函数存在
-        launcher_func = self.app_launchers.get(app_key)
-        if not launcher_func:
-            self._update_status_and_destroy_window(False, None, app_name)
+        spec = get_app(app_id)
+        if not spec:
+            self._update_status_and_destroy_window(False, None, app_id)
+            return
+        app_name = spec["label"]
+
+        # 单实例应用 (编辑器): 交给已在运行的进程处理，例如在新标签页中打开
+        if forward_to_instance(spec, extra_args):
+            self.ui.set_status_text(f"已在运行中的{app_name}中打开")
+            self.open_reset()
+            return
+
+        # 应用已在运行: 切换到已有窗口，而不是再启动一个新进程
+        if self.supervisor.is_running(app_id):
+            if self.supervisor.focus(app_id):
+                self.ui.set_status_text(f"{app_name}已在运行，已切换到前台")
+            else:
+                self.ui.set_status_text(f"{app_name}已在运行")
+            self.open_reset()
             return
 
         loading_window = self._show_loading_message(f"执行打开{app_name}的操作...")
         
         def run_task():
-            # launcher_func 负责调用 subprocess.Popen
+            start_time = time.perf_counter()
             try:
-                # 启动函数通常需要知道项目根路径或其他上下文，这里我们假设它只接收 app_instance
-                # 在 app.py 中，open_xxx 函数已经被定义为 subprocess.Popen 的封装
-                success = launcher_func(self.app)
-                self.master.after(0, self._update_status_and_destroy_window, success, loading_window, app_name)
+                # 优先交给预热进程 fork，省去新解释器的启动和导入时间
+                result, via_zygote = None, False
+                if spec.get("zygote") and self.zygote:
+                    result = self.zygote.launch(spec["mode"], resolve_args(spec, extra_args))
+                    via_zygote = result is not None
+                if not via_zygote:
+                    if spec["launch"] == "inprocess":
+                        # 由应用自己的启动函数决定如何启动 (例如相机按平台选择模式)
+                        result = lazy_callable(spec["module"], spec["entry"])(self.app)
+                    else:
+                        result = launch_subprocess(spec, extra_args)
+                success = result is not None and result is not False
+                # 能拿到 PID 的应用交给监管器跟踪 (终端等进程内应用只返回 True)
+                self.supervisor.register(app_id, result, app_name)
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                print(f"启动 {app_name} 耗时 {elapsed_ms:.0f} ms ({'预热进程' if via_zygote else '新进程'})")
+                self.master.after(0, self._update_status_and_destroy_window, success, loading_window, app_name, elapsed_ms, via_zygote)
             except Exception as e:
                 print(f"Error launching {app_name}: {e}")
                 traceback.print_exc()
@@ -133,29 +157,24 @@ class LogicHandler:
 
         threading.Thread(target=run_task).start()
 
-    def open_terminal(self):
-        self._launch_app_thread("terminal", "终端")
-
-    def open_browser(self):
-        self._launch_app_thread("browser", "浏览器")
-
-    def open_file_manager(self):
-        self._launch_app_thread("file_manager", "文件浏览器")
-
-    def open_editor(self):
-        self._launch_app_thread("editor", "文件编辑器")
-
-    def open_camera(self):
-        self._launch_app_thread("camera", "相机")
-    
-    def open_deepseek(self):
-        self._launch_app_thread("deepseek", "Deepseek")
-
-    def open_game(self):
-        self._launch_app_thread("games", "游戏")
-        
-    def open_rss_reader(self):
-        self._launch_app_thread("rss_reader", "RSS 阅读器")
+    def _schedule_reap(self):
+        """定期回收已退出的子进程，避免僵尸进程并让单实例判断保持准确。"""
+        self.supervisor.reap()
+        self.master.after(5000, self._schedule_reap)
+
+    def show_running_apps(self):
+        from system.button.running_apps import show_running_apps
+        show_running_apps(self.master, self.supervisor)
+
+    # 按应用 ID 启动的快捷方法 (ID 见 system/app_registry.py)
+    def open_terminal(self): self.launch_app("terminal")
+    def open_browser(self): self.launch_app("browser")
+    def open_file_manager(self): self.launch_app("files")
+    def open_editor(self): self.launch_app("editor")
+    def open_camera(self): self.launch_app("camera")
+    def open_deepseek(self): self.launch_app("deepseek")
+    def open_game(self): self.launch_app("games")
+    def open_rss_reader(self): self.launch_app("rss_reader")
 
     def menu_placeholder_function(self):
         messagebox.showinfo("提示", "此菜单功能待实现！")
@@ -192,7 +211,7 @@ class LogicHandler:
         loading_window.grab_set()
         return loading_window
     
-    def _update_status_and_destroy_window(self, success, window, app_name):
+    def _update_status_and_destroy_window(self, success, window, app_name, elapsed_ms=None, via_zygote=False):
         # 确保窗口关闭前解除 grab 状态
         if window:
             try:
@@ -202,7 +221,11 @@ class LogicHandler:
                 pass
         
         if success:
-            self.ui.set_status_text(f"{app_name}已启动")
+            if elapsed_ms is not None:
+                source = "预热" if via_zygote else "冷启动"
+                self.ui.set_status_text(f"{app_name}已启动 ({source} {elapsed_ms:.0f} ms)")
+            else:
+                self.ui.set_status_text(f"{app_name}已启动")
             self.open_reset()
         else:
             # 只有当 window 为 None 时，才弹错误框 (这种情况应该极少发生)
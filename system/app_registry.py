@@ -0,0 +1,228 @@
+# system/app_registry.py
+"""
+统一的应用注册表。
+
+每个应用只在这里声明一次 (id、名称、图标、模块、入口、启动方式、命令行参数)，
+桌面图标、"软件"菜单、app.py 的命令行分发以及 LogicHandler 的启动逻辑都从这里读取，
+不再在多个文件中各自维护 if/elif 分支和打包/开发环境的命令拼接。
+
+应用条目字段:
+    id          应用唯一标识，同时也是桌面图标 ID
+    label       显示名称
+    icon        图标路径 (相对项目根目录)
+    x, y        默认桌面位置 (可选，缺省时自动排布)
+    module      入口所在模块，例如 'software.rss_app'
+    entry       模块内的入口类或函数名称
+    launch      启动方式: 'subprocess' (默认，通过 app.py <mode> 启动子进程)
+                或 'inprocess' (在桌面进程中调用 entry(app_instance)，由其自行决定如何启动)
+    mode        app.py 的命令行模式，缺省为 '<id>_only'
+    argv        传给子进程的额外参数模板，支持 {project_root}
+    entry_kind  'runner' 表示入口类无参实例化后调用 run() (相机)
+    zygote      True 表示可以由预热进程直接 fork 启动
+    single_instance
+                转发函数的路径 (模块.函数)，应用已在运行时由它把额外参数交给运行中的实例，
+                返回 True 时不再启动新进程 (编辑器在已有窗口中以新标签页打开文件)
+    hidden      True 表示只用于命令行分发，不显示在桌面和菜单中
+
+插件: 在 <项目根目录>/plugins 或 <用户数据目录>/plugins 下放置 *.json 文件
+(内容为一个应用条目或条目列表)，即可在不修改核心代码的情况下添加新应用。
+插件目录会被加入 sys.path，因此条目中的 module 可以是同目录下的 .py 文件。
+"""
+import sys
+import json
+import importlib
+import subprocess
+from pathlib import Path
+from tkinter import messagebox
+
+# 获取项目的根目录，与 app.py 中的逻辑保持一致
+PROJECT_ROOT = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).resolve().parent.parent
+
+PLUGIN_DIR_NAME = "plugins"
+REQUIRED_FIELDS = ("id", "label", "module", "entry")
+
+# --- 内置应用 ---
+BUILTIN_APPS = [
+    {"id": "terminal", "label": "终端", "icon": "icons/terminal.png", "x": 60, "y": 60,
+     "module": "software.terminal", "entry": "open_terminal_system", "launch": "inprocess"},
+    {"id": "browser", "label": "浏览器", "icon": "icons/browser.png", "x": 140, "y": 60,
+     "module": "software.browser_app", "entry": "create_browser_window", "mode": "browser_only"},
+    {"id": "files", "label": "文件管理器", "icon": "icons/folder.png", "x": 60, "y": 140,
+     "module": "software.file_manager.main", "entry": "FileManagerApp", "mode": "file_manager_only",
+     "argv": ["{project_root}"]},
+    {"id": "editor", "label": "文本编辑器", "icon": "icons/editor.png", "x": 140, "y": 140,
+     "module": "software.file_editor_app", "entry": "run_editor", "mode": "file_editor_only",
+     "argv": ["{project_root}"], "single_instance": "software.file_editor.instance.forward_open"},
+    {"id": "camera", "label": "相机", "icon": "icons/camera.png", "x": 220, "y": 60,
+     "module": "software.camera", "entry": "open_camera_system", "launch": "inprocess"},
+    {"id": "deepseek", "label": "Deepseek", "icon": "icons/deepseek.png", "x": 220, "y": 140,
+     "module": "software.deepseek_app", "entry": "create_deepseek_ui", "mode": "deepseek_only", "zygote": True},
+    {"id": "games", "label": "游戏", "icon": "icons/game.png", "x": 300, "y": 60,
+     "module": "software.games.pong.main_menu", "entry": "run_game_menu", "mode": "game_only", "zygote": True},
+    {"id": "rss_reader", "label": "RSS 阅读器", "icon": "icons/rss.png", "x": 300, "y": 140,
+     "module": "software.rss_app", "entry": "RSSReaderApp", "mode": "rss_only", "zygote": True},
+
+    # 相机子进程 (由 software/camera.py 按平台选择模式启动，不显示在桌面)
+    {"id": "camera_mac", "label": "相机 (macOS)", "module": "software.camera_pi.camera_mac", "entry": "CameraApp",
+     "mode": "camera_mac_only", "entry_kind": "runner", "hidden": True},
+    {"id": "camera_win", "label": "相机 (Windows)", "module": "software.camera_pi.camera_win", "entry": "CameraApp",
+     "mode": "camera_win_only", "entry_kind": "runner", "hidden": True},
+    {"id": "camera_rpi", "label": "相机 (Raspberry Pi)", "module": "software.camera_pi.camera_rpi",
+     "entry": "CameraAppRpiTorchScript", "mode": "camera_rpi_only", "entry_kind": "runner", "hidden": True},
+]
+
+# 注册表缓存: 按 id 和按 mode 建立索引，查找均为 O(1)
+_apps_by_id = None
+_apps_by_mode = None
+
+
+def _normalize(spec, source):
+    """校验并补全一个应用条目。无效时返回 None。"""
+    if not isinstance(spec, dict) or any(not spec.get(field) for field in REQUIRED_FIELDS):
+        print(f"警告: 忽略无效的应用条目 ({source}): {spec}")
+        return None
+    spec = dict(spec)
+    spec.setdefault("launch", "subprocess")
+    spec.setdefault("mode", f"{spec['id']}_only")
+    spec.setdefault("argv", [])
+    spec.setdefault("icon", "icons/file.png")
+    return spec
+
+
+def _plugin_dirs():
+    dirs = [PROJECT_ROOT / PLUGIN_DIR_NAME]
+    try:
+        from system.platformdirs_pack import dirs as platform_dirs
+        dirs.append(Path(platform_dirs.user_data_dir) / PLUGIN_DIR_NAME)
+    except ImportError:
+        pass
+    return dirs
+
+
+def _load_plugins():
+    """从插件目录读取 *.json 应用条目。"""
+    plugins = []
+    for plugin_dir in _plugin_dirs():
+        if not plugin_dir.is_dir():
+            continue
+        if str(plugin_dir) not in sys.path:
+            sys.path.append(str(plugin_dir))
+        for plugin_file in sorted(plugin_dir.glob("*.json")):
+            try:
+                with open(plugin_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"警告: 无法加载插件 {plugin_file}: {e}")
+                continue
+            for spec in (data if isinstance(data, list) else [data]):
+                plugins.append((spec, str(plugin_file)))
+    return plugins
+
+
+def _ensure_loaded():
+    global _apps_by_id, _apps_by_mode
+    if _apps_by_id is not None:
+        return
+    apps_by_id, apps_by_mode = {}, {}
+    entries = [(spec, "内置") for spec in BUILTIN_APPS] + _load_plugins()
+    for raw_spec, source in entries:
+        spec = _normalize(raw_spec, source)
+        if spec is None:
+            continue
+        if spec["id"] in apps_by_id or spec["mode"] in apps_by_mode:
+            print(f"警告: 应用 ID 或模式重复，忽略 ({source}): {spec['id']}")
+            continue
+        apps_by_id[spec["id"]] = spec
+        if spec["launch"] == "subprocess":
+            apps_by_mode[spec["mode"]] = spec
+    _apps_by_id, _apps_by_mode = apps_by_id, apps_by_mode
+
+
+def get_app(app_id):
+    """按 ID 查找应用条目，不存在时返回 None。"""
+    _ensure_loaded()
+    return _apps_by_id.get(app_id)
+
+
+def get_app_by_mode(mode):
+    """按 app.py 命令行模式查找应用条目，不存在时返回 None。"""
+    _ensure_loaded()
+    return _apps_by_mode.get(mode)
+
+
+def desktop_apps():
+    """返回显示在桌面和"软件"菜单中的应用 (保持注册顺序)。"""
+    _ensure_loaded()
+    return [spec for spec in _apps_by_id.values() if not spec.get("hidden")]
+
+
+def default_layout():
+    """
+    生成默认的桌面图标布局。
+    没有声明 x/y 的应用 (通常是插件) 接在内置图标之后按 4 列网格排布。
+    """
+    layout = []
+    auto_index = 0
+    for spec in desktop_apps():
+        if "x" in spec and "y" in spec:
+            x, y = spec["x"], spec["y"]
+        else:
+            # 内置图标占用了 y=60 和 y=140 两行，插件从第三行开始
+            x = 60 + (auto_index % 4) * 80
+            y = 220 + (auto_index // 4) * 80
+            auto_index += 1
+        layout.append({"id": spec["id"], "text": spec["label"], "icon": spec["icon"], "x": x, "y": y})
+    return layout
+
+
+def resolve_args(spec, extra_args=()):
+    """展开条目中的 argv 模板，并追加调用方传入的额外参数。"""
+    args = [str(arg).format(project_root=PROJECT_ROOT) for arg in spec.get("argv", [])]
+    return args + [str(arg) for arg in extra_args if arg is not None]
+
+
+def build_command(spec, extra_args=()):
+    """
+    构建启动子进程的命令。
+    - 打包 (frozen) 环境: [可执行文件, mode, 参数...]
+    - 开发环境: [python, app.py, mode, 参数...]
+    """
+    args = resolve_args(spec, extra_args)
+    if getattr(sys, 'frozen', False):
+        return [sys.executable, spec["mode"]] + args
+    return [sys.executable, str(PROJECT_ROOT / 'app.py'), spec["mode"]] + args
+
+
+def launch_subprocess(spec, extra_args=()):
+    """
+    以子进程方式启动应用。
+
+    返回:
+        subprocess.Popen | bool: 成功返回 Popen 对象 (供进程监管器跟踪 PID)，失败返回 False。
+    """
+    command = build_command(spec, extra_args)
+    try:
+        return subprocess.Popen(command, cwd=str(PROJECT_ROOT))
+    except Exception as e:
+        print(f"启动{spec['label']}失败，尝试的命令: {command}")
+        messagebox.showerror("启动失败", f"启动{spec['label']}时发生未知错误：{e}")
+        return False
+
+
+def forward_to_instance(spec, extra_args=()):
+    """
+    条目声明了 single_instance 时，把额外参数交给已在运行的实例。
+
+    返回:
+        bool: True 表示已转发，调用方不需要再启动新进程。
+    """
+    target = spec.get("single_instance")
+    if not target:
+        return False
+    module_path, _, function_name = target.rpartition('.')
+    try:
+        forward = getattr(importlib.import_module(module_path), function_name)
+        return bool(forward([str(arg) for arg in extra_args if arg is not None]))
+    except Exception as e:
+        print(f"转发到运行中的{spec['label']}失败: {e}")
+        return False
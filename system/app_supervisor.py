@@ -0,0 +1,150 @@
+# system/app_supervisor.py
+"""
+已启动应用的进程监管器。
+
+按 app_key 记录每个应用的子进程 PID，用于:
+- 单实例复用: 应用已在运行时切换到已有窗口，而不是再启动一个新进程；
+- 回收已退出的子进程 (避免僵尸进程)；
+- 为“运行中的应用”面板提供每个进程的内存 (RSS) 和 CPU 占用。
+"""
+import sys
+import shutil
+import threading
+import subprocess
+
+
+class AppSupervisor:
+    def __init__(self):
+        # app_key -> {"label": 显示名称, "entries": [{"pid": int, "process": Popen | None}]}
+        self._apps = {}
+        # psutil.Process 缓存，cpu_percent 需要复用同一个对象才能计算两次调用之间的占用
+        self._ps_cache = {}
+        # 启动线程和 Tk 主线程都会访问
+        self._lock = threading.Lock()
+
+    def register(self, app_key, process, label=None):
+        """
+        记录新启动的应用进程。
+
+        Args:
+            app_key (str): 应用标识，例如 'rss_reader'。
+            process (subprocess.Popen | int): 启动函数返回的 Popen 对象，或预热进程返回的 PID。
+            label (str): 面板中显示的应用名称。
+        """
+        if isinstance(process, subprocess.Popen):
+            entry = {"pid": process.pid, "process": process}
+        elif isinstance(process, int) and not isinstance(process, bool):
+            entry = {"pid": process, "process": None}
+        else:
+            return
+        with self._lock:
+            app = self._apps.setdefault(app_key, {"label": label or app_key, "entries": []})
+            if label:
+                app["label"] = label
+            app["entries"].append(entry)
+
+    def reap(self):
+        """移除所有已退出的子进程。对 Popen 子进程调用 poll() 以回收僵尸进程。"""
+        with self._lock:
+            for app_key in list(self._apps):
+                entries = self._apps[app_key]["entries"]
+                entries[:] = [entry for entry in entries if self._is_alive(entry)]
+                if not entries:
+                    del self._apps[app_key]
+            alive_pids = {entry["pid"] for app in self._apps.values() for entry in app["entries"]}
+            for pid in list(self._ps_cache):
+                if pid not in alive_pids:
+                    del self._ps_cache[pid]
+
+    @staticmethod
+    def _is_alive(entry):
+        if entry["process"] is not None:
+            return entry["process"].poll() is None
+        try:
+            import psutil
+            process = psutil.Process(entry["pid"])
+            return process.status() != psutil.STATUS_ZOMBIE
+        except Exception:
+            return False
+
+    def running_pids(self, app_key):
+        """返回指定应用仍在运行的 PID 列表。"""
+        self.reap()
+        with self._lock:
+            app = self._apps.get(app_key)
+            return [entry["pid"] for entry in app["entries"]] if app else []
+
+    def is_running(self, app_key):
+        return bool(self.running_pids(app_key))
+
+    def focus(self, app_key):
+        """
+        将应用已有的窗口切换到前台。
+        返回 True 表示成功；窗口管理工具不可用时返回 False (应用仍在运行)。
+        """
+        for pid in self.running_pids(app_key):
+            if self._focus_pid(pid):
+                return True
+        return False
+
+    @staticmethod
+    def _focus_pid(pid):
+        """根据平台调用窗口管理工具激活属于 pid 的窗口。"""
+        try:
+            if sys.platform == 'darwin':
+                script = f'tell application "System Events" to set frontmost of (first process whose unix id is {pid}) to true'
+                result = subprocess.run(["osascript", "-e", script], capture_output=True, timeout=2)
+                return result.returncode == 0
+            if sys.platform.startswith('linux'):
+                if shutil.which("xdotool"):
+                    result = subprocess.run(["xdotool", "search", "--onlyvisible", "--pid", str(pid), "windowactivate"],
+                                            capture_output=True, timeout=2)
+                    if result.returncode == 0:
+                        return True
+                if shutil.which("wmctrl"):
+                    # wmctrl -lp 输出: <窗口ID> <桌面> <PID> <主机> <标题>
+                    listing = subprocess.run(["wmctrl", "-lp"], capture_output=True, text=True, timeout=2)
+                    for line in listing.stdout.splitlines():
+                        fields = line.split(None, 4)
+                        if len(fields) >= 3 and fields[2] == str(pid):
+                            subprocess.run(["wmctrl", "-ia", fields[0]], timeout=2)
+                            return True
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"切换窗口失败 (PID {pid}): {e}")
+        return False
+
+    def terminate(self, pid):
+        """结束指定 PID 的应用进程。"""
+        try:
+            import psutil
+            psutil.Process(pid).terminate()
+        except Exception as e:
+            print(f"结束进程 {pid} 失败: {e}")
+        self.reap()
+
+    def snapshot(self):
+        """
+        返回所有运行中应用的资源占用列表，供面板显示。
+
+        返回:
+            list[dict]: 每项包含 app_key, label, pid, rss_mb, cpu_percent。
+        """
+        import psutil
+        self.reap()
+        rows = []
+        with self._lock:
+            for app_key, app in self._apps.items():
+                for entry in app["entries"]:
+                    pid = entry["pid"]
+                    try:
+                        process = self._ps_cache.get(pid)
+                        if process is None:
+                            process = psutil.Process(pid)
+                            self._ps_cache[pid] = process
+                        rss_mb = process.memory_info().rss / (1024 ** 2)
+                        cpu_percent = process.cpu_percent(interval=None)  # 非阻塞，首次调用返回 0
+                    except psutil.Error:
+                        continue
+                    rows.append({"app_key": app_key, "label": app["label"], "pid": pid,
+                                 "rss_mb": rss_mb, "cpu_percent": cpu_percent})
+        return rows
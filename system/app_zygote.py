@@ -0,0 +1,224 @@
+# system/app_zygote.py
+"""
+预热 (zygote) 应用服务器。
+
+桌面启动时在后台拉起一个常驻进程，由它预先导入 tkinter / PIL / requests /
+feedparser / pygame 等较重的共享模块，然后在 Unix socket 上等待启动请求。
+每次收到请求时直接 fork 出一个已经完成导入的子进程来运行对应的 *_only 模式，
+从而省掉树莓派上每次启动都要重新初始化 Python 解释器和导入依赖的数秒开销。
+
+只在 Linux (支持 fork 和 AF_UNIX) 上启用；其他平台或服务器不可用时，
+调用方应回退到原来的 subprocess.Popen 启动方式。
+"""
+import os
+import sys
+import json
+import socket
+import signal
+import subprocess
+import importlib
+import tempfile
+import traceback
+from pathlib import Path
+
+# 预热进程中预先导入的模块。注意这里只能导入，不能创建任何 Tk/pygame 窗口，
+# 否则 fork 出来的子进程会共享同一个显示连接。
+ZYGOTE_PRELOAD_MODULES = [
+    'tkinter',
+    'tkinter.ttk',
+    'tkinter.messagebox',
+    'PIL.Image',
+    'PIL.ImageTk',
+    'requests',
+    'feedparser',
+    'pygame',
+    'software.rss_app',
+    'software.deepseek_app',
+]
+
+ZYGOTE_SOCKET_NAME = "zygote.sock"
+# 客户端连接/等待应答的超时时间 (秒)
+ZYGOTE_CONNECT_TIMEOUT = 3.0
+
+
+def is_zygote_supported():
+    """当前平台是否支持预热进程 (需要 fork 和 Unix socket)。"""
+    return sys.platform.startswith('linux') and hasattr(os, 'fork') and hasattr(socket, 'AF_UNIX')
+
+
+def get_socket_path():
+    """获取预热进程的 socket 路径，优先使用用户运行时目录。"""
+    try:
+        from system.platformdirs_pack import dirs
+        runtime_dir = Path(dirs.user_runtime_dir)
+        runtime_dir.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        runtime_dir = Path(tempfile.gettempdir())
+    return str(runtime_dir / f"{os.getuid()}_{ZYGOTE_SOCKET_NAME}")
+
+
+def preload_modules():
+    """导入共享模块，单个模块导入失败不影响其他模块。"""
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    for module_name in ZYGOTE_PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"预热进程: 跳过模块 {module_name}: {e}")
+
+
+# ==============================================================================
+# 服务器端 (运行在预热进程中)
+# ==============================================================================
+
+def serve_forever(socket_path, dispatch):
+    """
+    【此函数在预热进程中执行】
+    预导入模块后监听 socket，每个请求 fork 一个子进程并调用 dispatch(mode)。
+
+    Args:
+        socket_path (str): 监听的 Unix socket 路径。
+        dispatch (callable): 子进程中执行的模式分发函数，例如 app.py 中的 dispatch_mode。
+    """
+    preload_modules()
+
+    # 由内核自动回收退出的子进程，避免产生僵尸进程
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(8)
+    server.settimeout(1.0)
+    parent_pid = os.getppid()
+    print(f"预热进程已就绪: {socket_path}")
+
+    try:
+        while True:
+            # 桌面主进程退出后，预热进程也随之退出
+            if os.getppid() != parent_pid:
+                break
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            with conn:
+                _handle_request(conn, server, dispatch)
+    finally:
+        server.close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+def _handle_request(conn, server, dispatch):
+    """读取一行 JSON 请求，fork 子进程并返回其 PID。"""
+    try:
+        conn.settimeout(ZYGOTE_CONNECT_TIMEOUT)
+        line = conn.makefile('r', encoding='utf-8').readline()
+        request = json.loads(line)
+        mode = request['mode']
+        args = [str(arg) for arg in request.get('args', [])]
+    except (OSError, ValueError, KeyError) as e:
+        _send_reply(conn, {"ok": False, "error": f"无效请求: {e}"})
+        return
+
+    pid = os.fork()
+    if pid == 0:
+        # --- 子进程 ---
+        exit_code = 0
+        try:
+            server.close()
+            conn.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            os.setsid()
+            sys.argv = [sys.argv[0], mode] + args
+            dispatch(mode)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 0
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            # 绝不能返回到预热进程的主循环中
+            os._exit(exit_code)
+
+    _send_reply(conn, {"ok": True, "pid": pid})
+
+
+def _send_reply(conn, reply):
+    try:
+        conn.sendall((json.dumps(reply) + "\n").encode('utf-8'))
+    except OSError:
+        pass
+
+
+# ==============================================================================
+# 客户端 (运行在桌面主进程中)
+# ==============================================================================
+
+class ZygoteClient:
+    """负责启动/停止预热进程，并向其发送启动请求。"""
+
+    def __init__(self, project_root):
+        self.project_root = Path(project_root)
+        self.socket_path = get_socket_path() if is_zygote_supported() else None
+        self.process = None
+
+    def start(self):
+        """在后台启动预热进程。返回是否已启动。"""
+        if not self.socket_path:
+            return False
+        if getattr(sys, 'frozen', False):
+            command = [sys.executable, "zygote_server", self.socket_path]
+        else:
+            command = [sys.executable, str(self.project_root / 'app.py'), "zygote_server", self.socket_path]
+        try:
+            self.process = subprocess.Popen(command, cwd=str(self.project_root))
+            return True
+        except Exception as e:
+            print(f"启动预热进程失败: {e}")
+            self.process = None
+            return False
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def launch(self, mode, args=()):
+        """
+        请求预热进程 fork 一个子进程运行指定模式。
+
+        返回:
+            int | None: 成功时返回子进程 PID；预热进程尚未就绪或失败时返回 None，
+            调用方应回退到 subprocess.Popen。
+        """
+        if not self.is_alive():
+            return None
+        request = {"mode": mode, "args": [str(arg) for arg in args]}
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(ZYGOTE_CONNECT_TIMEOUT)
+                sock.connect(self.socket_path)
+                sock.sendall((json.dumps(request) + "\n").encode('utf-8'))
+                reply = json.loads(sock.makefile('r', encoding='utf-8').readline())
+        except (OSError, ValueError) as e:
+            print(f"预热进程不可用 ({mode}): {e}")
+            return None
+
+        if not reply.get('ok'):
+            print(f"预热进程启动 {mode} 失败: {reply.get('error')}")
+            return None
+        return reply.get('pid')
+
+    def stop(self):
+        """停止预热进程 (已 fork 出的应用不受影响)。"""
+        if not self.is_alive():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
@@ -0,0 +1,85 @@
+import tkinter as tk
+from tkinter import ttk
+
+from system.config import WINDOW_WIDTH, WINDOW_HEIGHT
+
+def show_running_apps(root, supervisor):
+    """
+    显示“运行中的应用”窗口，每秒刷新各应用进程的内存和 CPU 占用。
+    :param root: Tkinter 主窗口实例。
+    :param supervisor: system.app_supervisor.AppSupervisor 实例。
+    """
+    # 定义子窗口尺寸
+    win_width, win_height = 400, 220
+    # 计算居中位置
+    x_pos = (WINDOW_WIDTH - win_width) // 2
+    y_pos = (WINDOW_HEIGHT - win_height) // 2
+
+    # 创建一个顶级（悬浮）窗口
+    apps_window = tk.Toplevel(root)
+    apps_window.title("运行中的应用")
+    apps_window.geometry(f"{win_width}x{win_height}+{x_pos}+{y_pos}")
+
+    tree = ttk.Treeview(apps_window, columns=("pid", "rss", "cpu"), show="tree headings", height=6)
+    tree.heading("#0", text="应用")
+    tree.heading("pid", text="PID")
+    tree.heading("rss", text="内存")
+    tree.heading("cpu", text="CPU")
+    tree.column("#0", width=140)
+    tree.column("pid", width=70, anchor="e")
+    tree.column("rss", width=90, anchor="e")
+    tree.column("cpu", width=70, anchor="e")
+    tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+    button_frame = tk.Frame(apps_window)
+    button_frame.pack(fill="x", padx=5, pady=(0, 5))
+
+    def selected_row():
+        selection = tree.selection()
+        if not selection:
+            return None
+        return tree.item(selection[0], 'values')
+
+    def focus_selected():
+        # 行 ID 形如 "<app_key>:<pid>"
+        selection = tree.selection()
+        if selection:
+            supervisor.focus(selection[0].split(':', 1)[0])
+
+    def terminate_selected():
+        values = selected_row()
+        if values:
+            supervisor.terminate(int(values[0]))
+            update_info()
+
+    tk.Button(button_frame, text="切换到前台", command=focus_selected).pack(side="left")
+    tk.Button(button_frame, text="结束进程", command=terminate_selected).pack(side="left", padx=5)
+    tk.Button(button_frame, text="关闭", command=apps_window.destroy).pack(side="right")
+
+    # 定义一个更新信息的函数
+    def update_info():
+        if not apps_window.winfo_exists():
+            return
+        rows = supervisor.snapshot()
+        row_ids = set()
+        for row in rows:
+            row_id = f"{row['app_key']}:{row['pid']}"
+            row_ids.add(row_id)
+            values = (row['pid'], f"{row['rss_mb']:.1f} MB", f"{row['cpu_percent']:.1f}%")
+            if tree.exists(row_id):
+                tree.item(row_id, values=values)
+            else:
+                tree.insert("", "end", iid=row_id, text=row['label'], values=values)
+        # 移除已退出的进程
+        for row_id in tree.get_children():
+            if row_id not in row_ids:
+                tree.delete(row_id)
+
+    # 每秒钟调用一次自身以实现实时更新
+    def schedule_update():
+        update_info()
+        if apps_window.winfo_exists():
+            apps_window.after(1000, schedule_update)
+
+    # 首次调用函数以显示信息
+    schedule_update()
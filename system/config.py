@@ -24,4 +24,6 @@ TERMINAL_WIDTH = 480
 TERMINAL_HEIGHT = 300
 # 画布的虚拟大小，大于窗口尺寸以实现滚动效果
 CANVAS_WIDTH = 800
-CANVAS_HEIGHT = 600
\ No newline at end of file
+CANVAS_HEIGHT = 600
+# 文本编辑器: 超过这个大小 (字节) 的文件以只读的大文件模式分页显示
+EDITOR_LARGE_FILE_THRESHOLD = 16 * 1024 * 1024
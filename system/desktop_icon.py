@@ -1,8 +1,7 @@
 # system/desktop_icon.py
 import tkinter as tk
-from PIL import Image, ImageTk
 import os
-from system.CreatePlaceholderIcon import create_placeholder_icon
+from system.icon_cache import get_photo_image
 from system.config import get_resource_path # 导入新函数
 
 class DesktopIcon:
@@ -17,11 +16,9 @@ class DesktopIcon:
         self.y = icon_data['y']
         self.double_click_command = self.app.get_command_for_icon(self.id)
 
-        create_placeholder_icon(self.image_path, text=self.id[:3].upper())
-
+        # 从共享图标缓存获取 48x48 图标，首次运行后不再需要 PIL 缩放；源文件不存在时生成占位图标
         full_image_path = get_resource_path(self.image_path)
-        self.pil_image = Image.open(full_image_path).resize((48, 48), Image.Resampling.LANCZOS)
-        self.tk_image = ImageTk.PhotoImage(self.pil_image)
+        self.tk_image = get_photo_image(full_image_path, (48, 48), placeholder_text=self.id[:3].upper())
 
         self.image_item = self.canvas.create_image(self.x, self.y, image=self.tk_image, anchor=tk.CENTER)
         # 注意：这里不再设置初始颜色，而是通过 set_label_color 方法设置
@@ -2,11 +2,15 @@ import tkinter as tk
 import time
 import sys
 
-from system.icon_manager import IconManager
+from system.app_registry import desktop_apps
 from system.config import CANVAS_WIDTH, CANVAS_HEIGHT
-from system.button.about import show_system_about, show_developer_about
-from system.wireless.wifi import show_wifi_configure
-from system.wireless.bluetooth import show_bluetooth_configure
+from system.lazy_import import lazy_callable
+
+# 菜单对话框在第一次点击时才导入 (about 会引入 psutil 和 PIL)，以缩短桌面冷启动时间
+show_system_about = lazy_callable('system.button.about', 'show_system_about')
+show_developer_about = lazy_callable('system.button.about', 'show_developer_about')
+show_wifi_configure = lazy_callable('system.wireless.wifi', 'show_wifi_configure')
+show_bluetooth_configure = lazy_callable('system.wireless.bluetooth', 'show_bluetooth_configure')
 
 class UIManager:
     def __init__(self, master, app_instance):
@@ -63,13 +67,11 @@ class UIManager:
         # 软件菜单 (动态生成)
         software_menu = tk.Menu(menubar, tearoff=0)
         
-        default_icons = IconManager._get_default_layout()
-        
-        for icon_data in default_icons:
-            icon_id = icon_data['id']
-            icon_text = icon_data['text']
-            command_func = self.app.get_command_for_icon(icon_id)
-            software_menu.add_command(label=icon_text, command=command_func)
+        for app_spec in desktop_apps():
+            command_func = self.app.get_command_for_icon(app_spec['id'])
+            software_menu.add_command(label=app_spec['label'], command=command_func)
+        software_menu.add_separator()
+        software_menu.add_command(label="运行中的应用", command=self.app.show_running_apps)
             
         menubar.add_cascade(label="软件", menu=software_menu)
         
@@ -0,0 +1,96 @@
+# system/icon_cache.py
+"""
+桌面和文件管理器共享的图标缓存。
+
+第一次加载某个图标时用 PIL 缩放 (LANCZOS) 并把缩略图以 PNG 格式保存到
+platformdirs 的用户缓存目录，键为 (源文件路径, 修改时间, 尺寸)。之后的启动直接用
+Tk 原生的 PhotoImage 读取缓存的 PNG，完全跳过 PIL 的解码和重采样。
+同一进程内相同的图标只创建一个 PhotoImage 对象。
+"""
+import os
+import hashlib
+import tkinter as tk
+
+from system.CreatePlaceholderIcon import create_placeholder_icon
+
+ICON_CACHE_SUBDIR = "icons"
+
+# 进程内缓存: (绝对路径, mtime_ns, 尺寸) -> PhotoImage
+_photo_cache = {}
+_cache_dir = None
+
+
+def _get_cache_dir():
+    global _cache_dir
+    if _cache_dir is None:
+        try:
+            from system.platformdirs_pack import get_cache_path
+            _cache_dir = get_cache_path(ICON_CACHE_SUBDIR)
+        except Exception as e:
+            print(f"图标缓存目录不可用，将不使用磁盘缓存: {e}")
+            _cache_dir = False
+    return _cache_dir
+
+
+def _thumbnail_path(source_path, mtime_ns, size):
+    """根据 (路径, 修改时间, 尺寸) 计算缓存文件路径。"""
+    cache_dir = _get_cache_dir()
+    if not cache_dir:
+        return None
+    key = f"{source_path}|{mtime_ns}|{size[0]}x{size[1]}"
+    return cache_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.png"
+
+
+def _render_thumbnail(source_path, size, thumb_path):
+    """用 PIL 缩放源图片，写入磁盘缓存并返回 PhotoImage。"""
+    from PIL import Image, ImageTk
+
+    with Image.open(source_path) as img:
+        thumbnail = img.convert('RGBA').resize(size, Image.Resampling.LANCZOS)
+    if thumb_path is not None:
+        tmp_path = thumb_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            thumbnail.save(tmp_path, format='PNG')
+            os.replace(tmp_path, thumb_path)
+        except OSError as e:
+            print(f"写入图标缓存失败: {e}")
+    return ImageTk.PhotoImage(thumbnail)
+
+
+def get_photo_image(image_path, size, placeholder_text=None):
+    """
+    返回缩放到 size 的图标 PhotoImage，优先使用缓存。
+
+    Args:
+        image_path (str | Path): 源图片路径。
+        size (tuple): 目标尺寸，例如 (48, 48)。
+        placeholder_text (str): 源文件不存在时，用该文字生成占位图标；为 None 时直接抛出 FileNotFoundError。
+    """
+    source_path = os.path.abspath(image_path)
+    size = tuple(size)
+    try:
+        mtime_ns = os.stat(source_path).st_mtime_ns
+    except FileNotFoundError:
+        if placeholder_text is None:
+            raise
+        create_placeholder_icon(source_path, text=placeholder_text)
+        mtime_ns = os.stat(source_path).st_mtime_ns
+
+    cache_key = (source_path, mtime_ns, size)
+    photo = _photo_cache.get(cache_key)
+    if photo is not None:
+        return photo
+
+    thumb_path = _thumbnail_path(source_path, mtime_ns, size)
+    photo = None
+    if thumb_path is not None and thumb_path.exists():
+        try:
+            # Tk 8.6 原生支持 PNG，无需 PIL 解码
+            photo = tk.PhotoImage(file=str(thumb_path))
+        except tk.TclError:
+            photo = None
+    if photo is None:
+        photo = _render_thumbnail(source_path, size, thumb_path)
+
+    _photo_cache[cache_key] = photo
+    return photo
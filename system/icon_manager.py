@@ -2,8 +2,9 @@
 import json
 import os
 # 从新的模块导入加载和保存函数
-from system.platformdirs_pack import load_user_config, save_user_config
+from system.platformdirs_pack import load_user_config, DebouncedConfigWriter
 from system.desktop_icon import DesktopIcon
+from system.app_registry import default_layout
 
 class IconManager:
     def __init__(self, app):
@@ -11,6 +12,9 @@ class IconManager:
         self.icons = {}
         self.background_color = "#66ccff"
         self.label_color = "black" # 新增: 图标文字颜色
+        self._status_reset_after_id = None
+        # 布局变化在 1 秒窗口内合并，由后台线程原子写入 (紧凑 JSON)
+        self._layout_writer = DebouncedConfigWriter("desktop_layout.json", delay=1.0)
         self.load_and_create_icons()
         
     def load_and_create_icons(self):
@@ -26,6 +30,9 @@ class IconManager:
         
         # 加载图标布局，如果配置文件中没有则使用默认布局
         icon_layout = layout_data.get('icons', self._get_default_layout())
+        # 补充保存布局之后新注册的应用 (例如新安装的插件)
+        saved_ids = {icon_data['id'] for icon_data in icon_layout}
+        icon_layout += [icon_data for icon_data in self._get_default_layout() if icon_data['id'] not in saved_ids]
         for icon_data in icon_layout:
             icon_instance = DesktopIcon(self.app, self.app.ui.canvas, icon_data)
             self.icons[icon_data['id']] = icon_instance
@@ -34,21 +41,12 @@ class IconManager:
 
     @staticmethod
     def _get_default_layout():
-        """定义默认的图标布局"""
+        """定义默认的图标布局 (由应用注册表生成，包括插件应用)"""
         # 注意：因为是静态方法，所以方法签名里没有 self
-        return [
-            {"id": "terminal", "text": "终端", "icon": "icons/terminal.png", "x": 60, "y": 60},
-            {"id": "browser", "text": "浏览器", "icon": "icons/browser.png", "x": 140, "y": 60},
-            {"id": "files", "text": "文件管理器", "icon": "icons/folder.png", "x": 60, "y": 140},
-            {"id": "editor", "text": "文本编辑器", "icon": "icons/editor.png", "x": 140, "y": 140},
-            {"id": "camera", "text": "相机", "icon": "icons/camera.png", "x": 220, "y": 60},
-            {"id": "deepseek", "text": "Deepseek", "icon": "icons/deepseek.png", "x": 220, "y": 140},
-            {"id": "games", "text": "游戏", "icon": "icons/game.png", "x": 300, "y": 60},
-            {"id": "rss_reader", "text": "RSS 阅读器", "icon": "icons/rss.png", "x": 300, "y": 140},
-        ]
+        return default_layout()
 
-    def save_layout(self):
-        """将当前所有图标的位置、背景颜色和文字颜色保存到用户配置文件"""
+    def _build_layout_data(self):
+        """收集当前所有图标的位置、背景颜色和文字颜色"""
         layout_data = {
             "background_color": self.background_color,
             "label_color": self.label_color,
@@ -62,14 +60,26 @@ class IconManager:
                 "x": icon_instance.x,
                 "y": icon_instance.y
             })
-        
-        save_user_config(layout_data, "desktop_layout.json")
+        return layout_data
+
+    def save_layout(self):
+        """登记布局保存。实际写入由后台线程延迟合并执行，不阻塞 UI。"""
+        self._layout_writer.schedule(self._build_layout_data())
     
         self.app.ui.set_status_text("布局已保存")
-        self.app.root.after(1000, self.set_status_ready)
+        # 连续保存时只保留最后一次状态复位
+        if self._status_reset_after_id is not None:
+            self.app.root.after_cancel(self._status_reset_after_id)
+        self._status_reset_after_id = self.app.root.after(1000, self.set_status_ready)
+
+    def flush_layout(self):
+        """立即写入尚未保存的布局 (在程序退出时调用)。"""
+        self._layout_writer.schedule(self._build_layout_data())
+        self._layout_writer.flush()
 
     def set_status_ready(self):
         """设置状态文本为“就绪”的辅助方法"""
+        self._status_reset_after_id = None
         self.app.ui.set_status_text("就绪")
         
     def update_icon_position(self, icon_id, x, y):
@@ -0,0 +1,144 @@
+# system/lazy_import.py
+"""
+按需 (懒) 导入工具和导入耗时分析。
+
+桌面主进程和各个 *_only 子进程只应导入自己真正用到的模块。这里提供:
+- lazy_module / lazy_callable: 首次使用时才导入模块，并记录导入耗时；
+- enable_import_profile: 对应 app.py 的 --import-profile 参数，统计每个模块的导入耗时，
+  退出时打印报告，超过 COLD_START_IMPORT_BUDGET_MS 时给出警告。
+"""
+import os
+import sys
+import time
+import atexit
+import builtins
+import importlib
+import importlib.util
+
+# 冷启动导入耗时预算 (毫秒)，树莓派 Zero 2 W 上的目标值
+COLD_START_IMPORT_BUDGET_MS = 1500
+# 子进程通过该环境变量继承 --import-profile
+IMPORT_PROFILE_ENV = "RPD_IMPORT_PROFILE"
+
+# 懒加载注册表: 模块路径 -> LazyModule
+_LAZY_REGISTRY = {}
+# 导入耗时记录: 模块名 -> [累计耗时 ms, 自身耗时 ms]
+_IMPORT_TIMES = {}
+# 最外层导入语句的耗时之和，即总导入耗时 (ms)
+_total_import_ms = 0.0
+_original_import = None
+
+
+class LazyModule:
+    """模块代理对象，第一次访问属性时才真正导入。"""
+
+    def __init__(self, module_path):
+        self._module_path = module_path
+        self._module = None
+
+    def load(self):
+        if self._module is None:
+            start_time = time.perf_counter()
+            self._module = importlib.import_module(self._module_path)
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            if _original_import is not None:
+                print(f"[import-profile] 懒加载 {self._module_path}: {elapsed_ms:.1f} ms", file=sys.stderr)
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+
+def lazy_module(module_path):
+    """返回模块的懒加载代理，同一路径总是返回同一个代理对象。"""
+    if module_path not in _LAZY_REGISTRY:
+        _LAZY_REGISTRY[module_path] = LazyModule(module_path)
+    return _LAZY_REGISTRY[module_path]
+
+
+def lazy_callable(module_path, attr_name):
+    """
+    返回一个包装函数，调用时才导入 module_path 并调用其中的 attr_name。
+
+    例如: lazy_callable('software.camera', 'open_camera_system')(app_instance)
+    """
+    module = lazy_module(module_path)
+
+    def wrapper(*args, **kwargs):
+        return getattr(module.load(), attr_name)(*args, **kwargs)
+
+    wrapper.__name__ = attr_name
+    wrapper.__qualname__ = attr_name
+    return wrapper
+
+
+# ==============================================================================
+# 导入耗时分析 (--import-profile)
+# ==============================================================================
+
+def enable_import_profile():
+    """替换 builtins.__import__ 以统计首次导入每个模块的耗时，退出时打印报告。"""
+    global _original_import
+    if _original_import is not None:
+        return
+
+    _original_import = builtins.__import__
+    os.environ[IMPORT_PROFILE_ENV] = "1"
+    # 导入栈，用于从父模块的耗时中扣除子模块，得到自身耗时
+    stack = []
+
+    def profiling_import(name, globals=None, locals=None, fromlist=(), level=0):
+        global _total_import_ms
+        if level > 0 and globals:
+            try:
+                full_name = importlib.util.resolve_name('.' * level + name, globals.get('__package__'))
+            except (ImportError, ValueError):
+                full_name = name
+        else:
+            full_name = name
+
+        if full_name in sys.modules:
+            return _original_import(name, globals, locals, fromlist, level)
+
+        stack.append(0.0)
+        start_time = time.perf_counter()
+        try:
+            return _original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            children_ms = stack.pop()
+            if stack:
+                stack[-1] += elapsed_ms
+            else:
+                _total_import_ms += elapsed_ms
+            if full_name not in _IMPORT_TIMES:
+                _IMPORT_TIMES[full_name] = [elapsed_ms, elapsed_ms - children_ms]
+
+    builtins.__import__ = profiling_import
+    atexit.register(report_import_profile)
+
+
+def is_import_profile_requested(argv):
+    """检查命令行参数或环境变量是否要求开启导入分析。"""
+    return "--import-profile" in argv or os.environ.get(IMPORT_PROFILE_ENV) == "1"
+
+
+def report_import_profile(limit=30, budget_ms=COLD_START_IMPORT_BUDGET_MS):
+    """按累计耗时从高到低打印导入报告 (输出到 stderr)。"""
+    if not _IMPORT_TIMES:
+        return
+    top_level_total = _total_import_ms
+    mode = sys.argv[1] if len(sys.argv) > 1 else "desktop"
+
+    print(f"\n[import-profile] 模式: {mode}  模块数: {len(_IMPORT_TIMES)}  总计: {top_level_total:.1f} ms", file=sys.stderr)
+    print(f"{'累计(ms)':>10} {'自身(ms)':>10}  模块", file=sys.stderr)
+    ranked = sorted(_IMPORT_TIMES.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (cumulative, self_time) in ranked[:limit]:
+        print(f"{cumulative:10.1f} {self_time:10.1f}  {name}", file=sys.stderr)
+
+    if top_level_total > budget_ms:
+        print(f"[import-profile] 警告: 导入耗时 {top_level_total:.0f} ms 超出预算 {budget_ms} ms", file=sys.stderr)
@@ -1,6 +1,8 @@
 import sys
 import os
 import json
+import tempfile
+import threading
 from platformdirs import PlatformDirs
 from pathlib import Path
 
@@ -13,6 +15,10 @@ APP_VERSION = "1.0.0.2"
 # 创建 PlatformDirs 实例，它会自动处理不同操作系统下的路径
 dirs = PlatformDirs(APP_NAME, APP_AUTHOR)
 
+# 进程的 umask (只能通过设置来读取，启动时读取一次；之后再改动会与其他线程创建文件发生竞争)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 def get_config_path(filename="desktop_layout.json"):
     """
     获取用户配置文件的完整路径，并确保目录存在。
@@ -29,6 +35,21 @@ def get_config_path(filename="desktop_layout.json"):
     Path(data_dir).mkdir(parents=True, exist_ok=True)
     return Path(data_dir) / filename
 
+def get_cache_path(subdir):
+    """
+    获取用户缓存目录下的子目录路径，并确保目录存在。
+    缓存内容可以随时删除，程序会在需要时重新生成。
+    
+    参数:
+        subdir (str): 子目录名称，例如 "icons"。
+        
+    返回:
+        Path: 缓存子目录的完整路径。
+    """
+    cache_dir = Path(dirs.user_cache_dir) / subdir
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
 def load_user_config(filename="desktop_layout.json"):
     """
     从用户目录加载配置文件。如果文件不存在、损坏或版本号不匹配，
@@ -95,13 +116,66 @@ def load_user_config(filename="desktop_layout.json"):
         return {"version": APP_VERSION} 
 
 
-def save_user_config(data, filename="desktop_layout.json"):
+def _fsync_directory(directory):
+    """fsync 目录本身，确保 rename 在断电后也已落盘 (Windows 不支持打开目录，跳过)。"""
+    if sys.platform == 'win32':
+        return
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path, text, encoding='utf-8', errors='strict'):
+    """
+    原子地写入文本文件: 先写入同目录下的临时文件并 fsync，再用 os.replace 替换目标文件。
+    写入过程中断电或崩溃时，目标文件要么是旧内容，要么是完整的新内容，不会被截断。
+    目标文件已存在时保留其权限位，新文件的权限与 open() 创建的一样由 umask 决定。
+    
+    参数:
+        path (str | Path): 目标文件路径。
+        text (str): 要写入的文本。
+        encoding (str): 文本编码。
+        errors (str): 编码错误的处理方式，同 open()。
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding, errors=errors, newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            # 新文件: 与 open(path, 'w') 一样按 umask 决定权限
+            mode = 0o666 & ~_UMASK
+        # mkstemp 创建的文件只有所有者可读写
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+        _fsync_directory(path.parent)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_user_config(data, filename="desktop_layout.json", indent=4):
     """
-    将配置数据保存到用户目录。在保存前自动添加当前 APP_VERSION。
+    将配置数据原子地保存到用户目录。在保存前自动添加当前 APP_VERSION。
     
     参数:
         data (dict): 要保存的配置数据。
         filename (str): 配置文件的名称。
+        indent (int | None): JSON 缩进，None 表示紧凑格式。
     """
     config_path = get_config_path(filename)
     
@@ -110,8 +184,58 @@ def save_user_config(data, filename="desktop_layout.json"):
         data["version"] = APP_VERSION
         
     try:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-            print(f"配置文件已成功保存到: {config_path}")
+        atomic_write_text(config_path, json.dumps(data, indent=indent, ensure_ascii=False))
+        print(f"配置文件已成功保存到: {config_path}")
     except Exception as e:
         print(f"保存配置文件时出错: {e}")
+
+
+class DebouncedConfigWriter:
+    """
+    延迟合并写入的配置保存器 (write-behind)。
+    
+    在 delay 秒的窗口内多次调用 schedule() 只会在窗口结束时于后台线程写入一次最新数据；
+    内容与上次写入相同时跳过写入，以减少 SD 卡的写入次数。程序退出前应调用 flush()。
+    """
+
+    def __init__(self, filename, delay=1.0, indent=None):
+        self.filename = filename
+        self.delay = delay
+        self.indent = indent
+        self._pending = None
+        self._last_written = None
+        self._timer = None
+        self._lock = threading.Lock()
+        # 保证同一时间只有一个线程在写文件
+        self._write_lock = threading.Lock()
+
+    def schedule(self, data):
+        """登记要保存的数据，在窗口结束时由后台线程写入。"""
+        # 立即序列化一份快照，之后调用方再修改 data 也不会影响待写入的内容
+        snapshot = json.loads(json.dumps(data))
+        with self._lock:
+            self._pending = snapshot
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self._write_pending)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """取消等待中的定时器，并在当前线程中立即写入尚未保存的数据。"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            with self._lock:
+                data, self._pending = self._pending, None
+                self._timer = None
+            if data is None:
+                return
+            serialized = json.dumps(data, sort_keys=True)
+            if serialized == self._last_written:
+                return
+            save_user_config(data, self.filename, indent=self.indent)
+            self._last_written = serialized